@@ -10,20 +10,59 @@ API Routes
 - Dependency Injection (FastAPI Depends)
 """
 
-from typing import List
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
 import structlog
 
+from app.api.serializers import (
+    DuplexStreamingResponse,
+    dump_csv,
+    dump_json,
+    dump_ndjson,
+    iter_ndjson_items,
+    json_response,
+    parse_text_item,
+    prediction_to_dict,
+    prediction_to_score_dict,
+)
 from app.api.schemas import (
+    ExportFormat,
+    JobCreateSchema,
+    JobStatusSchema,
+    ResponseView,
     TextInputSchema,
     PredictionOutputSchema,
+    PredictionScoreSchema,
     PredictionHistorySchema,
+    PredictionStatsSchema,
+)
+from application.admission import AdmissionController, OverloadedError
+from application.use_cases import (
+    PredictTextUseCase,
+    StreamPredictTextUseCase,
+    GetPredictionHistoryUseCase,
+    GetPredictionStatsUseCase,
 )
-from application.use_cases import PredictTextUseCase, GetPredictionHistoryUseCase
-from infrastructure.database import get_session
+from domain.exceptions import DeadlineExceeded
+from domain.value_objects import Deadline, ToxicityLevel
+from infrastructure.jobs import JobQueue
 from infrastructure.repositories import PredictionRepository
 from infrastructure.dependency_injection import Container
 
@@ -47,77 +86,171 @@ def get_container() -> Container:
     return container
 
 
-def get_predict_use_case(session: AsyncSession = Depends(get_session)) -> PredictTextUseCase:
+def get_predict_use_case() -> PredictTextUseCase:
     """
     Dependency для получения PredictTextUseCase.
     
-    Args:
-        session: Сессия БД из dependency injection
-        
+    Сессия БД не открывается заранее: репозиторий берет соединение
+    из пула только на время сохранения, а не на время инференса.
+    
     Returns:
         PredictTextUseCase: Use case для предсказаний
     """
     cont = get_container()
-    return cont.predict_text_use_case(session=session)
+    return cont.predict_text_use_case()
 
 
-def get_history_use_case(session: AsyncSession = Depends(get_session)) -> GetPredictionHistoryUseCase:
+def get_admission_controller() -> AdmissionController:
     """
-    Dependency для получения GetPredictionHistoryUseCase.
+    Dependency для получения контроллера допуска запросов на предсказание.
+    
+    Returns:
+        AdmissionController: Контроллер допуска (один на процесс)
+    """
+    cont = get_container()
+    return cont.admission_controller()
+
+
+def request_deadline(budget_ms: Optional[float] = None) -> Optional[Deadline]:
+    """
+    Крайний срок запроса из бюджета клиента или значения по умолчанию.
     
     Args:
-        session: Сессия БД из dependency injection
-        
+        budget_ms: Бюджет клиента в миллисекундах (заголовок X-Request-Deadline-Ms
+            или поле deadline_ms сообщения)
+    
+    Returns:
+        Optional[Deadline]: Крайний срок или None, если бюджет не задан
+            ни клиентом, ни в inference.default_deadline_ms
+    """
+    if budget_ms is None:
+        budget_ms = get_container().config.inference.default_deadline_ms()
+    if not budget_ms or float(budget_ms) <= 0:
+        return None
+    return Deadline.after_ms(float(budget_ms))
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Dependency для получения очереди асинхронных заданий.
+    
+    Returns:
+        JobQueue: Очередь заданий Celery
+    """
+    cont = get_container()
+    return cont.job_queue()
+
+
+def get_stream_predict_use_case() -> StreamPredictTextUseCase:
+    """
+    Dependency для получения StreamPredictTextUseCase.
+    
+    Returns:
+        StreamPredictTextUseCase: Use case для потоковой оценки текстов
+    """
+    cont = get_container()
+    return cont.stream_predict_text_use_case()
+
+
+def get_history_use_case() -> GetPredictionHistoryUseCase:
+    """
+    Dependency для получения GetPredictionHistoryUseCase.
+    
     Returns:
         GetPredictionHistoryUseCase: Use case для истории предсказаний
     """
     cont = get_container()
-    return cont.get_prediction_history_use_case(session=session)
+    return cont.get_prediction_history_use_case()
+
+
+def get_stats_use_case() -> GetPredictionStatsUseCase:
+    """
+    Dependency для получения GetPredictionStatsUseCase.
+    
+    Returns:
+        GetPredictionStatsUseCase: Use case для статистики предсказаний
+    """
+    cont = get_container()
+    return cont.get_prediction_stats_use_case()
 
 
 @router.post(
     "/predict",
-    response_model=PredictionOutputSchema,
+    response_model=Union[PredictionOutputSchema, PredictionScoreSchema],
     status_code=status.HTTP_200_OK,
     summary="Предсказать токсичность текста",
-    description="Анализирует текст и возвращает оценку токсичности",
+    description=(
+        "Анализирует текст и возвращает оценку токсичности. "
+        "view=score (или заголовок X-Response-View: score) - только id и оценка"
+    ),
 )
 async def predict_text(
     input_data: TextInputSchema,
+    view: Optional[ResponseView] = Query(None, description="Вид ответа: full или score"),
+    view_header: Optional[ResponseView] = Header(None, alias="X-Response-View"),
+    deadline_ms: Optional[float] = Header(None, alias="X-Request-Deadline-Ms", gt=0),
     use_case: PredictTextUseCase = Depends(get_predict_use_case),
-) -> PredictionOutputSchema:
+    admission: AdmissionController = Depends(get_admission_controller),
+) -> Response:
     """
     Эндпоинт для предсказания токсичности текста.
     
     Использует PredictTextUseCase для обработки запроса.
-    Сохраняет результат в БД для истории.
+    Сохраняет результат в БД для истории по политике сохранения
+    (токсичные всегда, нетоксичные выборочно) или по полю persist.
+    
+    Ответ собирается из доменной сущности без повторной валидации
+    Pydantic моделью и кодируется orjson; response_model используется
+    только для документации OpenAPI. В режиме score ответ не содержит
+    исходный текст и служебные поля. Параметр запроса view имеет
+    приоритет над заголовком X-Response-View.
+    
+    Запрос проходит контроль допуска: при перегрузке (лимит запросов
+    в работе занят, а очередь заполнена или ожидание в ней истекло)
+    сразу возвращается 503 с заголовком Retry-After.
+    
+    Бюджет времени клиента в миллисекундах передается заголовком
+    X-Request-Deadline-Ms (иначе inference.default_deadline_ms). Если срок
+    истек, оставшаяся работа (предобработка, forward pass, запись в БД)
+    не выполняется и возвращается 504.
     
     Args:
         input_data: Входные данные (текст)
+        view: Вид ответа из параметра запроса
+        view_header: Вид ответа из заголовка X-Response-View
+        deadline_ms: Бюджет времени клиента из заголовка X-Request-Deadline-Ms
         use_case: Use case для предсказания (injected)
+        admission: Контроль допуска (injected)
         
     Returns:
-        PredictionOutputSchema: Результат предсказания
+        Response: JSON ответ (PredictionOutputSchema или PredictionScoreSchema)
         
     Raises:
-        HTTPException: При ошибке обработки
+        HTTPException: 503 при перегрузке, 504 при истечении срока, 500 при ошибке обработки
     """
+    deadline = request_deadline(deadline_ms)
     try:
         logger.info("Prediction request received", text_length=len(input_data.text))
         
-        prediction = await use_case.execute(text=input_data.text, save_to_db=True)
-        
-        return PredictionOutputSchema(
-            id=prediction.id,
-            text=prediction.text_classification.text,
-            toxicity_score=prediction.text_classification.toxicity_score,
-            toxicity_level=prediction.text_classification.toxicity_level.value,
-            confidence=prediction.text_classification.confidence,
-            model_version=prediction.text_classification.model_version,
-            processing_time_ms=prediction.processing_time_ms,
-            created_at=prediction.created_at,
-        )
+        async with admission.admit():
+            prediction = await use_case.execute(
+                text=input_data.text,
+                save_to_db=input_data.persist,
+                deadline=deadline,
+            )
         
+        if (view or view_header) == ResponseView.SCORE:
+            return json_response(prediction_to_score_dict(prediction))
+        return json_response(prediction_to_dict(prediction))
+        
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
     except Exception as e:
         logger.error("Prediction failed", error=str(e), exc_info=True)
         raise HTTPException(
@@ -126,6 +259,221 @@ async def predict_text(
         )
 
 
+@router.post(
+    "/predict/stream",
+    summary="Потоковая оценка токсичности",
+    description=(
+        "NDJSON на входе (строки {\"text\": ..., \"id\": ...}), NDJSON с оценками на выходе"
+    ),
+    response_class=StreamingResponse,
+)
+async def predict_stream(
+    request: Request,
+    use_case: StreamPredictTextUseCase = Depends(get_stream_predict_use_case),
+) -> StreamingResponse:
+    """
+    Эндпоинт для потоковой оценки большого количества текстов.
+    
+    Тело запроса читается по мере поступления, строки группируются в пачки
+    для модели, а оценки пишутся в ответ в порядке входных строк сразу по
+    готовности. Число пачек в работе ограничено, поэтому медленный клиент
+    (не читающий ответ) останавливает чтение тела запроса: память сервера
+    не зависит от длины потока. Клиент должен читать ответ одновременно
+    с отправкой тела. Результаты не сохраняются в историю.
+    
+    Некорректная строка не прерывает поток: на ее месте возвращается
+    {"id": ..., "error": "..."}.
+    
+    Args:
+        request: HTTP запрос (тело читается потоково)
+        use_case: Use case для потоковой оценки (injected)
+        
+    Returns:
+        StreamingResponse: Потоковый NDJSON ответ
+    """
+    max_line_bytes = get_container().config.inference.stream_max_line_bytes() or 65536
+    items = iter_ndjson_items(request.stream(), max_line_bytes=int(max_line_bytes))
+    
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for results in use_case.execute(items):
+                yield dump_ndjson(results)
+        except ClientDisconnect:
+            logger.info("Prediction stream client disconnected")
+    
+    return DuplexStreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.websocket("/ws/predict")
+async def predict_websocket(
+    websocket: WebSocket,
+    use_case: PredictTextUseCase = Depends(get_predict_use_case),
+    admission: AdmissionController = Depends(get_admission_controller),
+) -> None:
+    """
+    WebSocket эндпоинт для оценки сообщений в постоянном соединении.
+    
+    Клиент отправляет JSON сообщения {"id": ..., "text": "...", "persist": ...,
+    "deadline_ms": ...},
+    сервер отвечает {"id", "prediction_id", "toxicity_score", "toxicity_level",
+    "confidence"} (или {"id", "error"}) по мере готовности, не обязательно
+    в порядке отправки. Use case создается один раз на соединение, а сами
+    предсказания идут через общий батчер инференса вместе с HTTP запросами.
+    
+    Число сообщений в обработке на соединение ограничено
+    inference.ws_max_in_flight: при достижении лимита сервер перестает
+    читать новые сообщения, пока не освободится место. Каждое сообщение
+    проходит общий с HTTP контроль допуска; при перегрузке на него
+    отвечает {"id", "error", "retry_after"}, соединение не закрывается.
+    Бюджет времени сообщения отсчитывается от его получения (deadline_ms
+    или inference.default_deadline_ms); при истечении срока на сообщение
+    отвечает {"id", "error"}.
+    
+    Args:
+        websocket: WebSocket соединение
+        use_case: Use case для предсказаний (injected, один на соединение)
+        admission: Контроль допуска (injected)
+    """
+    await websocket.accept()
+    max_in_flight = int(get_container().config.inference.ws_max_in_flight() or 256)
+    slots = asyncio.Semaphore(max_in_flight)
+    send_lock = asyncio.Lock()
+    tasks = set()
+    
+    async def send(payload: dict) -> None:
+        async with send_lock:
+            await websocket.send_text(dump_json(payload).decode("utf-8"))
+    
+    async def handle(item: dict, deadline: Optional[Deadline]) -> None:
+        try:
+            async with admission.admit():
+                prediction = await use_case.execute(
+                    text=item["text"],
+                    save_to_db=item.get("persist"),
+                    deadline=deadline,
+                )
+            score = prediction_to_score_dict(prediction)
+            payload = {"id": item["id"], "prediction_id": score.pop("id"), **score}
+        except OverloadedError as e:
+            payload = {"id": item["id"], "error": str(e), "retry_after": e.retry_after}
+        except Exception as e:
+            logger.error("WebSocket prediction failed", error=str(e))
+            payload = {"id": item["id"], "error": f"Prediction failed: {str(e)}"}
+        
+        try:
+            await send(payload)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # клиент уже отключился
+        finally:
+            slots.release()
+    
+    try:
+        while True:
+            await slots.acquire()
+            item = parse_text_item(await websocket.receive_text())
+            if "error" in item:
+                slots.release()
+                await send(item)
+                continue
+            task = asyncio.create_task(handle(item, request_deadline(item.get("deadline_ms"))))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except WebSocketDisconnect:
+        logger.info("WebSocket client disconnected", pending=len(tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@router.post(
+    "/jobs",
+    response_model=JobStatusSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Создать задание на оценку пачки текстов",
+    description="Ставит тексты в очередь Celery чанками и возвращает идентификатор задания",
+)
+def create_job(
+    input_data: JobCreateSchema,
+    job_queue: JobQueue = Depends(get_job_queue),
+) -> Response:
+    """
+    Эндпоинт для создания асинхронного задания.
+    
+    Тексты делятся на чанки по jobs.chunk_size, каждый чанк - задача
+    predict_chunk, которую воркер с заранее загруженной моделью оценивает
+    одним векторизованным проходом. Обработчик синхронный: постановка
+    задач в брокер выполняется в пуле потоков, не блокируя event loop.
+    
+    Args:
+        input_data: Тексты для оценки
+        job_queue: Очередь заданий (injected)
+        
+    Returns:
+        JobStatusSchema: Статус созданного задания (queued)
+        
+    Raises:
+        HTTPException: 413 если текстов больше jobs.max_texts, 500 при ошибке постановки
+    """
+    max_texts = int(get_container().config.jobs.max_texts() or 100000)
+    if len(input_data.texts) > max_texts:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many texts: {len(input_data.texts)} > {max_texts}",
+        )
+    
+    try:
+        job = job_queue.submit(input_data.texts)
+    except Exception as e:
+        logger.error("Failed to submit job", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit job: {str(e)}",
+        )
+    return json_response(job, status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatusSchema,
+    summary="Получить статус задания",
+    description="Прогресс задания; для завершенного задания - страница результатов",
+)
+def get_job(
+    job_id: UUID,
+    offset: int = Query(0, ge=0, description="Индекс первого результата"),
+    limit: Optional[int] = Query(
+        None, ge=1, description="Количество результатов (по умолчанию все)"
+    ),
+    job_queue: JobQueue = Depends(get_job_queue),
+) -> Response:
+    """
+    Эндпоинт для получения статуса и результатов задания.
+    
+    Прогресс читается из метаданных задания одним запросом к Redis.
+    Результаты возвращаются только для completed и читаются из result
+    backend лишь для чанков, покрывающих запрошенную страницу.
+    
+    Args:
+        job_id: Идентификатор задания
+        offset: Индекс первого результата
+        limit: Количество результатов
+        job_queue: Очередь заданий (injected)
+        
+    Returns:
+        JobStatusSchema: Статус задания
+        
+    Raises:
+        HTTPException: 404 если задание не найдено или истекло
+    """
+    job = job_queue.status(str(job_id), offset=offset, limit=limit)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+    return json_response(job)
+
+
 @router.get(
     "/predictions",
     response_model=List[PredictionHistorySchema],
@@ -140,6 +488,10 @@ async def get_predictions(
     """
     Эндпоинт для получения истории предсказаний.
     
+    Использует read model: строки из БД сериализуются напрямую в JSON,
+    без ORM объектов, доменных сущностей и Pydantic моделей на каждую строку.
+    response_model используется только для документации OpenAPI.
+    
     Args:
         limit: Максимальное количество записей
         offset: Смещение для пагинации
@@ -149,21 +501,8 @@ async def get_predictions(
         List[PredictionHistorySchema]: Список предсказаний
     """
     try:
-        predictions = await use_case.execute(limit=limit, offset=offset)
-        
-        return [
-            PredictionHistorySchema(
-                id=p.id,
-                text=p.text_classification.text,
-                toxicity_score=p.text_classification.toxicity_score,
-                toxicity_level=p.text_classification.toxicity_level.value,
-                confidence=p.text_classification.confidence,
-                model_version=p.text_classification.model_version,
-                processing_time_ms=p.processing_time_ms,
-                created_at=p.created_at,
-            )
-            for p in predictions
-        ]
+        rows = await use_case.execute_rows(limit=limit, offset=offset)
+        return json_response(rows)
         
     except Exception as e:
         logger.error("Failed to fetch predictions", error=str(e), exc_info=True)
@@ -173,6 +512,82 @@ async def get_predictions(
         )
 
 
+@router.get(
+    "/predictions/export",
+    summary="Выгрузить историю предсказаний",
+    description="Потоковая выгрузка истории в NDJSON или CSV с фильтрами",
+    response_class=StreamingResponse,
+)
+async def export_predictions(
+    request: Request,
+    export_format: ExportFormat = Query(
+        ExportFormat.NDJSON, alias="format", description="Формат выгрузки"
+    ),
+    created_from: Optional[datetime] = Query(None, description="Начало интервала (включительно)"),
+    created_to: Optional[datetime] = Query(None, description="Конец интервала (не включительно)"),
+    toxicity_level: Optional[ToxicityLevel] = Query(
+        None, description="Фильтр по уровню токсичности"
+    ),
+    model_version: Optional[str] = Query(None, description="Фильтр по версии модели"),
+    use_case: GetPredictionHistoryUseCase = Depends(get_history_use_case),
+) -> StreamingResponse:
+    """
+    Эндпоинт для потоковой выгрузки истории предсказаний.
+    
+    Строки читаются из server-side курсора пачками и сразу отправляются
+    клиенту, поэтому память процесса не зависит от объема выгрузки.
+    Репозиторий открывает сессию БД при первой пачке, и она живет ровно
+    столько, сколько идет выгрузка. При отключении клиента генератор
+    прерывается, курсор закрывается и соединение возвращается в пул.
+    
+    Args:
+        request: HTTP запрос (для отслеживания отключения клиента)
+        export_format: Формат выгрузки (ndjson или csv)
+        created_from: Нижняя граница created_at
+        created_to: Верхняя граница created_at
+        toxicity_level: Фильтр по уровню токсичности
+        model_version: Фильтр по версии модели
+        use_case: Use case для истории (injected)
+        
+    Returns:
+        StreamingResponse: Потоковый ответ
+    """
+    columns = [column.key for column in PredictionRepository.HISTORY_COLUMNS]
+    
+    async def body() -> AsyncIterator[bytes]:
+        exported = 0
+        try:
+            if export_format == ExportFormat.CSV:
+                yield dump_csv([], columns, header=True)
+            
+            async for batch in use_case.stream_rows(
+                created_from=created_from,
+                created_to=created_to,
+                toxicity_level=toxicity_level.value if toxicity_level else None,
+                model_version=model_version,
+            ):
+                if await request.is_disconnected():
+                    logger.info("Export client disconnected", exported=exported)
+                    return
+                exported += len(batch)
+                if export_format == ExportFormat.CSV:
+                    yield dump_csv(batch, columns)
+                else:
+                    yield dump_ndjson(batch)
+        except asyncio.CancelledError:
+            # Starlette отменяет генератор при разрыве соединения
+            logger.info("Export cancelled", exported=exported)
+            raise
+    
+    media_type = "text/csv" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    filename = f"predictions.{export_format.value}"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get(
     "/predictions/{prediction_id}",
     response_model=PredictionHistorySchema,
@@ -197,18 +612,8 @@ async def get_prediction_by_id(
         HTTPException: Если предсказание не найдено
     """
     try:
-        prediction = await use_case.get_by_id(prediction_id)
-        
-        return PredictionHistorySchema(
-            id=prediction.id,
-            text=prediction.text_classification.text,
-            toxicity_score=prediction.text_classification.toxicity_score,
-            toxicity_level=prediction.text_classification.toxicity_level.value,
-            confidence=prediction.text_classification.confidence,
-            model_version=prediction.text_classification.model_version,
-            processing_time_ms=prediction.processing_time_ms,
-            created_at=prediction.created_at,
-        )
+        row = await use_case.get_row_by_id(prediction_id)
+        return json_response(row)
         
     except ValueError as e:
         logger.warning("Prediction not found", prediction_id=str(prediction_id))
@@ -223,3 +628,57 @@ async def get_prediction_by_id(
             detail=f"Failed to fetch prediction: {str(e)}",
         )
 
+
+@router.get(
+    "/stats",
+    response_model=List[PredictionStatsSchema],
+    summary="Получить статистику предсказаний",
+    description="Почасовая статистика по уровню токсичности и версии модели из rollup таблицы",
+)
+async def get_stats(
+    created_from: Optional[datetime] = Query(
+        None, description="Начало интервала (по умолчанию 24 часа назад)"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Конец интервала (по умолчанию сейчас)"
+    ),
+    toxicity_level: Optional[ToxicityLevel] = Query(
+        None, description="Фильтр по уровню токсичности"
+    ),
+    model_version: Optional[str] = Query(None, description="Фильтр по версии модели"),
+    use_case: GetPredictionStatsUseCase = Depends(get_stats_use_case),
+) -> List[PredictionStatsSchema]:
+    """
+    Эндпоинт для получения почасовой статистики предсказаний.
+    
+    Данные читаются из инкрементально обновляемой rollup таблицы
+    (задача refresh_prediction_stats), поэтому время ответа не зависит
+    от размера таблицы predictions. Последние минуты могут еще не попасть
+    в статистику (см. stats.refresh_lag_seconds). Для backend sqlite и
+    memory rollup таблицы нет, и агрегаты считаются по истории на лету.
+    
+    Args:
+        created_from: Начало интервала
+        created_to: Конец интервала
+        toxicity_level: Фильтр по уровню токсичности
+        model_version: Фильтр по версии модели
+        use_case: Use case для статистики (injected)
+        
+    Returns:
+        List[PredictionStatsSchema]: Почасовая статистика
+    """
+    try:
+        rows = await use_case.execute(
+            created_from=created_from,
+            created_to=created_to,
+            toxicity_level=toxicity_level.value if toxicity_level else None,
+            model_version=model_version,
+        )
+        return json_response(rows)
+        
+    except Exception as e:
+        logger.error("Failed to fetch stats", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch stats: {str(e)}",
+        )
@@ -11,6 +11,8 @@ Pydantic схемы для валидации входных и выходных
 """
 
 from datetime import datetime
+from enum import Enum
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
@@ -24,6 +26,7 @@ class TextInputSchema(BaseModel):
     
     Attributes:
         text: Текст для анализа (минимум 1 символ, максимум 10000)
+        persist: Сохранить ли результат в историю (None - по политике сохранения)
     """
     
     text: str = Field(
@@ -33,6 +36,10 @@ class TextInputSchema(BaseModel):
         description="Текст для анализа на токсичность",
         examples=["This is a sample text to analyze"],
     )
+    persist: Optional[bool] = Field(
+        None,
+        description="Сохранить результат в историю: true/false или null - по политике сохранения",
+    )
     
     @field_validator("text")
     @classmethod
@@ -99,6 +106,39 @@ class PredictionOutputSchema(BaseModel):
         }
 
 
+class PredictionScoreSchema(BaseModel):
+    """
+    Схема сокращенного результата предсказания (режим view=score).
+    
+    Только идентификатор и оценка: без исходного текста, версии модели
+    и времени обработки.
+    
+    Attributes:
+        id: Уникальный идентификатор предсказания
+        toxicity_score: Оценка токсичности (0.0 - 1.0)
+        toxicity_level: Уровень токсичности (строка)
+        confidence: Уверенность модели (0.0 - 1.0)
+    """
+    
+    id: UUID = Field(..., description="Уникальный идентификатор предсказания")
+    toxicity_score: float = Field(..., ge=0.0, le=1.0, description="Оценка токсичности (0.0 - 1.0)")
+    toxicity_level: str = Field(..., description="Уровень токсичности")
+    confidence: float = Field(..., ge=0.0, le=1.0, description="Уверенность модели (0.0 - 1.0)")
+
+
+class ResponseView(str, Enum):
+    """
+    Вид ответа на предсказание.
+    
+    Attributes:
+        FULL: Полный ответ (PredictionOutputSchema)
+        SCORE: Только id и оценка (PredictionScoreSchema)
+    """
+    
+    FULL = "full"
+    SCORE = "score"
+
+
 class PredictionHistorySchema(BaseModel):
     """
     Схема для истории предсказаний.
@@ -125,3 +165,121 @@ class PredictionHistorySchema(BaseModel):
             UUID: lambda v: str(v),
         }
 
+
+class ExportFormat(str, Enum):
+    """
+    Формат потоковой выгрузки истории предсказаний.
+    
+    Attributes:
+        NDJSON: Одна JSON запись на строку (application/x-ndjson)
+        CSV: CSV с заголовком (text/csv)
+    """
+    
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class PredictionStatsSchema(BaseModel):
+    """
+    Схема почасовой статистики предсказаний.
+    
+    Attributes:
+        hour: Начало часа
+        toxicity_level: Уровень токсичности
+        model_version: Версия модели
+        count: Количество предсказаний
+        mean_processing_time_ms: Среднее время обработки
+        score_histogram: Количество предсказаний по корзинам toxicity_score
+            (равные интервалы на отрезке [0, 1])
+    """
+    
+    hour: datetime = Field(..., description="Начало часа")
+    toxicity_level: str = Field(..., description="Уровень токсичности")
+    model_version: str = Field(..., description="Версия модели")
+    count: int = Field(..., ge=0, description="Количество предсказаний")
+    mean_processing_time_ms: float = Field(
+        ..., ge=0.0, description="Среднее время обработки в миллисекундах"
+    )
+    score_histogram: List[int] = Field(
+        ..., description="Гистограмма toxicity_score по равным корзинам [0, 1]"
+    )
+
+
+class JobCreateSchema(BaseModel):
+    """
+    Схема для создания асинхронного задания на оценку пачки текстов.
+    
+    Attributes:
+        texts: Тексты для оценки (каждый от 1 до 10000 символов)
+    """
+    
+    texts: List[str] = Field(..., min_length=1, description="Тексты для оценки")
+    
+    @field_validator("texts")
+    @classmethod
+    def validate_texts(cls, v: List[str]) -> List[str]:
+        """
+        Валидация текстов (как в TextInputSchema).
+        
+        Args:
+            v: Входные тексты
+            
+        Returns:
+            List[str]: Тексты без пробелов по краям
+            
+        Raises:
+            ValueError: Если текст пустой или длиннее 10000 символов
+        """
+        texts = []
+        for index, text in enumerate(v):
+            text = text.strip()
+            if not text:
+                raise ValueError(f"Text {index} cannot be empty or whitespace only")
+            if len(text) > 10000:
+                raise ValueError(f"Text {index} is longer than 10000 characters")
+            texts.append(text)
+        return texts
+
+
+class JobResultItemSchema(BaseModel):
+    """
+    Схема результата оценки одного текста задания.
+    
+    Attributes:
+        index: Индекс текста во входном списке
+        toxicity_score: Оценка токсичности (0.0 - 1.0)
+        toxicity_level: Уровень токсичности
+        confidence: Уверенность модели (0.0 - 1.0)
+    """
+    
+    index: int = Field(..., ge=0, description="Индекс текста во входном списке")
+    toxicity_score: float = Field(..., ge=0.0, le=1.0, description="Оценка токсичности")
+    toxicity_level: str = Field(..., description="Уровень токсичности")
+    confidence: float = Field(..., ge=0.0, le=1.0, description="Уверенность модели")
+
+
+class JobStatusSchema(BaseModel):
+    """
+    Схема статуса асинхронного задания.
+    
+    Attributes:
+        job_id: Идентификатор задания
+        status: queued, running, completed или failed
+        total: Количество текстов
+        processed: Количество оцененных текстов
+        failed: Количество текстов в упавших чанках
+        chunks: Количество чанков (задач Celery)
+        created_at: Время создания задания
+        results: Страница результатов (только для completed)
+    """
+    
+    job_id: UUID = Field(..., description="Идентификатор задания")
+    status: str = Field(..., description="queued, running, completed или failed")
+    total: int = Field(..., ge=0, description="Количество текстов")
+    processed: int = Field(..., ge=0, description="Количество оцененных текстов")
+    failed: int = Field(..., ge=0, description="Количество текстов в упавших чанках")
+    chunks: int = Field(..., ge=0, description="Количество чанков")
+    created_at: datetime = Field(..., description="Время создания задания")
+    results: Optional[List[JobResultItemSchema]] = Field(
+        None, description="Результаты (для completed)"
+    )
@@ -0,0 +1,270 @@
+"""
+API Serializers
+
+Быстрая сериализация ответов API без промежуточных Pydantic моделей.
+Используется для read model истории, где данные приходят из БД
+уже проверенными и не требуют повторной валидации, и для результатов
+предсказаний, которые формирует сам сервис. JSON кодируется orjson.
+
+Паттерны:
+- Serializer Pattern
+- CQRS (read side)
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+from uuid import UUID
+
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from domain.entities import PredictionResult
+
+# Максимальная длина текста (как в TextInputSchema)
+MAX_TEXT_LENGTH = 10000
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Преобразовать типы, которые не поддерживает JSON кодировщик.
+    
+    orjson сам сериализует datetime и UUID, функция нужна для CSV
+    и как запасной вариант для прочих типов.
+    
+    Args:
+        value: Значение для сериализации
+    
+    Returns:
+        Any: JSON-совместимое значение
+    
+    Raises:
+        TypeError: Если тип не поддерживается
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Сериализовать данные в JSON (orjson, компактный вывод в UTF-8).
+    
+    Args:
+        content: Данные (dict, list, примитивы, datetime, UUID)
+    
+    Returns:
+        bytes: JSON в UTF-8
+    """
+    return orjson.dumps(content, default=_json_default)
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """
+    Сформировать JSON ответ, минуя response_model FastAPI.
+    
+    Args:
+        content: Данные для ответа
+        status_code: HTTP статус
+    
+    Returns:
+        Response: Готовый HTTP ответ
+    """
+    return Response(
+        content=dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def prediction_to_dict(prediction: PredictionResult) -> Dict[str, Any]:
+    """
+    Полный ответ на предсказание (поля PredictionOutputSchema).
+    
+    Значения сформированы доменной сущностью и уже проверены ею,
+    поэтому Pydantic модель ответа не создается.
+    
+    Args:
+        prediction: Результат предсказания
+    
+    Returns:
+        Dict[str, Any]: Данные ответа
+    """
+    classification = prediction.text_classification
+    return {
+        "id": prediction.id,
+        "text": classification.text,
+        "toxicity_score": classification.toxicity_score,
+        "toxicity_level": classification.toxicity_level.value,
+        "confidence": classification.confidence,
+        "model_version": classification.model_version,
+        "processing_time_ms": prediction.processing_time_ms,
+        "created_at": prediction.created_at,
+    }
+
+
+def prediction_to_score_dict(prediction: PredictionResult) -> Dict[str, Any]:
+    """
+    Сокращенный ответ на предсказание (поля PredictionScoreSchema).
+    
+    Без исходного текста и служебных полей: только id и оценка.
+    
+    Args:
+        prediction: Результат предсказания
+    
+    Returns:
+        Dict[str, Any]: Данные ответа
+    """
+    classification = prediction.text_classification
+    return {
+        "id": prediction.id,
+        "toxicity_score": classification.toxicity_score,
+        "toxicity_level": classification.toxicity_level.value,
+        "confidence": classification.confidence,
+    }
+
+
+def dump_ndjson(rows: List[Dict[str, Any]]) -> bytes:
+    """
+    Сериализовать пачку строк в NDJSON (одна JSON запись на строку).
+    
+    Args:
+        rows: Пачка строк
+    
+    Returns:
+        bytes: NDJSON в UTF-8 (с завершающим переводом строки)
+    """
+    return b"".join(dump_json(row) + b"\n" for row in rows)
+
+
+def dump_csv(rows: List[Dict[str, Any]], columns: Sequence[str], header: bool = False) -> bytes:
+    """
+    Сериализовать пачку строк в CSV.
+    
+    Args:
+        rows: Пачка строк
+        columns: Порядок колонок
+        header: Добавить ли строку заголовка
+    
+    Returns:
+        bytes: CSV в UTF-8
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value: Any) -> Any:
+    """Привести значение к виду для CSV (ISO дата, строковый UUID)."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, UUID)):
+        return _json_default(value)
+    return value
+
+
+def parse_text_item(raw: Union[bytes, str]) -> Dict[str, Any]:
+    """
+    Разобрать одно сообщение с текстом (строка NDJSON или WebSocket сообщение).
+    
+    Сообщение - JSON объект {"text": "...", "id": ..., "persist": ..., "deadline_ms": ...}
+    или JSON строка с текстом.
+    
+    Args:
+        raw: JSON сообщение
+    
+    Returns:
+        Dict[str, Any]: {"id", "text"[, "persist"][, "deadline_ms"]} или {"id", "error"}
+            для некорректного сообщения
+    """
+    try:
+        value = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {"id": None, "error": "invalid JSON"}
+    
+    item: Dict[str, Any] = {"id": None}
+    if isinstance(value, dict):
+        item["id"] = value.get("id")
+        if isinstance(value.get("persist"), bool):
+            item["persist"] = value["persist"]
+        deadline_ms = value.get("deadline_ms")
+        is_number = isinstance(deadline_ms, (int, float)) and not isinstance(deadline_ms, bool)
+        if is_number and deadline_ms > 0:
+            item["deadline_ms"] = deadline_ms
+        value = value.get("text")
+    if not isinstance(value, str) or not value.strip():
+        return {"id": item["id"], "error": "text must be a non-empty string"}
+    if len(value) > MAX_TEXT_LENGTH:
+        return {"id": item["id"], "error": f"text longer than {MAX_TEXT_LENGTH} characters"}
+    item["text"] = value.strip()
+    return item
+
+
+async def iter_ndjson_items(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = 65536,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Инкрементально разобрать NDJSON тело запроса.
+    
+    Тело читается по кускам, в памяти держится только незавершенная строка.
+    Строка длиннее max_line_bytes пропускается целиком с ошибкой на ее месте.
+    После каждого куска выдается None - признак того, что накопленную
+    неполную пачку можно отправлять в модель.
+    
+    Args:
+        chunks: Куски тела запроса (Request.stream())
+        max_line_bytes: Максимальная длина строки в байтах
+    
+    Yields:
+        Optional[Dict[str, Any]]: Разобранная строка или None после куска
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            if len(line) > max_line_bytes:
+                yield {"id": None, "error": f"line longer than {max_line_bytes} bytes"}
+            elif line.strip():
+                yield parse_text_item(line)
+        if len(buffer) > max_line_bytes and not skipping:
+            yield {"id": None, "error": f"line longer than {max_line_bytes} bytes"}
+            skipping = True
+        if skipping:
+            buffer = b""
+        yield None
+    
+    if buffer.strip():
+        yield parse_text_item(buffer)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Потоковый ответ, который отправляется одновременно с чтением тела запроса.
+    
+    StreamingResponse параллельно ждет http.disconnect через receive и тем
+    самым забирает себе сообщения с телом запроса. Здесь receive не
+    используется: тело читает обработчик через Request.stream(), а разрыв
+    соединения проявляется там как ClientDisconnect.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
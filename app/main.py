@@ -14,8 +14,10 @@ import structlog
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import router
+from configs.config import load_configs
 from infrastructure.database import get_database
 from infrastructure.dependency_injection import Container
 import structlog.stdlib
@@ -43,6 +45,7 @@ logger = structlog.get_logger(__name__)
 
 # Глобальный контейнер для dependency injection
 container = Container()
+container.config.from_dict(load_configs())
 
 
 @asynccontextmanager
@@ -76,6 +79,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application")
+    await container.inference_batcher().stop()
     await database.disconnect()
     logger.info("Application stopped")
 
@@ -86,6 +90,7 @@ app = FastAPI(
     description="Advanced ML/NLP service for text toxicity classification",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Настройка CORS
@@ -119,6 +124,29 @@ async def health_check():
     }
 
 
+@app.get("/metrics", tags=["health"])
+async def metrics():
+    """
+    Метрики сервиса.
+    
+    Состояние пула соединений БД: размер пула, занятые (checkedout)
+    и overflow соединения, время ожидания соединения. Счетчики
+    сохраненных и пропущенных политикой сохранения предсказаний,
+    размеры пачек батчера инференса, лимит и отклонения контроля допуска,
+    запросы, прерванные по крайнему сроку, и сэкономленная ими работа.
+    
+    Returns:
+        dict: Метрики сервиса
+    """
+    return {
+        "db_pool": get_database().pool_status(),
+        "persistence": container.persistence_policy().snapshot(),
+        "inference_batcher": container.inference_batcher().stats(),
+        "admission": container.admission_controller().stats(),
+        "deadlines": container.deadline_metrics().snapshot(),
+    }
+
+
 @app.get("/", tags=["root"])
 async def root():
     """
@@ -141,7 +169,6 @@ routes_module.container = container
 
 if __name__ == "__main__":
     import uvicorn
-    from configs.config import load_configs
     
     config = load_configs()
     app_config = config.get("app", {})
@@ -12,14 +12,27 @@ Application Layer
 
 from application.use_cases import (
     PredictTextUseCase,
+    StreamPredictTextUseCase,
     GetPredictionHistoryUseCase,
+    GetPredictionStatsUseCase,
 )
 from application.services import ModelService, TextPreprocessingService
+from application.persistence import PersistencePolicy
+from application.batching import InferenceBatcher
+from application.admission import AdmissionController, OverloadedError
+from application.deadlines import DeadlineMetrics
 
 __all__ = [
     "PredictTextUseCase",
+    "StreamPredictTextUseCase",
     "GetPredictionHistoryUseCase",
+    "GetPredictionStatsUseCase",
     "ModelService",
     "TextPreprocessingService",
+    "PersistencePolicy",
+    "InferenceBatcher",
+    "AdmissionController",
+    "OverloadedError",
+    "DeadlineMetrics",
 ]
 
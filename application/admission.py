@@ -0,0 +1,218 @@
+"""
+Admission Control
+
+Контроль допуска запросов на предсказание и сброс нагрузки (load shedding).
+При всплеске трафика сверх пропускной способности запросы без контроля
+копятся в event loop и executor, пока не истечет таймаут у каждого из
+них, и полезная пропускная способность (goodput) падает до нуля. Контроллер
+ограничивает число запросов в работе и время ожидания в очереди, а все,
+что сверх лимитов, сразу отклоняется (503 с Retry-After на уровне API).
+
+Лимит может подстраиваться под наблюдаемую задержку (AIMD): пока
+задержка ниже целевой, лимит растет на единицу за "окно" запросов,
+при превышении - уменьшается мультипликативно.
+
+Паттерны:
+- Admission Control / Load Shedding
+- AIMD (Additive Increase, Multiplicative Decrease)
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class OverloadedError(RuntimeError):
+    """
+    Запрос отклонен контролем допуска.
+    
+    Attributes:
+        reason: Причина отклонения (queue_full или queue_timeout)
+        retry_after: Рекомендуемая пауза перед повтором в секундах
+    """
+    
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Service overloaded ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Ограничение числа запросов в работе с очередью ожидания.
+    
+    Запрос допускается сразу, если число запросов в работе меньше лимита
+    и очередь пуста. Иначе он ждет в FIFO очереди не дольше max_queue_wait_ms;
+    если очередь заполнена (max_queue_size) или время ожидания истекло,
+    запрос отклоняется с OverloadedError. Освободившееся место передается
+    первому ожидающему.
+    
+    В адаптивном режиме лимит меняется в пределах [min_in_flight, max_in_flight]
+    по задержке допущенных запросов относительно target_latency_ms (AIMD).
+    Уменьшение происходит не чаще одного раза за target_latency_ms, чтобы
+    одна перегруженная волна не обнулила лимит.
+    
+    Экземпляр один на процесс (Singleton в DI контейнере). Состояние
+    изменяется без await внутри event loop, поэтому блокировки не нужны.
+    
+    Args:
+        max_in_flight: Максимальное число запросов в работе
+        max_queue_size: Максимальное число ожидающих запросов
+        max_queue_wait_ms: Максимальное время ожидания в очереди
+        adaptive: Подстраивать лимит под задержку (AIMD)
+        target_latency_ms: Целевая задержка запроса для адаптивного режима
+        min_in_flight: Нижняя граница лимита в адаптивном режиме
+        retry_after_seconds: Значение Retry-After для отклоненных запросов
+    """
+    
+    # Коэффициент мультипликативного уменьшения лимита
+    DECREASE_FACTOR = 0.9
+    
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        max_queue_wait_ms: Optional[float] = None,
+        adaptive: bool = False,
+        target_latency_ms: Optional[float] = None,
+        min_in_flight: Optional[int] = None,
+        retry_after_seconds: Optional[int] = None,
+    ):
+        """
+        Инициализация контроллера.
+        
+        Args:
+            max_in_flight: Максимальное число запросов в работе (по умолчанию 64)
+            max_queue_size: Максимальная длина очереди (по умолчанию 4 * max_in_flight)
+            max_queue_wait_ms: Максимальное ожидание в очереди (по умолчанию 100 мс)
+            adaptive: Включить AIMD
+            target_latency_ms: Целевая задержка (по умолчанию 50 мс)
+            min_in_flight: Нижняя граница лимита (по умолчанию 1)
+            retry_after_seconds: Retry-After в секундах (по умолчанию 1)
+        
+        Raises:
+            ValueError: Если лимиты не положительные
+        """
+        self.max_in_flight = int(max_in_flight or 64)
+        self.max_queue_size = int(
+            4 * self.max_in_flight if max_queue_size is None else max_queue_size
+        )
+        self.max_queue_wait = float(100 if max_queue_wait_ms is None else max_queue_wait_ms) / 1000
+        self.adaptive = bool(adaptive)
+        self.target_latency = float(target_latency_ms or 50) / 1000
+        self.min_in_flight = int(min_in_flight or 1)
+        self.retry_after = int(retry_after_seconds or 1)
+        if self.max_in_flight < 1 or self.min_in_flight < 1 or self.max_queue_size < 0:
+            raise ValueError("Admission limits must be positive")
+        
+        self.limit = float(self.max_in_flight)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self._counters: Dict[str, int] = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_queue_full": 0,
+            "rejected_queue_timeout": 0,
+        }
+    
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Допустить запрос на время блока with.
+        
+        Raises:
+            OverloadedError: Если очередь заполнена или ожидание истекло
+        """
+        await self._acquire()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - start)
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Получить состояние и счетчики контроллера.
+        
+        Returns:
+            Dict[str, float]: Текущий лимит, запросы в работе и в очереди,
+                счетчики допущенных и отклоненных запросов
+        """
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            **self._counters,
+        }
+    
+    async def _acquire(self) -> None:
+        """Занять место в работе или дождаться его в очереди."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self._counters["admitted"] += 1
+            return
+        
+        if len(self._waiters) >= self.max_queue_size:
+            self._counters["rejected_queue_full"] += 1
+            raise OverloadedError("queue_full", self.retry_after)
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._counters["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_queue_wait)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Место передано одновременно с истечением ожидания
+                self._counters["admitted"] += 1
+                return
+            waiter.cancel()
+            self._waiters.remove(waiter)
+            self._counters["rejected_queue_timeout"] += 1
+            raise OverloadedError("queue_timeout", self.retry_after)
+        except asyncio.CancelledError:
+            # Клиент отключился: вернуть место, если оно уже передано
+            if waiter.done() and not waiter.cancelled():
+                self._release(None)
+            else:
+                waiter.cancel()
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            raise
+        self._counters["admitted"] += 1
+    
+    def _release(self, latency: Optional[float]) -> None:
+        """Освободить место, подстроить лимит и передать места ожидающим."""
+        self.in_flight -= 1
+        if self.adaptive and latency is not None:
+            self._adjust_limit(latency)
+        
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+    
+    def _adjust_limit(self, latency: float) -> None:
+        """AIMD: +1 за окно быстрых запросов, * DECREASE_FACTOR при медленном."""
+        if latency <= self.target_latency:
+            self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+            return
+        
+        now = time.monotonic()
+        if now - self._last_decrease >= self.target_latency:
+            self._last_decrease = now
+            self.limit = max(float(self.min_in_flight), self.limit * self.DECREASE_FACTOR)
+            logger.info(
+                "Admission limit decreased",
+                limit=round(self.limit, 2),
+                latency_ms=round(latency * 1000, 1),
+            )
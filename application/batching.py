@@ -0,0 +1,198 @@
+"""
+Inference Batching
+
+Динамическое объединение одиночных запросов на предсказание в пачки.
+Запросы от всех HTTP и WebSocket клиентов попадают в одну очередь, а
+фоновая задача отправляет их в модель пачками: один forward pass на пачку
+дешевле, чем по одному на текст, и executor не забивается мелкими задачами.
+
+Паттерны:
+- Decorator Pattern (реализует тот же IModelService)
+- Micro-batching
+"""
+
+import asyncio
+from typing import List, Optional, Sequence, Tuple
+
+import structlog
+
+from application.interfaces import IModelService
+from domain.exceptions import DeadlineExceeded
+from domain.value_objects import Deadline
+
+logger = structlog.get_logger(__name__)
+
+
+class InferenceBatcher(IModelService):
+    """
+    Сервис модели с динамическим батчингом одиночных запросов.
+    
+    Фоновая задача берет первый запрос из очереди, забирает все уже
+    ожидающие запросы и, если пачка не заполнена, ждет новые не дольше
+    max_wait_ms. При низкой нагрузке задержка добавляется не больше
+    max_wait_ms, при высокой пачки заполняются сразу.
+    
+    Запросы, крайний срок которых истек в очереди, не попадают в пачку:
+    их future сразу завершается с DeadlineExceeded. Сроки остальных
+    передаются в модель и проверяются еще раз перед предобработкой
+    и перед forward pass.
+    
+    Экземпляр один на процесс (Singleton в DI контейнере). Фоновая задача
+    запускается при первом запросе в текущем event loop.
+    
+    Args:
+        model_service: Сервис модели, выполняющий предсказание пачки
+        max_batch_size: Максимальный размер пачки
+        max_wait_ms: Максимальное ожидание добора пачки в миллисекундах
+    """
+    
+    def __init__(
+        self,
+        model_service: IModelService,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        """
+        Инициализация батчера.
+        
+        Args:
+            model_service: Сервис модели
+            max_batch_size: Максимальный размер пачки (по умолчанию 64)
+            max_wait_ms: Максимальное ожидание добора пачки (по умолчанию 2 мс)
+        """
+        self.model_service = model_service
+        self.max_batch_size = int(max_batch_size or 64)
+        self.max_wait = float(2 if max_wait_ms is None else max_wait_ms) / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+    
+    async def predict(self, text: str, deadline: Optional[Deadline] = None) -> Tuple[float, float]:
+        """
+        Поставить текст в очередь и дождаться результата его пачки.
+        
+        Args:
+            text: Текст для анализа
+            deadline: Крайний срок запроса (None - без ограничения)
+        
+        Returns:
+            Tuple[float, float]: (toxicity_score, confidence)
+        
+        Raises:
+            DeadlineExceeded: Если срок истек до предобработки или forward pass
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, deadline))
+        return await future
+    
+    async def predict_batch(
+        self,
+        texts: List[str],
+        deadlines: Optional[Sequence[Optional[Deadline]]] = None,
+    ) -> List[Tuple[float, float]]:
+        """
+        Предсказание для готовой пачки (без очереди, она уже сформирована).
+        
+        Args:
+            texts: Тексты для анализа
+            deadlines: Крайние сроки текстов (None - без ограничения)
+        
+        Returns:
+            List[Tuple[float, float]]: (toxicity_score, confidence) для каждого текста
+        """
+        return await self.model_service.predict_batch(texts, deadlines=deadlines)
+    
+    def get_model_version(self) -> str:
+        """
+        Получить версию модели.
+        
+        Returns:
+            str: Версия модели
+        """
+        return self.model_service.get_model_version()
+    
+    def stats(self) -> dict:
+        """
+        Получить счетчики батчера.
+        
+        Returns:
+            dict: Количество пачек, текстов, средний размер пачки и длина очереди
+        """
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+        }
+    
+    async def stop(self) -> None:
+        """Остановить фоновую задачу (при завершении приложения)."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+    
+    def _ensure_worker(self) -> None:
+        """Запустить фоновую задачу, если она еще не запущена."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+    
+    async def _run(self) -> None:
+        """Формировать пачки из очереди и отправлять их в модель."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Запросы, отмененные клиентом или с истекшим сроком, не отправляются в модель
+            pending = []
+            for text, future, deadline in batch:
+                if future.cancelled():
+                    continue
+                if deadline is not None and deadline.expired():
+                    future.set_exception(DeadlineExceeded("preprocess"))
+                    continue
+                pending.append((text, future, deadline))
+            if not pending:
+                continue
+            
+            deadlines = [deadline for _, _, deadline in pending]
+            self.batches += 1
+            self.items += len(pending)
+            try:
+                results = await self.model_service.predict_batch(
+                    [text for text, _, _ in pending],
+                    deadlines=deadlines if any(deadlines) else None,
+                )
+            except Exception as e:
+                logger.error("Batch inference failed", batch_size=len(pending), error=str(e))
+                for _, future, _ in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future, _), result in zip(pending, results):
+                if future.done():
+                    continue
+                if isinstance(result, DeadlineExceeded):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,66 @@
+"""
+Deadline Metrics
+
+Учет запросов, прерванных по истечении крайнего срока, и сэкономленной
+этим работы (предобработка, forward pass, запись в БД).
+
+Паттерны:
+- Metrics Collector
+"""
+
+from typing import Dict
+
+# Этапы в порядке обработки запроса
+DEADLINE_STAGES = ("admission", "preprocess", "inference", "persist")
+
+
+class DeadlineMetrics:
+    """
+    Счетчики запросов с крайним сроком.
+    
+    Запрос, прерванный перед этапом, не выполняет этот этап и все
+    последующие, поэтому сэкономленная работа считается накопительно:
+    прерванный перед предобработкой не выполняет и forward pass.
+    Запись в БД считается сэкономленной только для прерванных перед ней:
+    для более ранних этапов неизвестно, сохранила бы результат политика.
+    
+    Экземпляр один на процесс (Singleton в DI контейнере). Счетчики
+    изменяются без await внутри event loop, поэтому блокировки не нужны.
+    """
+    
+    def __init__(self):
+        """Инициализация счетчиков."""
+        self.requests = 0
+        self.dropped: Dict[str, int] = {stage: 0 for stage in DEADLINE_STAGES}
+    
+    def observe_request(self) -> None:
+        """Учесть запрос с крайним сроком."""
+        self.requests += 1
+    
+    def observe_drop(self, stage: str) -> None:
+        """
+        Учесть запрос, прерванный перед этапом stage.
+        
+        Args:
+            stage: Этап из DEADLINE_STAGES
+        """
+        self.dropped[stage] = self.dropped.get(stage, 0) + 1
+    
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Получить счетчики.
+        
+        Returns:
+            Dict[str, int]: Запросы с крайним сроком, прерванные по этапам
+                и пропущенные благодаря этому предобработки, forward pass
+                и записи в БД
+        """
+        dropped = self.dropped
+        skipped_preprocess = dropped["admission"] + dropped["preprocess"]
+        return {
+            "requests": self.requests,
+            **{f"dropped_{stage}": count for stage, count in dropped.items()},
+            "skipped_preprocess": skipped_preprocess,
+            "skipped_inference": skipped_preprocess + dropped["inference"],
+            "skipped_db_writes": dropped["persist"],
+        }
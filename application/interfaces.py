@@ -5,9 +5,10 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from domain.entities import TextClassification
+from domain.value_objects import Deadline
 
 
 class IModelService(ABC):
@@ -18,15 +19,39 @@ class IModelService(ABC):
     """
     
     @abstractmethod
-    async def predict(self, text: str) -> Tuple[float, float]:
+    async def predict(self, text: str, deadline: Optional[Deadline] = None) -> Tuple[float, float]:
         """
         Выполнить предсказание токсичности текста.
         
         Args:
             text: Текст для анализа
+            deadline: Крайний срок запроса (None - без ограничения)
             
         Returns:
             Tuple[float, float]: (toxicity_score, confidence)
+            
+        Raises:
+            DeadlineExceeded: Если срок истек до предобработки или forward pass
+        """
+        pass
+    
+    @abstractmethod
+    async def predict_batch(
+        self,
+        texts: List[str],
+        deadlines: Optional[Sequence[Optional[Deadline]]] = None,
+    ) -> List[Tuple[float, float]]:
+        """
+        Выполнить предсказание токсичности для пачки текстов.
+        
+        Args:
+            texts: Тексты для анализа
+            deadlines: Крайние сроки текстов (None - без ограничения)
+            
+        Returns:
+            List[Tuple[float, float]]: (toxicity_score, confidence) для каждого текста
+                в порядке входных текстов. Если переданы deadlines, на месте
+                текстов с истекшим сроком стоит экземпляр DeadlineExceeded
         """
         pass
     
@@ -0,0 +1,125 @@
+"""
+Persistence Policy
+
+Политика сохранения предсказаний в репозиторий.
+Токсичные результаты сохраняются всегда, нетоксичные - выборочно
+с настраиваемой вероятностью, что снижает объем записи в БД
+пропорционально доле нетоксичного трафика.
+
+Выборочно сохраненная запись получает вес 1 / benign_sample_rate
+(PredictionResult.sample_weight), и почасовая статистика суммирует веса,
+а не строки: count в /stats - оценка числа всех предсказаний, включая
+не сохраненные по выборке. Явно пропущенные (persist=false) не учитываются.
+
+Паттерны:
+- Policy (Strategy) Pattern
+"""
+
+import random
+from typing import Callable, Dict, Optional
+
+from domain.entities import PredictionResult
+from domain.value_objects import ToxicityLevel
+
+
+class PersistencePolicy:
+    """
+    Политика выборочного сохранения предсказаний.
+    
+    Решение принимается в таком порядке:
+    1. Явное указание вызывающей стороны (override) имеет приоритет
+    2. Токсичные результаты (любой уровень, кроме NON_TOXIC) сохраняются всегда
+    3. Нетоксичные сохраняются с вероятностью benign_sample_rate
+       и весом 1 / benign_sample_rate (prediction.sample_weight)
+    
+    Экземпляр один на процесс (Singleton в DI контейнере) и ведет счетчики
+    сохраненных и пропущенных предсказаний. Счетчики изменяются без await
+    внутри event loop, поэтому блокировки не нужны.
+    
+    Args:
+        benign_sample_rate: Доля сохраняемых нетоксичных предсказаний (0.0 - 1.0)
+        random_func: Источник случайных чисел в [0, 1) (для воспроизводимости)
+    """
+    
+    def __init__(
+        self,
+        benign_sample_rate: Optional[float] = None,
+        random_func: Callable[[], float] = random.random,
+    ):
+        """
+        Инициализация политики.
+        
+        Args:
+            benign_sample_rate: Доля сохраняемых нетоксичных предсказаний
+                (по умолчанию 1.0 - сохранять все)
+            random_func: Источник случайных чисел в [0, 1)
+        
+        Raises:
+            ValueError: Если benign_sample_rate вне диапазона [0, 1]
+        """
+        rate = 1.0 if benign_sample_rate is None else float(benign_sample_rate)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"benign_sample_rate must be between 0.0 and 1.0, got {rate}")
+        
+        self.benign_sample_rate = rate
+        self._random = random_func
+        self._counters: Dict[str, int] = {
+            "persisted_toxic": 0,
+            "persisted_sampled": 0,
+            "persisted_forced": 0,
+            "skipped_sampled": 0,
+            "skipped_forced": 0,
+        }
+    
+    def should_persist(self, prediction: PredictionResult, override: Optional[bool] = None) -> bool:
+        """
+        Решить, сохранять ли предсказание, и учесть решение в счетчиках.
+        
+        Для выборочно сохраненного нетоксичного предсказания проставляет
+        prediction.sample_weight = 1 / benign_sample_rate, для остальных - 1.0.
+        
+        Args:
+            prediction: Результат предсказания
+            override: Явное решение вызывающей стороны (None - по политике)
+        
+        Returns:
+            bool: True, если предсказание нужно сохранить
+        """
+        prediction.sample_weight = 1.0
+        if override is not None:
+            self._counters["persisted_forced" if override else "skipped_forced"] += 1
+            return override
+        
+        if prediction.text_classification.toxicity_level != ToxicityLevel.NON_TOXIC:
+            self._counters["persisted_toxic"] += 1
+            return True
+        
+        if self._random() < self.benign_sample_rate:
+            self._counters["persisted_sampled"] += 1
+            prediction.sample_weight = 1.0 / self.benign_sample_rate
+            return True
+        
+        self._counters["skipped_sampled"] += 1
+        return False
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Получить счетчики политики.
+        
+        Returns:
+            Dict[str, float]: Итоги persisted/skipped, разбивка по причинам
+                и текущая доля выборки нетоксичных предсказаний
+        """
+        counters = dict(self._counters)
+        persisted = (
+            counters["persisted_toxic"]
+            + counters["persisted_sampled"]
+            + counters["persisted_forced"]
+        )
+        skipped = counters["skipped_sampled"] + counters["skipped_forced"]
+        return {
+            "persisted": persisted,
+            "skipped": skipped,
+            **counters,
+            "benign_sample_rate": self.benign_sample_rate,
+        }
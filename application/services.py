@@ -11,7 +11,7 @@ Application Services
 
 import asyncio
 import time
-from typing import Tuple
+from typing import Any, List, Optional, Sequence, Tuple
 
 import structlog
 import torch
@@ -19,11 +19,15 @@ import pickle
 
 from application.interfaces import IModelService, ITextPreprocessingService
 from configs.config import load_configs
+from domain.exceptions import DeadlineExceeded
+from domain.value_objects import Deadline
+from model.modeling import TextPreprocessor, load_classifier
+from model.sparse import csr_to_torch
 
 logger = structlog.get_logger(__name__)
 
 
-class TextPreprocessingService(ITextPreprocessingService):
+class TextPreprocessingService(TextPreprocessor, ITextPreprocessingService):
     """
     Сервис предобработки текста.
     
@@ -33,51 +37,10 @@ class TextPreprocessingService(ITextPreprocessingService):
     - Удаление стоп-слов
     - Нормализация
     
-    Использует NLTK для обработки текста.
+    Использует NLTK для обработки текста. Реализация - TextPreprocessor
+    из model/modeling.py, на котором обучается векторайзер: предобработка
+    при обучении и в сервисе не может разойтись.
     """
-    
-    def __init__(self):
-        """Инициализация сервиса предобработки."""
-        import nltk
-        from nltk.corpus import stopwords
-        from nltk.stem import WordNetLemmatizer
-        from nltk.tokenize import RegexpTokenizer
-        
-        try:
-            self.stopwords = stopwords.words("english")
-            self.lemmatizer = WordNetLemmatizer()
-            self.tokenizer = RegexpTokenizer(r'\w+')
-        except LookupError:
-            logger.warning("NLTK data not found, downloading required resources")
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-            self.stopwords = stopwords.words("english")
-            self.lemmatizer = WordNetLemmatizer()
-            self.tokenizer = RegexpTokenizer(r'\w+')
-    
-    def preprocess(self, text: str) -> str:
-        """
-        Предобработать текст.
-        
-        Процесс:
-        1. Приведение к нижнему регистру
-        2. Токенизация
-        3. Удаление стоп-слов
-        4. Лемматизация
-        5. Объединение в строку
-        
-        Args:
-            text: Исходный текст
-            
-        Returns:
-            str: Предобработанный текст
-        """
-        text = text.lower()
-        tokens = self.tokenizer.tokenize(text)
-        tokens = [word for word in tokens if word not in self.stopwords]
-        tokens = [self.lemmatizer.lemmatize(word) for word in tokens]
-        return " ".join(tokens)
 
 
 class ModelService(IModelService):
@@ -115,8 +78,8 @@ class ModelService(IModelService):
         Загружает модель только при первом использовании.
         Это оптимизирует время старта приложения.
         
-        Примечание: Предполагается, что модель сохранена как state_dict.
-        Если модель сохранена полностью, используйте torch.load напрямую.
+        Примечание: Модель сохраняется model/train.py как state_dict,
+        целиком сохраненная модель (legacy) тоже поддерживается.
         """
         if self._model is None:
             config = load_configs()
@@ -129,30 +92,8 @@ class ModelService(IModelService):
             logger.info("Loading model", model_path=model_path, vectorizer_path=vectorizer_path)
             
             try:
-                # Загрузка state_dict модели
-                checkpoint = torch.load(model_path, map_location=self._device)
-                
-                # Импорт класса модели
-                from model.train import TextClassifier
-                
-                # Определение размеров модели (в production лучше хранить в конфиге)
-                # Используем типичные значения для TF-IDF + MLP
-                input_size = 100000  # Примерный размер, должен совпадать с обучением
-                hidden_size = 128
-                output_size = 2
-                
-                # Создание модели и загрузка весов
-                self._model = TextClassifier(input_size=input_size, hidden_size=hidden_size, output_size=output_size)
-                
-                if isinstance(checkpoint, dict):
-                    # Если это словарь (state_dict)
-                    self._model.load_state_dict(checkpoint)
-                else:
-                    # Если это уже модель (legacy)
-                    self._model = checkpoint
-                
-                self._model.eval()
-                self._model.to(self._device)
+                # Размеры слоев берутся из state_dict, поэтому подходит модель с любым словарем
+                self._model = load_classifier(model_path, self._device)
                 
             except Exception as e:
                 logger.error("Failed to load model", error=str(e), exc_info=True)
@@ -170,52 +111,169 @@ class ModelService(IModelService):
             
             logger.info("Model loaded successfully", version=self._model_version)
     
-    async def predict(self, text: str) -> Tuple[float, float]:
+    def load(self) -> None:
         """
-        Выполнить асинхронное предсказание токсичности текста.
+        Загрузить модель заранее, не дожидаясь первого предсказания.
         
-        Процесс:
-        1. Предобработка текста
-        2. Векторизация (TF-IDF)
-        3. Преобразование в тензор
-        4. Предсказание модели
-        5. Вычисление confidence
+        Используется процессами Celery воркеров: модель загружается один
+        раз при старте процесса, а не в первой задаче.
+        """
+        self._load_model()
+    
+    def predict_batch_sync(self, texts: List[str]) -> List[Tuple[float, float]]:
+        """
+        Синхронное предсказание для пачки текстов (вне event loop).
+        
+        Используется в Celery задачах: вся пачка векторизуется и проходит
+        через модель одним forward pass.
+        
+        Args:
+            texts: Тексты для анализа
+            
+        Returns:
+            List[Tuple[float, float]]: (toxicity_score, confidence) для каждого текста
+        """
+        if not texts:
+            return []
+        if self._model is None:
+            self._load_model()
+        return self._predict_batch_sync(texts)
+    
+    async def predict(self, text: str, deadline: Optional[Deadline] = None) -> Tuple[float, float]:
+        """
+        Выполнить асинхронное предсказание токсичности текста.
         
         Args:
             text: Текст для анализа
+            deadline: Крайний срок запроса (None - без ограничения)
             
         Returns:
             Tuple[float, float]: (toxicity_score, confidence)
                 - toxicity_score: Оценка токсичности (0.0 - 1.0)
                 - confidence: Уверенность модели (0.0 - 1.0)
+                
+        Raises:
+            DeadlineExceeded: Если срок истек до предобработки или forward pass
         """
+        if deadline is None:
+            return (await self.predict_batch([text]))[0]
+        
+        result = (await self.predict_batch([text], deadlines=[deadline]))[0]
+        if isinstance(result, DeadlineExceeded):
+            raise result
+        return result
+    
+    async def predict_batch(
+        self,
+        texts: List[str],
+        deadlines: Optional[Sequence[Optional[Deadline]]] = None,
+    ) -> List[Tuple[float, float]]:
+        """
+        Выполнить асинхронное предсказание для пачки текстов.
+        
+        Предобработка, векторизация и forward pass выполняются одним
+        вызовом в executor, чтобы не блокировать event loop. Один forward
+        на пачку дешевле, чем по одному на текст.
+        
+        Крайние сроки проверяются уже в executor (задача могла ждать в его
+        очереди): тексты с истекшим сроком не предобрабатываются, а строки,
+        срок которых истек во время предобработки, не идут в forward pass.
+        
+        Args:
+            texts: Тексты для анализа
+            deadlines: Крайние сроки текстов (None - без ограничения)
+            
+        Returns:
+            List[Tuple[float, float]]: (toxicity_score, confidence) для каждого текста;
+                DeadlineExceeded на месте текстов с истекшим сроком
+        """
+        if not texts:
+            return []
+        
         # Ленивая загрузка модели
         if self._model is None:
             self._load_model()
         
-        # Предобработка текста
-        preprocessed_text = self.preprocessor.preprocess(text)
-        
-        # Векторизация
-        text_vector = self._vectorizer.transform([preprocessed_text])
-        text_vector = text_vector.toarray()
+        loop = asyncio.get_running_loop()
+        if deadlines is None:
+            return await loop.run_in_executor(None, self._predict_batch_sync, texts)
+        return await loop.run_in_executor(
+            None, self._predict_batch_deadlines_sync, texts, deadlines
+        )
+    
+    def featurize(self, texts: List[str]) -> Any:
+        """
+        Предобработать и векторизовать тексты.
         
-        # Преобразование в тензор
-        text_tensor = torch.tensor(text_vector, dtype=torch.float32, device=self._device)
-        text_tensor = text_tensor.unsqueeze(0)
+        Args:
+            texts: Исходные тексты
+            
+        Returns:
+            Any: Матрица признаков (TF-IDF, scipy.sparse)
+        """
+        preprocessed = [self.preprocessor.preprocess(text) for text in texts]
+        return self._vectorizer.transform(preprocessed)
+    
+    def infer(self, features: Any) -> List[Tuple[float, float]]:
+        """
+        Выполнить forward pass модели для матрицы признаков.
         
-        # Предсказание (синхронно, но в executor для неблокирующей работы)
-        loop = asyncio.get_event_loop()
+        Args:
+            features: Матрица признаков из featurize
+            
+        Returns:
+            List[Tuple[float, float]]: (toxicity_score, confidence) для каждой строки
+        """
+        # CSR тензор вместо toarray(): плотная матрица (batch x словарь) не создается
+        tensor = csr_to_torch(features).to(self._device)
         with torch.no_grad():
-            output = await loop.run_in_executor(None, self._model, text_tensor)
+            output = self._model(tensor)
             probabilities = torch.softmax(output, dim=1)
-            predicted_class = output.argmax(dim=1).item()
-            confidence = probabilities[0][predicted_class].item()
-            
+        
+        confidences = probabilities.max(dim=1).values.tolist()
+        if output.shape[1] > 1:
             # Для бинарной классификации: токсичный класс = 1
-            toxicity_score = probabilities[0][1].item() if output.shape[1] > 1 else float(predicted_class)
+            scores = probabilities[:, 1].tolist()
+        else:
+            scores = [float(c) for c in output.argmax(dim=1).tolist()]
+        return list(zip(scores, confidences))
+    
+    def _predict_batch_sync(self, texts: List[str]) -> List[Tuple[float, float]]:
+        """Синхронный конвейер featurize -> infer (выполняется в executor)."""
+        return self.infer(self.featurize(texts))
+    
+    def _predict_batch_deadlines_sync(
+        self,
+        texts: List[str],
+        deadlines: Sequence[Optional[Deadline]],
+    ) -> List[Any]:
+        """Конвейер featurize -> infer с отбрасыванием строк с истекшим сроком."""
+        results: List[Any] = [None] * len(texts)
+        
+        def alive(indices: List[int], stage: str) -> List[int]:
+            kept = []
+            for i in indices:
+                if deadlines[i] is not None and deadlines[i].expired():
+                    results[i] = DeadlineExceeded(stage)
+                else:
+                    kept.append(i)
+            return kept
+        
+        preprocess = alive(list(range(len(texts))), "preprocess")
+        if not preprocess:
+            return results
+        features = self.featurize([texts[i] for i in preprocess])
+        
+        inference = alive(preprocess, "inference")
+        if not inference:
+            return results
+        if len(inference) < len(preprocess):
+            position = {index: row for row, index in enumerate(preprocess)}
+            features = features[[position[i] for i in inference]]
         
-        return toxicity_score, confidence
+        for i, result in zip(inference, self.infer(features)):
+            results[i] = result
+        return results
     
     def get_model_version(self) -> str:
         """
@@ -10,15 +10,21 @@ Use Cases инкапсулируют бизнес-логику для конкр
 - CQRS (можно расширить разделением Command/Query)
 """
 
+import asyncio
 import time
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 import structlog
 
 from application.interfaces import IModelService
+from application.deadlines import DeadlineMetrics
+from application.persistence import PersistencePolicy
 from domain.entities import PredictionResult
-from domain.repositories import IPredictionRepository
+from domain.exceptions import DeadlineExceeded
+from domain.repositories import IPredictionRepository, IPredictionStatsRepository
+from domain.value_objects import Deadline, ToxicityLevel
 
 logger = structlog.get_logger(__name__)
 
@@ -29,18 +35,26 @@ class PredictTextUseCase:
     
     Координирует:
     - Вызов модели для предсказания
-    - Сохранение результата в репозиторий
+    - Сохранение результата в репозиторий (по политике сохранения)
     - Создание доменной сущности
     
+    Крайний срок запроса передается в сервис модели и репозиторий:
+    работа для клиента, который уже не ждет ответ, прерывается перед
+    предобработкой, forward pass или записью в БД.
+    
     Args:
         model_service: Сервис для работы с ML моделью
         prediction_repository: Репозиторий для сохранения предсказаний
+        persistence_policy: Политика сохранения (по умолчанию сохраняется все)
+        deadline_metrics: Счетчики прерванных по сроку запросов
     """
     
     def __init__(
         self,
         model_service: IModelService,
         prediction_repository: IPredictionRepository,
+        persistence_policy: Optional[PersistencePolicy] = None,
+        deadline_metrics: Optional[DeadlineMetrics] = None,
     ):
         """
         Инициализация use case.
@@ -48,14 +62,19 @@ class PredictTextUseCase:
         Args:
             model_service: Сервис для работы с ML моделью
             prediction_repository: Репозиторий для сохранения предсказаний
+            persistence_policy: Политика сохранения предсказаний
+            deadline_metrics: Счетчики прерванных по сроку запросов
         """
         self.model_service = model_service
         self.prediction_repository = prediction_repository
+        self.persistence_policy = persistence_policy or PersistencePolicy()
+        self.deadline_metrics = deadline_metrics or DeadlineMetrics()
     
     async def execute(
         self,
         text: str,
-        save_to_db: bool = True,
+        save_to_db: Optional[bool] = None,
+        deadline: Optional[Deadline] = None,
     ) -> PredictionResult:
         """
         Выполнить предсказание токсичности текста.
@@ -64,23 +83,32 @@ class PredictTextUseCase:
         1. Измерение времени начала обработки
         2. Вызов модели для предсказания
         3. Создание доменной сущности PredictionResult
-        4. Сохранение в БД (опционально)
+        4. Сохранение в БД (по политике сохранения или явному указанию)
         5. Возврат результата
         
         Args:
             text: Текст для анализа
-            save_to_db: Сохранять ли результат в БД
-            
+            save_to_db: Сохранять ли результат в БД (None - решает политика)
+            deadline: Крайний срок запроса (None - без ограничения)
+        
         Returns:
             PredictionResult: Результат предсказания с метаданными
+        
+        Raises:
+            DeadlineExceeded: Если срок истек до завершения обработки
         """
         start_time = time.time()
         
         try:
             logger.info("Starting prediction", text_length=len(text))
             
+            if deadline is not None:
+                self.deadline_metrics.observe_request()
+                # Срок мог истечь в очереди контроля допуска
+                deadline.check("admission")
+            
             # Получение предсказания от модели
-            toxicity_score, confidence = await self.model_service.predict(text)
+            toxicity_score, confidence = await self.model_service.predict(text, deadline=deadline)
             model_version = self.model_service.get_model_version()
             
             # Вычисление времени обработки
@@ -100,8 +128,8 @@ class PredictTextUseCase:
             )
             
             # Сохранение в репозиторий
-            if save_to_db:
-                prediction = await self.prediction_repository.save(prediction)
+            if self.persistence_policy.should_persist(prediction, override=save_to_db):
+                prediction = await self.prediction_repository.save(prediction, deadline=deadline)
                 logger.info(
                     "Prediction saved",
                     prediction_id=str(prediction.id),
@@ -111,12 +139,147 @@ class PredictTextUseCase:
                 logger.info("Prediction completed (not saved)", toxicity_score=toxicity_score)
             
             return prediction
-            
+        
+        except DeadlineExceeded as e:
+            self.deadline_metrics.observe_drop(e.stage)
+            logger.info("Prediction dropped: deadline exceeded", stage=e.stage)
+            raise
         except Exception as e:
             logger.error("Prediction failed", error=str(e), exc_info=True)
             raise
 
 
+class StreamPredictTextUseCase:
+    """
+    Use Case для потоковой оценки большого количества текстов.
+    
+    Входной поток разбивается на пачки для модели, пачки оцениваются
+    параллельно, а результаты отдаются строго в порядке входа. Число
+    пачек в работе (оценка и ожидание отправки) ограничено семафором,
+    который занимается до создания задачи оценки и освобождается, когда
+    результат пачки забран: когда потребитель результатов не успевает,
+    use case перестает читать входной поток (backpressure), поэтому память
+    не зависит от длины потока. Результаты не сохраняются в историю.
+    
+    Args:
+        model_service: Сервис для работы с ML моделью
+        batch_size: Максимальный размер пачки для модели
+        max_in_flight_batches: Максимальное число пачек в работе
+    """
+    
+    def __init__(
+        self,
+        model_service: IModelService,
+        batch_size: int = 64,
+        max_in_flight_batches: int = 4,
+    ):
+        """
+        Инициализация use case.
+        
+        Args:
+            model_service: Сервис для работы с ML моделью
+            batch_size: Максимальный размер пачки для модели
+            max_in_flight_batches: Максимальное число пачек в работе
+        """
+        self.model_service = model_service
+        self.batch_size = int(batch_size or 64)
+        self.max_in_flight_batches = int(max_in_flight_batches or 4)
+    
+    async def execute(
+        self,
+        items: AsyncIterator[Optional[Dict[str, Any]]],
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Оценить поток текстов.
+        
+        Элемент входа - dict с ключом text и необязательным id, либо dict
+        с ключом error (некорректная входная строка, передается в выход
+        на своем месте). None означает, что новых элементов пока нет и
+        неполную пачку стоит отправить в модель, не дожидаясь заполнения.
+        
+        Args:
+            items: Асинхронный поток элементов
+        
+        Yields:
+            List[Dict[str, Any]]: Результаты пачки в порядке входа
+                (id, toxicity_score, toxicity_level, confidence или id, error)
+        """
+        # Размер очереди ограничен семафором: в ней не больше пачек, чем слотов
+        slots = asyncio.Semaphore(self.max_in_flight_batches)
+        pending: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._produce(items, pending, slots))
+        scored = 0
+        
+        try:
+            while True:
+                entry = await pending.get()
+                if entry is None:
+                    break
+                if isinstance(entry, BaseException):
+                    raise entry
+                results = await entry
+                slots.release()
+                scored += len(results)
+                yield results
+        finally:
+            producer.cancel()
+            # Отменить пачки, которые уже не будут отправлены потребителю
+            while not pending.empty():
+                entry = pending.get_nowait()
+                if isinstance(entry, asyncio.Future):
+                    entry.cancel()
+            logger.info("Prediction stream finished", count=scored)
+    
+    async def _produce(
+        self,
+        items: AsyncIterator[Optional[Dict[str, Any]]],
+        pending: asyncio.Queue,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """Читать вход, формировать пачки и ставить их в очередь (блокируется, пока нет слота)."""
+        batch: List[Dict[str, Any]] = []
+        try:
+            async for item in items:
+                if item is not None:
+                    batch.append(item)
+                if batch and (item is None or len(batch) >= self.batch_size):
+                    await self._submit(batch, pending, slots)
+                    batch = []
+            if batch:
+                await self._submit(batch, pending, slots)
+            pending.put_nowait(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            pending.put_nowait(e)
+    
+    async def _submit(
+        self, batch: List[Dict[str, Any]], pending: asyncio.Queue, slots: asyncio.Semaphore
+    ) -> None:
+        """Занять слот и только затем запустить оценку пачки."""
+        await slots.acquire()
+        pending.put_nowait(asyncio.ensure_future(self._score(batch)))
+    
+    async def _score(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Оценить пачку и собрать результаты в порядке входа."""
+        texts = [item["text"] for item in batch if "error" not in item]
+        scores = iter(await self.model_service.predict_batch(texts))
+        
+        results = []
+        for item in batch:
+            if "error" in item:
+                results.append({"id": item.get("id"), "error": item["error"]})
+                continue
+            toxicity_score, confidence = next(scores)
+            results.append({
+                "id": item.get("id"),
+                "toxicity_score": toxicity_score,
+                "toxicity_level": ToxicityLevel.from_score(toxicity_score).value,
+                "confidence": confidence,
+            })
+        return results
+
+
 class GetPredictionHistoryUseCase:
     """
     Use Case для получения истории предсказаний.
@@ -149,7 +312,7 @@ class GetPredictionHistoryUseCase:
             limit: Максимальное количество записей
             offset: Смещение для пагинации
             text: Опциональный фильтр по тексту
-            
+        
         Returns:
             List[PredictionResult]: Список результатов предсказаний
         """
@@ -169,10 +332,10 @@ class GetPredictionHistoryUseCase:
         
         Args:
             prediction_id: UUID предсказания
-            
+        
         Returns:
             PredictionResult: Результат предсказания
-            
+        
         Raises:
             ValueError: Если предсказание не найдено
         """
@@ -185,4 +348,150 @@ class GetPredictionHistoryUseCase:
             raise ValueError(f"Prediction with id {prediction_id} not found")
         
         return result
+    
+    async def execute_rows(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить страницу истории как плоские строки (read model).
+        
+        Используется API для отдачи истории без построения доменных сущностей.
+        
+        Args:
+            limit: Максимальное количество записей
+            offset: Смещение для пагинации
+        
+        Returns:
+            List[Dict[str, Any]]: Строки истории
+        """
+        logger.info("Fetching prediction history rows", limit=limit, offset=offset)
+        
+        rows = await self.prediction_repository.get_history_rows(limit=limit, offset=offset)
+        
+        logger.info("Prediction history rows fetched", count=len(rows))
+        return rows
+    
+    async def get_row_by_id(self, prediction_id: UUID) -> Dict[str, Any]:
+        """
+        Получить строку истории по ID (read model).
+        
+        Args:
+            prediction_id: UUID предсказания
+        
+        Returns:
+            Dict[str, Any]: Строка истории
+        
+        Raises:
+            ValueError: Если предсказание не найдено
+        """
+        logger.info("Fetching prediction row by id", prediction_id=str(prediction_id))
+        
+        row = await self.prediction_repository.get_history_row_by_id(prediction_id)
+        
+        if row is None:
+            logger.warning("Prediction not found", prediction_id=str(prediction_id))
+            raise ValueError(f"Prediction with id {prediction_id} not found")
+        
+        return row
+    
+    async def stream_rows(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Потоково выгрузить историю предсказаний (экспорт).
+        
+        Args:
+            created_from: Нижняя граница created_at (включительно)
+            created_to: Верхняя граница created_at (не включительно)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+            batch_size: Размер пачки строк
+        
+        Yields:
+            List[Dict[str, Any]]: Пачка строк истории
+        """
+        logger.info(
+            "Starting prediction history export",
+            created_from=str(created_from),
+            created_to=str(created_to),
+            toxicity_level=toxicity_level,
+            model_version=model_version,
+        )
+        
+        exported = 0
+        async for batch in self.prediction_repository.stream_history_rows(
+            created_from=created_from,
+            created_to=created_to,
+            toxicity_level=toxicity_level,
+            model_version=model_version,
+            batch_size=batch_size,
+        ):
+            exported += len(batch)
+            yield batch
+        
+        logger.info("Prediction history export completed", count=exported)
+
 
+class GetPredictionStatsUseCase:
+    """
+    Use Case для получения агрегированной статистики предсказаний.
+    
+    Query в стиле CQRS: читает заранее посчитанные почасовые агрегаты,
+    а не сырую историю предсказаний.
+    
+    Args:
+        stats_repository: Репозиторий агрегированной статистики
+    """
+    
+    DEFAULT_WINDOW = timedelta(hours=24)
+    
+    def __init__(self, stats_repository: IPredictionStatsRepository):
+        """
+        Инициализация use case.
+        
+        Args:
+            stats_repository: Репозиторий агрегированной статистики
+        """
+        self.stats_repository = stats_repository
+    
+    async def execute(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить почасовую статистику.
+        
+        Args:
+            created_from: Начало интервала (по умолчанию created_to - 24 часа)
+            created_to: Конец интервала (по умолчанию текущее время)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+        
+        Returns:
+            List[Dict[str, Any]]: Почасовая статистика
+        """
+        created_to = created_to or datetime.now(timezone.utc)
+        created_from = created_from or created_to - self.DEFAULT_WINDOW
+        
+        logger.info(
+            "Fetching prediction stats",
+            created_from=str(created_from),
+            created_to=str(created_to),
+        )
+        
+        return await self.stats_repository.get_hourly_stats(
+            created_from=created_from,
+            created_to=created_to,
+            toxicity_level=toxicity_level,
+            model_version=model_version,
+        )
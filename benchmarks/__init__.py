@@ -0,0 +1,6 @@
+"""
+Benchmarks
+
+Скрипты для измерения производительности отдельных слоев сервиса.
+Запускаются из корня проекта: python -m benchmarks.<имя_скрипта>
+"""
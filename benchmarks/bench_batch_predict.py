@@ -0,0 +1,121 @@
+"""
+Benchmark: пропускная способность Celery задачи batch_predict
+
+Для каждого числа процессов воркера (--workers, по умолчанию 1, 4, 8)
+запускает Celery worker (prefork, --concurrency N), прогревает его
+(модель загружается в каждом процессе в worker_process_init) и
+отправляет batch_predict на --sizes текстов (по умолчанию 10k и 1M).
+Печатает время и texts/s от отправки задачи до получения результата
+chord (включая передачу текстов и результатов через Redis).
+
+Требуется Redis (настройки из configs.yml) и файлы модели. Очередь
+Celery очищается перед каждым запуском, поэтому не запускайте
+бенчмарк на брокере с рабочими задачами. С --external воркеры не
+запускаются: используются уже работающие (одна строка на размер).
+
+Запуск:
+    python -m benchmarks.bench_batch_predict --workers 1 4 8 --sizes 10000 1000000
+"""
+
+import argparse
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from infrastructure.celery_app import celery_app
+from infrastructure.tasks import batch_predict
+
+WORDS = (
+    "the you this that post article edit page please thanks wikipedia talk "
+    "stupid idiot hate source fact reason think people really would should"
+).split()
+
+
+def make_texts(count: int) -> List[str]:
+    """Сгенерировать синтетические тексты."""
+    rng = random.Random(42)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(5, 40))) for _ in range(count)]
+
+
+def start_worker(concurrency: int) -> subprocess.Popen:
+    """Запустить Celery worker и дождаться ответа на ping."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "celery", "-A", "infrastructure.celery_app", "worker",
+            "--pool", "prefork", "--concurrency", str(concurrency),
+            "--loglevel", "warning", "--hostname", f"bench{concurrency}@%h",
+        ],
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if celery_app.control.ping(timeout=1.0):
+            return process
+        if process.poll() is not None:
+            raise RuntimeError(f"Worker exited with code {process.returncode}")
+    stop_worker(process)
+    raise RuntimeError("Worker did not respond to ping within 120s")
+
+
+def stop_worker(process: subprocess.Popen) -> None:
+    """Остановить воркер (warm shutdown)."""
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_batch(texts: List[str], chunk_size: Optional[int], timeout: float) -> float:
+    """Выполнить batch_predict и вернуть время в секундах."""
+    start = time.perf_counter()
+    results = batch_predict.delay(texts, chunk_size=chunk_size).get(timeout=timeout)
+    elapsed = time.perf_counter() - start
+    if len(results) != len(texts):
+        raise RuntimeError(f"Expected {len(texts)} results, got {len(results)}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 4, 8], help="Процессов воркера"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 1_000_000], help="Текстов в batch_predict"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None, help="Размер чанка (по умолчанию jobs.chunk_size)"
+    )
+    parser.add_argument("--timeout", type=float, default=3600.0, help="Таймаут ожидания результата")
+    parser.add_argument(
+        "--external", action="store_true", help="Использовать уже запущенные воркеры"
+    )
+    args = parser.parse_args()
+    
+    texts = make_texts(max(args.sizes))
+    print(f"{'workers':>8} {'texts':>10} {'seconds':>9} {'texts/s':>10}")
+    
+    for concurrency in [None] if args.external else args.workers:
+        celery_app.control.purge()
+        worker = None if concurrency is None else start_worker(concurrency)
+        try:
+            # Прогрев: каждый процесс получает хотя бы один чанк
+            run_batch(texts[:max(1, concurrency or 1) * 2000], 1000, args.timeout)
+            for size in args.sizes:
+                elapsed = run_batch(texts[:size], args.chunk_size, args.timeout)
+                label = "ext" if concurrency is None else str(concurrency)
+                print(f"{label:>8} {size:>10,} {elapsed:>9.2f} {size / elapsed:>10,.0f}")
+        finally:
+            if worker is not None:
+                stop_worker(worker)
+
+
+if __name__ == "__main__":
+    main()
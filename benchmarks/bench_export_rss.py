@@ -0,0 +1,132 @@
+"""
+Benchmark: память сервера при потоковой выгрузке истории
+
+Заполняет таблицу predictions синтетическими строками (одним
+INSERT ... SELECT generate_series на стороне PostgreSQL), затем выгружает их
+через GET /api/v1/predictions/export и периодически снимает RSS процесса
+API из /proc/<pid>/status. При потоковой выгрузке RSS должен оставаться
+ровным независимо от количества строк.
+
+Требуется запущенный PostgreSQL (настройки из configs.yml) и API.
+
+Запуск:
+    python -m benchmarks.bench_export_rss --seed-rows 3000000 --server-pid <PID>
+    # без повторного сидирования
+    python -m benchmarks.bench_export_rss --server-pid <PID> --format csv
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import httpx
+from sqlalchemy import text
+
+from infrastructure.database import get_sync_engine
+from infrastructure.partitioning import ensure_partitions
+
+SEED_DAYS = 7
+
+
+def seed(rows: int) -> None:
+    """Вставить rows синтетических предсказаний за последние SEED_DAYS дней."""
+    today = datetime.now(timezone.utc).date()
+    engine = get_sync_engine()
+    with engine.begin() as connection:
+        ensure_partitions(
+            connection, days_ahead=SEED_DAYS + 1, start=today - timedelta(days=SEED_DAYS)
+        )
+        connection.execute(
+            text(
+                "INSERT INTO predictions (id, text, text_hash, text_length, toxicity_score, "
+                "toxicity_level, model_version, confidence, processing_time_ms, metadata, "
+                "created_at) "
+                "SELECT gen_random_uuid(), 'synthetic comment number ' || g, "
+                "encode(sha256(convert_to('synthetic comment number ' || g, 'UTF8')), 'hex'), "
+                "char_length('synthetic comment number ' || g), random(), "
+                "CASE WHEN random() < 0.1 THEN 'toxic' ELSE 'non_toxic' END, '1.0', "
+                "0.5 + random() / 2, 1 + random() * 20, '{}'::json, "
+                "now() - (g * (:days * interval '1 day') / :rows) "
+                "FROM generate_series(1, :rows) AS g"
+            ),
+            {"rows": rows, "days": SEED_DAYS},
+        )
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Текущий RSS процесса в мегабайтах (Linux /proc)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        return None
+    return None
+
+
+def export(base_url: str, export_format: str, pid: Optional[int], sample_every_mb: int) -> None:
+    """Выгрузить историю и печатать RSS сервера по мере чтения."""
+    received = 0
+    lines = 0
+    next_sample = 0
+    samples = []
+    start = time.perf_counter()
+    
+    with httpx.stream(
+        "GET",
+        f"{base_url}/api/v1/predictions/export",
+        params={"format": export_format},
+        timeout=None,
+    ) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            received += len(chunk)
+            lines += chunk.count(b"\n")
+            if pid is not None and received >= next_sample:
+                rss = read_rss_mb(pid)
+                samples.append(rss)
+                print(
+                    f"{received / 2**20:>10.0f} MB received {lines:>12,} lines  "
+                    f"server RSS {rss:>8.1f} MB"
+                )
+                next_sample += sample_every_mb * 2**20
+    
+    elapsed = time.perf_counter() - start
+    print(f"\nExported {lines:,} lines ({received / 2**20:.0f} MB) in {elapsed:.1f}s "
+          f"({lines / elapsed:,.0f} rows/s)")
+    if samples:
+        print(
+            f"Server RSS: first {samples[0]:.1f} MB, max {max(samples):.1f} MB, "
+            f"last {samples[-1]:.1f} MB"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--seed-rows", type=int, default=0, help="Сколько строк вставить перед выгрузкой"
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--format", dest="export_format", choices=["ndjson", "csv"], default="ndjson"
+    )
+    parser.add_argument(
+        "--server-pid", type=int, default=None, help="PID процесса API для замера RSS"
+    )
+    parser.add_argument("--sample-every-mb", type=int, default=50)
+    args = parser.parse_args()
+    
+    if args.seed_rows:
+        start = time.perf_counter()
+        seed(args.seed_rows)
+        print(f"Seeded {args.seed_rows:,} rows in {time.perf_counter() - start:.1f}s")
+    
+    export(args.base_url, args.export_format, args.server_pid, args.sample_every_mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: read path истории предсказаний
+
+Сравнивает пропускную способность (rows/s) двух путей чтения истории
+для страниц по 100 и 1000 строк:
+
+- orm: SELECT PredictionORM -> _to_domain -> PredictionHistorySchema -> JSON
+  (прежний путь GET /api/v1/predictions)
+- projection: SELECT нужных колонок -> dict -> JSON (read model)
+
+Для независимости от PostgreSQL используется SQLite в памяти через sync
+SQLAlchemy: оба пути выполняют одинаковые запросы, разница приходится
+на гидратацию ORM, доменный маппинг и Pydantic.
+
+Запуск:
+    python -m benchmarks.bench_history_read_path --rows 20000 --repeat 20
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.api.schemas import PredictionHistorySchema
+from app.api.serializers import dump_json
+from infrastructure.database import Base
+from infrastructure.models import PredictionORM
+from infrastructure.repositories import PredictionRepository
+from infrastructure.text_codec import text_hash
+
+PAGE_SIZES = (100, 1000)
+
+_history_adapter = TypeAdapter(List[PredictionHistorySchema])
+_mapper = PredictionRepository(session_scope=None)
+
+
+def seed(session: Session, rows: int) -> None:
+    """Заполнить таблицу синтетическими предсказаниями."""
+    now = datetime.utcnow()
+    texts = [f"sample comment number {i} " * random.randint(1, 8) for i in range(rows)]
+    session.add_all(
+        PredictionORM(
+            id=uuid4(),
+            text=texts[i],
+            text_hash=text_hash(texts[i]),
+            text_length=len(texts[i]),
+            toxicity_score=random.random(),
+            toxicity_level=random.choice(["toxic", "non_toxic"]),
+            model_version="1.0",
+            confidence=random.uniform(0.5, 1.0),
+            processing_time_ms=random.uniform(1.0, 20.0),
+            metadata_={"text_length": 42, "device": "cpu"},
+            created_at=now - timedelta(seconds=i),
+        )
+        for i in range(rows)
+    )
+    session.commit()
+    session.expunge_all()
+
+
+def orm_page(session: Session, limit: int) -> bytes:
+    """Прежний путь: ORM объекты -> доменные сущности -> Pydantic."""
+    stmt = select(PredictionORM).order_by(PredictionORM.created_at.desc()).limit(limit)
+    orm_models = session.execute(stmt).scalars().all()
+    predictions = [_mapper._to_domain(orm_model) for orm_model in orm_models]
+    schemas = [
+        PredictionHistorySchema(
+            id=p.id,
+            text=p.text_classification.text,
+            toxicity_score=p.text_classification.toxicity_score,
+            toxicity_level=p.text_classification.toxicity_level.value,
+            confidence=p.text_classification.confidence,
+            model_version=p.text_classification.model_version,
+            processing_time_ms=p.processing_time_ms,
+            created_at=p.created_at,
+        )
+        for p in predictions
+    ]
+    # FastAPI повторно валидирует и сериализует через response_model
+    session.expunge_all()
+    return _history_adapter.dump_json(_history_adapter.validate_python(schemas))
+
+
+def projection_page(session: Session, limit: int) -> bytes:
+    """Read model: только нужные колонки, сразу в JSON."""
+    stmt = (
+        select(*PredictionRepository.HISTORY_COLUMNS, *PredictionRepository._TEXT_STORAGE_COLUMNS)
+        .order_by(PredictionORM.created_at.desc())
+        .limit(limit)
+    )
+    rows = [_mapper._history_row(row) for row in session.execute(stmt).mappings()]
+    return dump_json(rows)
+
+
+def measure(
+    fn: Callable[[Session, int], bytes], session: Session, limit: int, repeat: int
+) -> float:
+    """Вернуть rows/s для функции чтения страницы."""
+    fn(session, limit)  # прогрев
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(session, limit)
+    elapsed = time.perf_counter() - start
+    return limit * repeat / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=20000, help="Количество строк в таблице")
+    parser.add_argument("--repeat", type=int, default=20, help="Повторов на каждый размер страницы")
+    args = parser.parse_args()
+    
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    
+    with Session(engine) as session:
+        seed(session, args.rows)
+        
+        print(f"{'page':>6} {'orm rows/s':>14} {'projection rows/s':>18} {'speedup':>8}")
+        for limit in PAGE_SIZES:
+            orm_rps = measure(orm_page, session, limit, args.repeat)
+            projection_rps = measure(projection_page, session, limit, args.repeat)
+            print(
+                f"{limit:>6} {orm_rps:>14,.0f} {projection_rps:>18,.0f} "
+                f"{projection_rps / orm_rps:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
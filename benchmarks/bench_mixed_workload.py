@@ -0,0 +1,153 @@
+"""
+Benchmark: задержка interactive задач Celery во время bulk задания
+
+Подает открытую нагрузку predict_text_async (--rate задач в секунду)
+сначала без фоновой нагрузки, затем во время batch_predict на --bulk-texts
+текстов, и печатает p50/p99/max задержки от отправки задачи до готовности
+результата для обеих фаз, а также время bulk задания.
+
+Бенчмарк использует уже запущенные воркеры, что позволяет сравнить
+конфигурации:
+    # общий пул
+    ./scripts/run_celery_worker.sh all 4
+    # выделенные пулы
+    ./scripts/run_celery_worker.sh interactive 1 & ./scripts/run_celery_worker.sh bulk 3
+    # для сравнения: prefetch 4, как до разделения очередей
+    CELERY_BULK_PREFETCH=4 ./scripts/run_celery_worker.sh all 4
+и запустить бенчмарк с --chunk-size 1000 (прежний размер чанка).
+
+Готовность результата проверяется опросом каждые --poll-ms, это
+разрешение замера задержки. Требуется Redis и файлы модели.
+
+Запуск:
+    python -m benchmarks.bench_mixed_workload --rate 20 --duration 20 --bulk-texts 200000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from celery.result import AsyncResult
+
+from infrastructure.tasks import batch_predict, predict_text_async
+
+TEXTS = [
+    "Thanks for the quick reply, that fixed it.",
+    "You are an idiot and nobody wants you here.",
+    "Could you share the config you used for this run?",
+    "This is the worst garbage I have ever read.",
+]
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Перцентиль отсортированного списка."""
+    return ordered[max(0, int(len(ordered) * q) - 1)]
+
+
+def interactive_load(
+    rate: float,
+    duration: float,
+    poll: float,
+    timeout: float,
+    bulk: Optional[AsyncResult] = None,
+) -> Dict[str, float]:
+    """
+    Открытая нагрузка predict_text_async.
+    
+    Если передан результат bulk задания, нагрузка идет, пока оно не
+    завершится (но не меньше duration).
+    """
+    pending: Dict[int, tuple] = {}
+    latencies: List[float] = []
+    timeouts = 0
+    sent = 0
+    start = time.perf_counter()
+    
+    while True:
+        now = time.perf_counter()
+        running = now - start < duration or (bulk is not None and not bulk.ready())
+        if running:
+            while sent <= (now - start) * rate:
+                pending[sent] = (
+                    predict_text_async.delay(TEXTS[sent % len(TEXTS)]),
+                    time.perf_counter(),
+                )
+                sent += 1
+        elif not pending:
+            break
+        
+        for i, (result, sent_at) in list(pending.items()):
+            if result.ready():
+                latencies.append(time.perf_counter() - sent_at)
+                result.forget()
+                del pending[i]
+            elif time.perf_counter() - sent_at > timeout:
+                timeouts += 1
+                del pending[i]
+        time.sleep(poll)
+    
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "tasks": sent,
+        "timeouts": timeouts,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def print_row(phase: str, result: Dict[str, float], bulk_seconds: Optional[float] = None) -> None:
+    """Напечатать строку таблицы результатов."""
+    bulk = f"{bulk_seconds:>9.1f}" if bulk_seconds is not None else f"{'-':>9}"
+    print(
+        f"{phase:>10} {result['tasks']:>7} {result['timeouts']:>8} {result['p50_ms']:>8.1f} "
+        f"{result['p99_ms']:>8.1f} {result['max_ms']:>8.1f} {bulk}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rate", type=float, default=20.0, help="interactive задач в секунду")
+    parser.add_argument(
+        "--duration", type=float, default=20.0, help="Длительность фазы без bulk в секундах"
+    )
+    parser.add_argument("--bulk-texts", type=int, default=200_000, help="Текстов в bulk задании")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Размер чанка bulk (по умолчанию jobs.chunk_size)",
+    )
+    parser.add_argument("--poll-ms", type=float, default=2.0, help="Период опроса результатов")
+    parser.add_argument(
+        "--timeout", type=float, default=120.0, help="Таймаут interactive задачи в секундах"
+    )
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    bulk_texts = [TEXTS[rng.randrange(len(TEXTS))] + f" #{i}" for i in range(args.bulk_texts)]
+    poll = args.poll_ms / 1000
+    
+    # Прогрев воркеров
+    predict_text_async.delay(TEXTS[0]).get(timeout=args.timeout)
+    
+    print(
+        f"{'phase':>10} {'tasks':>7} {'timeouts':>8} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'max ms':>8} {'bulk s':>9}"
+    )
+    print_row("idle", interactive_load(args.rate, args.duration, poll, args.timeout))
+    
+    bulk_start = time.perf_counter()
+    bulk = batch_predict.delay(bulk_texts, chunk_size=args.chunk_size)
+    result = interactive_load(args.rate, args.duration, poll, args.timeout, bulk=bulk)
+    bulk.get(timeout=args.timeout)
+    print_row("bulk", result, time.perf_counter() - bulk_start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: время импорта классификатора для сервиса
+
+Импортирует model.modeling в чистом интерпретаторе (torch импортируется
+заранее и в замер не входит - его сервис загружает в любом случае) и
+проверяет, что импорт не тянет тяжелые зависимости обучения (nltk,
+pandas, sklearn) и не запускает обучение. Завершается с кодом 1, если
+импорт дольше --max-ms или загружен запрещенный модуль, поэтому годится
+как проверка в CI.
+
+Запуск:
+    python -m benchmarks.bench_model_import --max-ms 50
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+FORBIDDEN_MODULES = ["nltk", "pandas", "sklearn", "configs.config", "model.train"]
+
+CHILD_CODE = """
+import json, sys, time
+import torch
+start = time.perf_counter()
+import model.modeling
+from model.modeling import TextClassifier
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"ms": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure() -> dict:
+    """Один замер в отдельном процессе."""
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE], capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Число замеров")
+    parser.add_argument(
+        "--max-ms", type=float, default=50.0, help="Допустимая медиана времени импорта"
+    )
+    args = parser.parse_args()
+    
+    results = [measure() for _ in range(args.repeat)]
+    timings = [result["ms"] for result in results]
+    median = statistics.median(timings)
+    loaded = set(results[0]["modules"])
+    forbidden = [name for name in FORBIDDEN_MODULES if name in loaded]
+    
+    print(
+        f"import model.modeling: median {median:.1f} ms, "
+        f"min {min(timings):.1f} ms, max {max(timings):.1f} ms"
+    )
+    failed = False
+    if forbidden:
+        print(f"FAIL: import pulled in {', '.join(forbidden)}")
+        failed = True
+    if median > args.max_ms:
+        print(f"FAIL: median {median:.1f} ms > {args.max_ms:.1f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Benchmark: goodput POST /api/v1/predict при перегрузке
+
+Сначала замеряет пропускную способность API замкнутой нагрузкой
+(--clients клиентов шлют запросы подряд), затем подает открытую нагрузку
+с фиксированной частотой 1x, 2x и 3x от нее (--multipliers). Запросы
+приходят по расписанию независимо от ответов, как реальный трафик.
+
+Для каждой ступени печатает:
+- goodput: успешные ответы в пределах --slo-ms в секунду
+- долю отклоненных (503) и просроченных (дольше SLO или таймаут клиента)
+- p50/p99 задержки успешных ответов
+
+С контролем допуска goodput при 3x должен оставаться на уровне 1x:
+лишние запросы быстро получают 503, а допущенные укладываются в SLO.
+Для сравнения без контроля запустите API с ADMISSION_MAX_IN_FLIGHT=100000
+и ADMISSION_MAX_QUEUE_SIZE=0: очереди растут, и goodput падает.
+
+Требуется запущенный API (можно с DATABASE_BACKEND=memory). Генератор
+нагрузки лучше запускать на отдельных ядрах, чтобы он не отнимал CPU
+у сервера.
+
+Запуск:
+    python -m benchmarks.bench_overload --duration 20 --multipliers 1 2 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+TEXTS = [
+    "Thanks for the quick reply, that fixed it.",
+    "You are an idiot and nobody wants you here.",
+    "Could you share the config you used for this run?",
+    "This is the worst garbage I have ever read.",
+]
+
+PATH = "/api/v1/predict?view=score"
+
+
+async def measure_capacity(client: httpx.AsyncClient, clients: int, duration: float) -> float:
+    """Пропускная способность (ответов 200 в секунду) при замкнутой нагрузке."""
+    done = 0
+    stop_at = time.perf_counter() + duration
+    
+    async def worker(offset: int) -> None:
+        nonlocal done
+        i = offset
+        while time.perf_counter() < stop_at:
+            response = await client.post(PATH, json={"text": TEXTS[i % len(TEXTS)]})
+            if response.status_code == 200:
+                done += 1
+            i += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(clients)))
+    return done / (time.perf_counter() - start)
+
+
+async def open_loop(
+    client: httpx.AsyncClient, rate: float, duration: float, slo: float, timeout: float
+) -> Dict[str, float]:
+    """Открытая нагрузка с частотой rate запросов в секунду."""
+    counters = {"sent": 0, "good": 0, "rejected": 0, "late": 0, "failed": 0}
+    latencies: List[float] = []
+    
+    async def one(i: int) -> None:
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                PATH, json={"text": TEXTS[i % len(TEXTS)]}, timeout=timeout
+            )
+        except httpx.TimeoutException:
+            counters["late"] += 1
+            return
+        except httpx.HTTPError:
+            counters["failed"] += 1
+            return
+        elapsed = time.perf_counter() - start
+        if response.status_code == 503:
+            counters["rejected"] += 1
+        elif response.status_code != 200:
+            counters["failed"] += 1
+        elif elapsed > slo:
+            counters["late"] += 1
+        else:
+            counters["good"] += 1
+            latencies.append(elapsed)
+    
+    tasks = []
+    total = int(rate * duration)
+    start = time.perf_counter()
+    for i in range(total):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+        counters["sent"] += 1
+    await asyncio.gather(*tasks)
+    
+    ordered = sorted(latencies) or [0.0]
+    counters["goodput"] = counters["good"] / duration
+    counters["p50_ms"] = statistics.median(ordered) * 1000
+    counters["p99_ms"] = ordered[max(0, int(len(ordered) * 0.99) - 1)] * 1000
+    return counters
+
+
+async def run(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(
+        max_connections=args.max_connections, max_keepalive_connections=args.max_connections
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        capacity = args.capacity or await measure_capacity(client, args.clients, args.duration)
+        print(f"capacity: {capacity:,.0f} req/s (SLO {args.slo_ms:.0f} ms)\n")
+        print(
+            f"{'load':>5} {'offered/s':>10} {'goodput/s':>10} {'503 %':>6} {'late %':>7} "
+            f"{'fail %':>7} {'p50 ms':>8} {'p99 ms':>8}"
+        )
+        
+        for multiplier in args.multipliers:
+            rate = capacity * multiplier
+            result = await open_loop(client, rate, args.duration, args.slo_ms / 1000, args.timeout)
+            sent = result["sent"] or 1
+            print(
+                f"{multiplier:>4.1f}x {rate:>10,.0f} {result['goodput']:>10,.0f} "
+                f"{result['rejected'] / sent * 100:>6.1f} {result['late'] / sent * 100:>7.1f} "
+                f"{result['failed'] / sent * 100:>7.1f} "
+                f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+            )
+            await asyncio.sleep(args.cooldown)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--clients", type=int, default=64, help="Клиентов для замера пропускной способности"
+    )
+    parser.add_argument(
+        "--capacity", type=float, default=None, help="Пропускная способность (без замера)"
+    )
+    parser.add_argument("--multipliers", type=float, nargs="+", default=[1.0, 2.0, 3.0])
+    parser.add_argument(
+        "--duration", type=float, default=20.0, help="Длительность ступени в секундах"
+    )
+    parser.add_argument(
+        "--slo-ms", type=float, default=500.0, help="Ответ дольше SLO не считается полезным"
+    )
+    parser.add_argument("--timeout", type=float, default=10.0, help="Таймаут клиента в секундах")
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--cooldown", type=float, default=5.0, help="Пауза между ступенями")
+    args = parser.parse_args()
+    
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: конкурентность POST /predict относительно размера пула БД
+
+Держит --concurrency одновременных запросов к POST /api/v1/predict и
+параллельно опрашивает GET /metrics. Раньше сессия (и соединение из пула)
+бралась на весь запрос, включая инференс, поэтому одновременно
+обрабатывалось не больше pool_size + max_overflow = 30 запросов, а
+остальные ждали соединение. Теперь соединение берется только на время
+INSERT: число запросов в работе может быть намного больше checkedout.
+
+Требуется запущенный API (с PostgreSQL или DATABASE_BACKEND=sqlite).
+
+Запуск:
+    python -m benchmarks.bench_pool_concurrency --concurrency 200 --duration 30
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+TEXTS = [
+    "Thanks for the quick reply, that fixed it.",
+    "You are an idiot and nobody wants you here.",
+    "Could you share the config you used for this run?",
+    "This is the worst garbage I have ever read.",
+]
+
+
+class LoadStats:
+    """Счетчики нагрузки на стороне клиента."""
+    
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+async def worker(
+    client: httpx.AsyncClient, stats: LoadStats, deadline: float, worker_id: int
+) -> None:
+    """Отправлять запросы один за другим до deadline."""
+    i = worker_id
+    while time.perf_counter() < deadline:
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        start = time.perf_counter()
+        try:
+            response = await client.post("/api/v1/predict", json={"text": TEXTS[i % len(TEXTS)]})
+            response.raise_for_status()
+            stats.latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            stats.errors += 1
+        finally:
+            stats.in_flight -= 1
+        i += 1
+
+
+async def sample_pool(
+    client: httpx.AsyncClient, deadline: float, interval: float
+) -> Dict[str, float]:
+    """Опрашивать /metrics и запоминать пиковые значения пула."""
+    peaks = {"checkedout": 0, "overflow": 0, "waiting": 0}
+    last: Dict[str, float] = {}
+    while time.perf_counter() < deadline:
+        try:
+            last = (await client.get("/metrics")).json()["db_pool"]
+            for key in peaks:
+                peaks[key] = max(peaks[key], last.get(key, 0))
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+    peaks["wait_seconds_avg"] = last.get("wait_seconds_avg", 0.0)
+    peaks["wait_seconds_max"] = last.get("wait_seconds_max", 0.0)
+    peaks["timeouts"] = last.get("timeouts", 0)
+    return peaks
+
+
+async def run(base_url: str, concurrency: int, duration: float) -> None:
+    limits = httpx.Limits(
+        max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1
+    )
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        stats = LoadStats()
+        deadline = time.perf_counter() + duration
+        sampler = asyncio.create_task(sample_pool(client, deadline, interval=0.2))
+        await asyncio.gather(*(worker(client, stats, deadline, i) for i in range(concurrency)))
+        peaks = await sampler
+    
+    done = len(stats.latencies)
+    print(f"concurrency={concurrency} duration={duration:.0f}s")
+    print(f"  requests ok      {done:>10,}  ({done / duration:,.0f} req/s), errors {stats.errors}")
+    if done:
+        ordered = sorted(stats.latencies)
+        print(f"  latency p50      {statistics.median(ordered) * 1000:>10.1f} ms")
+        print(f"  latency p99      {ordered[int(len(ordered) * 0.99) - 1] * 1000:>10.1f} ms")
+    print(f"  max in flight    {stats.max_in_flight:>10}")
+    print(f"  pool checkedout  {peaks['checkedout']:>10} (max), overflow {peaks['overflow']} (max)")
+    print(f"  pool waiting     {peaks['waiting']:>10} (max), timeouts {peaks['timeouts']}")
+    print(f"  pool wait        {peaks['wait_seconds_avg'] * 1000:>10.2f} ms avg, "
+          f"{peaks['wait_seconds_max'] * 1000:.2f} ms max")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.base_url, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
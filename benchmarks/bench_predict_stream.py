@@ -0,0 +1,141 @@
+"""
+Benchmark: потоковая оценка POST /api/v1/predict/stream
+
+Отправляет --lines строк NDJSON (по умолчанию 10M), генерируя их на лету,
+и одновременно читает поток оценок. Печатает устойчивую скорость
+(texts/s) по ходу и в конце, а также RSS и пиковый RSS (VmHWM) процесса
+API из /proc/<pid>/status. При ограниченном числе пачек в работе пиковый
+RSS не должен расти с длиной потока.
+
+httpx отправляет тело целиком до чтения ответа, а сервер при backpressure
+перестает читать тело, пока клиент не прочитает ответ, поэтому здесь
+используется минимальный full-duplex HTTP/1.1 клиент на asyncio
+(chunked transfer encoding в обе стороны).
+
+Требуется запущенный API (можно с DATABASE_BACKEND=memory).
+
+Запуск:
+    python -m benchmarks.bench_predict_stream --lines 10000000 --server-pid <PID>
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+PATH = "/api/v1/predict/stream"
+CHUNK_LINES = 500
+
+TEXTS = [
+    "Thanks for the quick reply, that fixed it.",
+    "You are an idiot and nobody wants you here.",
+    "Could you share the config you used for this run?",
+    "This is the worst garbage I have ever read.",
+]
+
+
+def read_status_mb(pid: int, field: str) -> Optional[float]:
+    """Значение поля /proc/<pid>/status (VmRSS, VmHWM) в мегабайтах."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        return None
+    return None
+
+
+async def send_body(writer: asyncio.StreamWriter, lines: int) -> None:
+    """Отправить lines строк NDJSON чанками (chunked transfer encoding)."""
+    for start in range(0, lines, CHUNK_LINES):
+        payload = b"".join(
+            json.dumps({"id": i, "text": TEXTS[i % len(TEXTS)]}).encode() + b"\n"
+            for i in range(start, min(start + CHUNK_LINES, lines))
+        )
+        writer.write(b"%x\r\n%s\r\n" % (len(payload), payload))
+        await writer.drain()  # ждет, пока сервер читает тело (backpressure)
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def read_results(reader: asyncio.StreamReader, stats: Dict[str, float]) -> None:
+    """Читать chunked ответ и считать строки результатов."""
+    status_line = await reader.readline()
+    if b" 200 " not in status_line:
+        raise RuntimeError(f"Unexpected response: {status_line!r}")
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass  # заголовки
+    
+    while True:
+        size = int((await reader.readline()).strip(), 16)
+        if size == 0:
+            break
+        chunk = await reader.readexactly(size + 2)
+        stats["results"] += chunk.count(b"\n") - 1  # без завершающего CRLF чанка
+        stats["errors"] += chunk.count(b'"error"')
+
+
+async def report(stats: Dict[str, float], pid: Optional[int], interval: float) -> None:
+    """Печатать скорость и RSS сервера каждые interval секунд."""
+    last_results, last_time = 0, time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        rate = (stats["results"] - last_results) / (now - last_time)
+        last_results, last_time = stats["results"], now
+        rss = f"  server RSS {read_status_mb(pid, 'VmRSS'):>8.1f} MB" if pid else ""
+        print(f"{stats['results']:>14,.0f} results {rate:>10,.0f} texts/s{rss}")
+
+
+async def run(base_url: str, lines: int, pid: Optional[int], interval: float) -> None:
+    url = urlsplit(base_url)
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80, limit=2**20)
+    writer.write(
+        f"POST {PATH} HTTP/1.1\r\n"
+        f"Host: {url.netloc}\r\n"
+        "Content-Type: application/x-ndjson\r\n"
+        "Transfer-Encoding: chunked\r\n"
+        "Connection: close\r\n\r\n".encode()
+    )
+    
+    stats = {"results": 0, "errors": 0}
+    reporter = asyncio.create_task(report(stats, pid, interval))
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(send_body(writer, lines), read_results(reader, stats))
+    finally:
+        reporter.cancel()
+        writer.close()
+    elapsed = time.perf_counter() - start
+    
+    print(f"\n{stats['results']:,.0f} results ({stats['errors']:,.0f} errors) in {elapsed:.1f}s "
+          f"-> {stats['results'] / elapsed:,.0f} texts/s")
+    if pid:
+        print(
+            f"Server RSS {read_status_mb(pid, 'VmRSS'):.1f} MB, "
+            f"peak (VmHWM) {read_status_mb(pid, 'VmHWM'):.1f} MB"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--lines", type=int, default=10_000_000)
+    parser.add_argument(
+        "--server-pid", type=int, default=None, help="PID процесса API для замера RSS"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5.0, help="Период вывода промежуточной скорости"
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.base_url, args.lines, args.server_pid, args.interval))
+
+
+if __name__ == "__main__":
+    main()
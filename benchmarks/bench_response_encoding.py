@@ -0,0 +1,109 @@
+"""
+Benchmark: формирование и кодирование ответа POST /api/v1/predict
+
+Сравнивает время (мкс на запрос) и размер ответа для трех путей:
+
+- schema: PredictionOutputSchema -> повторная валидация response_model ->
+  model_dump(mode="json") -> json.dumps (прежний путь FastAPI)
+- full: dict из доменной сущности -> orjson (полный ответ)
+- score: dict из доменной сущности -> orjson (view=score)
+
+Инференс и сеть не участвуют: измеряется только путь ответа для
+текстов разной длины (полный ответ возвращает текст обратно).
+
+Запуск:
+    python -m benchmarks.bench_response_encoding --repeat 100000
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from app.api.schemas import PredictionOutputSchema
+from app.api.serializers import dump_json, prediction_to_dict, prediction_to_score_dict
+from domain.entities import PredictionResult
+
+TEXT_LENGTHS = (100, 1000, 10000)
+
+_output_adapter = TypeAdapter(PredictionOutputSchema)
+
+
+def make_prediction(text_length: int) -> PredictionResult:
+    """Создать предсказание с текстом заданной длины."""
+    text = ("you are a wonderful person " * (text_length // 27 + 1))[:text_length]
+    return PredictionResult.create(
+        text=text,
+        toxicity_score=random.random(),
+        model_version="1.0",
+        processing_time_ms=random.uniform(1.0, 20.0),
+        confidence=random.uniform(0.5, 1.0),
+    )
+
+
+def schema_response(prediction: PredictionResult) -> bytes:
+    """Прежний путь: Pydantic модель, валидация response_model, stdlib json."""
+    classification = prediction.text_classification
+    schema = PredictionOutputSchema(
+        id=prediction.id,
+        text=classification.text,
+        toxicity_score=classification.toxicity_score,
+        toxicity_level=classification.toxicity_level.value,
+        confidence=classification.confidence,
+        model_version=classification.model_version,
+        processing_time_ms=prediction.processing_time_ms,
+        created_at=prediction.created_at,
+    )
+    content = _output_adapter.dump_python(_output_adapter.validate_python(schema), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def full_response(prediction: PredictionResult) -> bytes:
+    """Полный ответ без Pydantic, orjson."""
+    return dump_json(prediction_to_dict(prediction))
+
+
+def score_response(prediction: PredictionResult) -> bytes:
+    """Сокращенный ответ (view=score), orjson."""
+    return dump_json(prediction_to_score_dict(prediction))
+
+
+def measure(
+    fn: Callable[[PredictionResult], bytes], prediction: PredictionResult, repeat: int
+) -> float:
+    """Вернуть микросекунды на один ответ."""
+    fn(prediction)  # прогрев
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(prediction)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=100000, help="Ответов на каждый путь и длину текста"
+    )
+    args = parser.parse_args()
+    
+    paths = (("schema", schema_response), ("full", full_response), ("score", score_response))
+    print(f"{'text':>6} {'path':>7} {'us/request':>11} {'bytes':>7} {'speedup':>8}")
+    for text_length in TEXT_LENGTHS:
+        prediction = make_prediction(text_length)
+        baseline = None
+        for name, fn in paths:
+            us = measure(fn, prediction, args.repeat)
+            baseline = baseline or us
+            print(
+                f"{text_length:>6} {name:>7} {us:>11.2f} "
+                f"{len(fn(prediction)):>7} {baseline / us:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
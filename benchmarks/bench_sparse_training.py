@@ -0,0 +1,120 @@
+"""
+Benchmark: память и время эпохи обучения на плотных и разреженных признаках
+
+Генерирует синтетический корпус (--docs документов), векторизует его
+TF-IDF (униграммы + биграммы, как model/train.py) и обучает TextClassifier
+одну эпоху в двух режимах:
+- dense: .toarray() всего корпуса и плотный torch.tensor (прежний train.py)
+- sparse: CSR, минибатч - срез CSR, первый слой gather-sum (model/sparse.py)
+
+Каждый режим выполняется в отдельном процессе, чтобы пиковый RSS
+(ru_maxrss) относился только к нему. Для dense режима с большим корпусом
+ожидайте нехватку памяти: это и есть исходная проблема.
+
+Запуск:
+    python -m benchmarks.bench_sparse_training --docs 20000
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict
+
+import torch
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from model.modeling import TextClassifier
+from model.sparse import SparseTextDataset, sparse_loader
+
+
+def make_corpus(docs: int, vocabulary: int):
+    """Синтетический корпус: слова с распределением Ципфа, длина 10-60 слов."""
+    rng = random.Random(42)
+    words = [f"w{i}" for i in range(vocabulary)]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    texts = [
+        " ".join(rng.choices(words, weights=weights, k=rng.randint(10, 60))) for _ in range(docs)
+    ]
+    labels = [rng.randint(0, 1) for _ in range(docs)]
+    return texts, labels
+
+
+def run_mode(mode: str, docs: int, vocabulary: int, batch_size: int) -> Dict[str, float]:
+    """Векторизовать корпус и обучить одну эпоху в режиме mode."""
+    texts, labels = make_corpus(docs, vocabulary)
+    features = TfidfVectorizer(ngram_range=(1, 2)).fit_transform(texts)
+    
+    if mode == "dense":
+        dense = torch.tensor(features.toarray(), dtype=torch.float32)
+        targets = torch.tensor(labels, dtype=torch.long)
+        loader = torch.utils.data.DataLoader(
+            torch.utils.data.TensorDataset(dense, targets), batch_size=batch_size, shuffle=True
+        )
+    else:
+        loader = sparse_loader(
+            SparseTextDataset(features, labels), batch_size=batch_size, shuffle=True
+        )
+    
+    model = TextClassifier(input_size=features.shape[1], hidden_size=128, output_size=2)
+    optimizer = torch.optim.AdamW(model.parameters(), lr=0.001)
+    criterion = torch.nn.CrossEntropyLoss()
+    
+    model.train()
+    start = time.perf_counter()
+    for batch, targets in loader:
+        optimizer.zero_grad()
+        loss = criterion(model(batch), targets)
+        loss.backward()
+        optimizer.step()
+    epoch_seconds = time.perf_counter() - start
+    
+    return {
+        "mode": mode,
+        "features": features.shape[1],
+        "nnz": features.nnz,
+        "epoch_seconds": epoch_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--docs", type=int, default=20_000, help="Документов в корпусе")
+    parser.add_argument("--vocabulary", type=int, default=50_000, help="Слов в словаре генератора")
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument(
+        "--modes", nargs="+", default=["dense", "sparse"], choices=["dense", "sparse"]
+    )
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(run_mode(args.child, args.docs, args.vocabulary, args.batch_size)))
+        return
+    
+    print(f"{'mode':>7} {'features':>10} {'nnz':>12} {'epoch s':>9} {'peak RSS MB':>12}")
+    for mode in args.modes:
+        command = [
+            sys.executable, "-m", "benchmarks.bench_sparse_training", "--child", mode,
+            "--docs", str(args.docs), "--vocabulary", str(args.vocabulary),
+            "--batch-size", str(args.batch_size),
+        ]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{mode:>7} failed (exit code {completed.returncode}, likely out of memory)")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(
+            f"{mode:>7} {result['features']:>10,} {result['nnz']:>12,} "
+            f"{result['epoch_seconds']:>9.2f} {result['peak_rss_mb']:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: размер таблицы predictions и скорость вставки по режимам хранения текста
+
+Для каждого режима (plain, zstd, hash_only) очищает таблицу predictions,
+вставляет одинаковый набор предсказаний через маппинг PredictionRepository
+(тот же TextCodec, что и в API) и печатает:
+
+- rows/s вставки (включая кодирование текста)
+- суммарный размер партиций (heap + TOAST + индексы) и байт на строку
+
+Тексты берутся из CSV с колонкой comment_text (формат датасета обучения)
+или генерируются синтетически. Требуется PostgreSQL (настройки из configs.yml).
+Таблица predictions ОЧИЩАЕТСЯ, поэтому запуск требует флага --truncate.
+
+Запуск:
+    python -m benchmarks.bench_text_storage --truncate --rows 200000 --data ./data/train.csv
+"""
+
+import argparse
+import random
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from domain.entities import PredictionResult
+from infrastructure.database import get_sync_engine
+from infrastructure.partitioning import ensure_partitions
+from infrastructure.repositories import PredictionRepository
+from infrastructure.text_codec import TextCodec, TextStorageMode
+
+BATCH_SIZE = 5000
+
+WORDS = (
+    "the you this that post article edit page please thanks wikipedia talk "
+    "stupid idiot hate source fact reason think people really would should"
+).split()
+
+
+def load_texts(path: Optional[str], rows: int) -> List[str]:
+    """Прочитать тексты из CSV (comment_text) или сгенерировать синтетические."""
+    if path:
+        import pandas as pd
+        
+        texts = pd.read_csv(path, usecols=["comment_text"])["comment_text"]
+        texts = texts.dropna().astype(str).tolist()
+        return [texts[i % len(texts)] for i in range(rows)]
+    
+    rng = random.Random(42)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(5, 120))) for _ in range(rows)]
+
+
+def table_size_bytes(session: Session) -> int:
+    """Суммарный размер всех партиций predictions (heap + TOAST + индексы)."""
+    return session.execute(
+        text(
+            "SELECT coalesce(sum(pg_total_relation_size(inhrelid)), 0) "
+            "FROM pg_inherits WHERE inhparent = 'predictions'::regclass"
+        )
+    ).scalar()
+
+
+def run_mode(mode: TextStorageMode, texts: List[str], level: int) -> None:
+    """Вставить тексты в режиме mode и напечатать размер и скорость."""
+    engine = get_sync_engine()
+    mapper = PredictionRepository(session_scope=None, text_codec=TextCodec(mode.value, level))
+    predictions = [
+        PredictionResult.create(
+            text=t,
+            toxicity_score=random.random(),
+            model_version="1.0",
+            processing_time_ms=random.uniform(1.0, 20.0),
+            confidence=random.uniform(0.5, 1.0),
+        )
+        for t in texts
+    ]
+    
+    with Session(engine) as session:
+        session.execute(text("TRUNCATE predictions"))
+        ensure_partitions(session.connection(), days_ahead=1)
+        session.commit()
+        
+        start = time.perf_counter()
+        for offset in range(0, len(predictions), BATCH_SIZE):
+            batch = predictions[offset:offset + BATCH_SIZE]
+            session.add_all(mapper._from_domain(p) for p in batch)
+            session.commit()
+            session.expunge_all()
+        elapsed = time.perf_counter() - start
+        
+        session.execute(text("ANALYZE predictions"))
+        size = table_size_bytes(session)
+    
+    rows = len(predictions)
+    print(f"{mode.value:>10} {rows / elapsed:>12,.0f} {size / 2**20:>12.1f} {size / rows:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="Подтвердить очистку таблицы predictions"
+    )
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--data", default=None, help="CSV с колонкой comment_text")
+    parser.add_argument("--zstd-level", type=int, default=3)
+    args = parser.parse_args()
+    
+    if not args.truncate:
+        parser.error("the benchmark truncates the predictions table; pass --truncate to confirm")
+    
+    texts = load_texts(args.data, args.rows)
+    avg_length = sum(len(t) for t in texts) / len(texts)
+    print(f"{len(texts):,} texts, avg length {avg_length:.0f} chars\n")
+    print(f"{'mode':>10} {'insert rows/s':>12} {'table MB':>12} {'bytes/row':>10}")
+    for mode in TextStorageMode:
+        run_mode(mode, texts, args.zstd_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: пропускная способность обучения на CPU (samples/s)
+
+Сравнивает прежний цикл обучения (DataLoader без воркеров, потоки torch
+по умолчанию, .item() на каждом шаге) с model.train.fit в разных
+конфигурациях: число воркеров загрузки (--workers), intra-op потоков
+(--threads) и точность (fp32 / bf16 autocast). Корпус синтетический,
+как в bench_sparse_training (TF-IDF униграммы + биграммы, CSR).
+
+Каждая конфигурация выполняется в отдельном процессе: число inter-op
+потоков torch задается до первой операции и в процессе не меняется.
+
+Запуск:
+    python -m benchmarks.bench_training_throughput --docs 50000 --workers 0 4 8 --threads 8 16 32
+"""
+
+import argparse
+import itertools
+import json
+import subprocess
+import sys
+import time
+from typing import Dict
+
+import torch
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from benchmarks.bench_sparse_training import make_corpus
+from model.modeling import TextClassifier
+from model.sparse import SparseTextDataset, sparse_loader
+from model.train import configure_threads, fit
+
+
+def legacy_epochs(model, loader, epochs: int) -> None:
+    """Цикл обучения до оптимизации: синхронизация .item() на каждом шаге."""
+    optimizer = torch.optim.AdamW(model.parameters(), lr=0.001)
+    criterion = torch.nn.CrossEntropyLoss()
+    for _ in range(epochs):
+        model.train()
+        train_loss, train_correct = 0.0, 0
+        for texts, labels in loader:
+            optimizer.zero_grad()
+            outputs = model(texts)
+            loss = criterion(outputs, labels)
+            loss.backward()
+            optimizer.step()
+            train_loss += loss.item()
+            train_correct += (outputs.argmax(dim=1) == labels).sum().item()
+
+
+def run_config(config: Dict, docs: int, vocabulary: int, batch_size: int, epochs: int) -> Dict:
+    """Обучить epochs эпох в конфигурации config и измерить samples/s."""
+    configure_threads(config.get("threads"), config.get("interop_threads"))
+    texts, labels = make_corpus(docs, vocabulary)
+    features = TfidfVectorizer(ngram_range=(1, 2)).fit_transform(texts)
+    model = TextClassifier(input_size=features.shape[1], hidden_size=128, output_size=2)
+    dataset = SparseTextDataset(features, labels)
+    
+    if config["mode"] == "legacy":
+        loader = sparse_loader(dataset, batch_size=batch_size, shuffle=True)
+        start = time.perf_counter()
+        legacy_epochs(model, loader, epochs)
+    else:
+        loader = sparse_loader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=True,
+            num_workers=config["workers"],
+            prefetch_factor=4,
+        )
+        # Тестовая выборка - один минибатч, чтобы замер относился к обучению
+        test_loader = sparse_loader(
+            SparseTextDataset(features[:batch_size], labels[:batch_size]), batch_size, False
+        )
+        start = time.perf_counter()
+        fit(model, loader, test_loader, epochs=epochs, bf16=config["bf16"])
+    elapsed = time.perf_counter() - start
+    return {"samples_per_second": docs * epochs / elapsed, "threads": torch.get_num_threads()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--docs", type=int, default=50_000, help="Документов в корпусе")
+    parser.add_argument("--vocabulary", type=int, default=50_000, help="Слов в словаре генератора")
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4])
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[0], help="Intra-op потоков (0 - по умолчанию)"
+    )
+    parser.add_argument("--interop-threads", type=int, default=None)
+    parser.add_argument(
+        "--precisions", nargs="+", default=["fp32", "bf16"], choices=["fp32", "bf16"]
+    )
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        result = run_config(
+            json.loads(args.child), args.docs, args.vocabulary, args.batch_size, args.epochs
+        )
+        print(json.dumps(result))
+        return
+    
+    configs = [{"mode": "legacy", "name": "legacy loop"}]
+    grid = itertools.product(args.workers, args.threads, args.precisions)
+    for workers, threads, precision in grid:
+        configs.append({
+            "mode": "fit",
+            "name": f"fit w={workers} t={threads or 'default'} {precision}",
+            "workers": workers,
+            "threads": threads or None,
+            "interop_threads": args.interop_threads,
+            "bf16": precision == "bf16",
+        })
+    
+    print(f"{'configuration':<32} {'threads':>8} {'samples/s':>12} {'vs legacy':>10}")
+    baseline = None
+    for config in configs:
+        command = [
+            sys.executable, "-m", "benchmarks.bench_training_throughput",
+            "--child", json.dumps(config),
+            "--docs", str(args.docs), "--vocabulary", str(args.vocabulary),
+            "--batch-size", str(args.batch_size), "--epochs", str(args.epochs),
+        ]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{config['name']:<32} failed: {completed.stderr.strip().splitlines()[-1:]}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        rate = result["samples_per_second"]
+        baseline = baseline or rate
+        print(
+            f"{config['name']:<32} {result['threads']:>8} {rate:>12,.0f} "
+            f"{rate / baseline:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
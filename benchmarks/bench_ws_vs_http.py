@@ -0,0 +1,122 @@
+"""
+Benchmark: WebSocket против HTTP для потока чат-сообщений
+
+Моделирует чат-шлюз: --clients клиентов, каждый отправляет --messages
+сообщений по одному и ждет ответ на каждое. Сравниваются два транспорта:
+
+- http: POST /api/v1/predict на каждое сообщение (с --http-close каждое
+  сообщение открывает новое TCP соединение, как делает текущий шлюз)
+- ws: одно соединение /api/v1/ws/predict на клиента
+
+Печатает задержку на сообщение (p50/p99), сообщений в секунду и CPU
+процесса API (utime + stime из /proc/<pid>/stat) на 1000 сообщений.
+
+Требуется запущенный API (можно с DATABASE_BACKEND=memory).
+
+Запуск:
+    python -m benchmarks.bench_ws_vs_http --clients 50 --messages 200 --server-pid <PID>
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import List, Optional
+
+import httpx
+import websockets
+
+TEXTS = [
+    "Thanks for the quick reply, that fixed it.",
+    "You are an idiot and nobody wants you here.",
+    "Could you share the config you used for this run?",
+    "This is the worst garbage I have ever read.",
+]
+
+
+def read_cpu_seconds(pid: Optional[int]) -> Optional[float]:
+    """Суммарное CPU время процесса (utime + stime) в секундах."""
+    if pid is None:
+        return None
+    with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # После имени процесса: utime и stime - поля 12 и 13 (с нуля)
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def http_client(base_url: str, messages: int, close: bool, latencies: List[float]) -> None:
+    headers = {"Connection": "close"} if close else {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, headers=headers) as client:
+        for i in range(messages):
+            start = time.perf_counter()
+            response = await client.post("/api/v1/predict", json={"text": TEXTS[i % len(TEXTS)]})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+
+async def ws_client(ws_url: str, messages: int, latencies: List[float]) -> None:
+    async with websockets.connect(ws_url) as websocket:
+        for i in range(messages):
+            start = time.perf_counter()
+            await websocket.send(json.dumps({"id": i, "text": TEXTS[i % len(TEXTS)]}))
+            reply = json.loads(await websocket.recv())
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+            latencies.append(time.perf_counter() - start)
+
+
+async def run_transport(args: argparse.Namespace, transport: str) -> None:
+    latencies: List[float] = []
+    if transport == "http":
+        clients = [
+            http_client(args.base_url, args.messages, args.http_close, latencies)
+            for _ in range(args.clients)
+        ]
+    else:
+        ws_url = args.base_url.replace("http", "ws", 1) + "/api/v1/ws/predict"
+        clients = [ws_client(ws_url, args.messages, latencies) for _ in range(args.clients)]
+    
+    cpu_before = read_cpu_seconds(args.server_pid)
+    start = time.perf_counter()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - start
+    cpu_after = read_cpu_seconds(args.server_pid)
+    
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    line = (
+        f"{transport:>5} {len(ordered) / elapsed:>10,.0f} "
+        f"{statistics.median(ordered) * 1000:>9.2f} {p99 * 1000:>9.2f}"
+    )
+    if cpu_before is not None:
+        line += f" {(cpu_after - cpu_before) / len(ordered) * 1e6:>16.1f}"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=200, help="Сообщений на клиента")
+    parser.add_argument(
+        "--http-close", action="store_true", help="Новое TCP соединение на каждое HTTP сообщение"
+    )
+    parser.add_argument(
+        "--server-pid", type=int, default=None, help="PID процесса API для замера CPU"
+    )
+    args = parser.parse_args()
+    
+    header = f"{'':>5} {'msg/s':>10} {'p50 ms':>9} {'p99 ms':>9}"
+    if args.server_pid is not None:
+        header += f" {'server CPU ms/1k':>16}"
+    print(header)
+    for transport in ("http", "ws"):
+        asyncio.run(run_transport(args, transport))
+
+
+if __name__ == "__main__":
+    main()
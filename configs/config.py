@@ -9,19 +9,47 @@ Configuration Management
 - Environment Variables Pattern
 """
 
-import os.path
+import os
+import re
 from typing import Dict, Any
 
 import yaml
 from dotenv import load_dotenv
 
+# ${VARIABLE} или ${VARIABLE:-default}
+_ENV_PATTERN = re.compile(r"\$\{(\w+)(?::-([^}]*))?\}")
+
+
+def _expand_env(raw: str) -> str:
+    """
+    Подставить переменные окружения в строку.
+    
+    В отличие от os.path.expandvars поддерживает значения по умолчанию
+    в синтаксисе ${VARIABLE:-default}. Неизвестные переменные без
+    значения по умолчанию остаются как есть.
+    
+    Args:
+        raw: Исходная строка
+        
+    Returns:
+        str: Строка с подставленными значениями
+    """
+    def replace(match: re.Match) -> str:
+        name, default = match.group(1), match.group(2)
+        value = os.environ.get(name)
+        if default is not None and not value:
+            return default
+        return match.group(0) if value is None else value
+    
+    return _ENV_PATTERN.sub(replace, raw)
+
 
 def load_configs(path: str = "configs/configs.yml") -> Dict[str, Any]:
     """
     Загрузить конфигурацию из YAML файла.
     
     Переменные окружения из .env файла подставляются в YAML
-    через синтаксис ${VARIABLE_NAME}.
+    через синтаксис ${VARIABLE_NAME} или ${VARIABLE_NAME:-default}.
     
     Args:
         path: Путь к YAML файлу конфигурации
@@ -33,11 +61,11 @@ def load_configs(path: str = "configs/configs.yml") -> Dict[str, Any]:
         ```yaml
         database:
           host: ${POSTGRES_HOST}
-          port: ${POSTGRES_PORT}
+          port: ${POSTGRES_PORT:-5432}
         ```
     """
     load_dotenv()
     with open(path, "r", encoding="utf-8") as f:
         raw = f.read()
-    resolved = os.path.expandvars(raw)
+    resolved = _expand_env(raw)
     return yaml.safe_load(resolved)
\ No newline at end of file
@@ -11,13 +11,17 @@ Domain Layer
 """
 
 from domain.entities import PredictionResult, TextClassification
-from domain.repositories import IPredictionRepository
-from domain.value_objects import ToxicityLevel
+from domain.repositories import IPredictionRepository, IPredictionStatsRepository
+from domain.exceptions import DeadlineExceeded
+from domain.value_objects import Deadline, ToxicityLevel
 
 __all__ = [
     "PredictionResult",
     "TextClassification",
     "IPredictionRepository",
+    "IPredictionStatsRepository",
     "ToxicityLevel",
+    "Deadline",
+    "DeadlineExceeded",
 ]
 
@@ -67,12 +67,15 @@ class PredictionResult:
         created_at: Время создания предсказания
         processing_time_ms: Время обработки в миллисекундах
         metadata: Дополнительные метаданные (JSON-совместимый dict)
+        sample_weight: Сколько предсказаний представляет сохраненная запись
+            (1 / доля выборки для выборочно сохраненных, иначе 1.0)
     """
     id: UUID
     text_classification: TextClassification
     created_at: datetime
     processing_time_ms: float
     metadata: Optional[dict] = None
+    sample_weight: float = 1.0
     
     @classmethod
     def create(
@@ -0,0 +1,26 @@
+"""
+Domain Exceptions
+
+Исключения предметной области.
+
+Паттерны:
+- Domain Exception
+"""
+
+
+class DeadlineExceeded(Exception):
+    """
+    Крайний срок обработки запроса истек.
+    
+    Выбрасывается перед очередным этапом обработки (предобработка,
+    forward pass, запись в БД), если клиент уже не ждет результат:
+    оставшаяся работа не выполняется.
+    
+    Attributes:
+        stage: Этап, перед которым обработка прервана
+            (admission, preprocess, inference, persist)
+    """
+    
+    def __init__(self, stage: str):
+        super().__init__(f"Deadline exceeded before {stage}")
+        self.stage = stage
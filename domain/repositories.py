@@ -11,10 +11,12 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 from domain.entities import PredictionResult
+from domain.value_objects import Deadline
 
 
 class IPredictionRepository(ABC):
@@ -29,18 +31,28 @@ class IPredictionRepository(ABC):
         get_by_id: Получить предсказание по ID
         get_all: Получить все предсказания (с пагинацией)
         get_by_text: Получить предсказания по тексту
+        get_history_rows: Получить страницу истории как плоские строки (read model)
+        get_history_row_by_id: Получить одну строку истории по ID (read model)
+        stream_history_rows: Потоково выгрузить строки истории с фильтрами
     """
     
     @abstractmethod
-    async def save(self, prediction: PredictionResult) -> PredictionResult:
+    async def save(
+        self, prediction: PredictionResult, deadline: Optional[Deadline] = None
+    ) -> PredictionResult:
         """
         Сохранить результат предсказания в хранилище.
         
         Args:
             prediction: Результат предсказания для сохранения
+            deadline: Крайний срок запроса (None - без ограничения)
             
         Returns:
             PredictionResult: Сохраненный результат с обновленными данными
+                (текст - исходный, независимо от режима хранения)
+            
+        Raises:
+            DeadlineExceeded: Если срок истек до записи
         """
         pass
     
@@ -92,4 +104,100 @@ class IPredictionRepository(ABC):
             List[PredictionResult]: Список результатов предсказаний
         """
         pass
+    
+    @abstractmethod
+    async def get_history_rows(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить страницу истории предсказаний как плоские строки.
+        
+        Read model в стиле CQRS: возвращает только поля, нужные для ответа API,
+        без построения доменных сущностей и их повторной валидации.
+        
+        Args:
+            limit: Максимальное количество записей
+            offset: Смещение для пагинации
+            
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами id, text, toxicity_score,
+                toxicity_level, confidence, model_version, processing_time_ms, created_at
+        """
+        pass
+    
+    @abstractmethod
+    async def get_history_row_by_id(self, prediction_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Получить одну строку истории по ID.
+        
+        Args:
+            prediction_id: UUID предсказания
+            
+        Returns:
+            Optional[Dict[str, Any]]: Строка истории или None если не найдено
+        """
+        pass
+    
+    @abstractmethod
+    def stream_history_rows(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Потоково выгрузить строки истории, отсортированные по времени создания.
+        
+        Строки отдаются пачками по batch_size, поэтому потребление памяти
+        не зависит от общего объема выгрузки.
+        
+        Args:
+            created_from: Нижняя граница created_at (включительно)
+            created_to: Верхняя граница created_at (не включительно)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+            batch_size: Размер пачки строк
+            
+        Yields:
+            List[Dict[str, Any]]: Пачка строк истории
+        """
+        pass
 
+
+class IPredictionStatsRepository(ABC):
+    """
+    Интерфейс репозитория агрегированной статистики предсказаний.
+    
+    Статистика читается из заранее агрегированных почасовых данных (rollup),
+    поэтому время ответа не зависит от размера истории предсказаний.
+    
+    Методы:
+        get_hourly_stats: Получить почасовую статистику за интервал
+    """
+    
+    @abstractmethod
+    async def get_hourly_stats(
+        self,
+        created_from: datetime,
+        created_to: datetime,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить почасовую статистику предсказаний.
+        
+        Args:
+            created_from: Начало интервала (включительно, округляется до часа)
+            created_to: Конец интервала (не включительно)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+            
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами hour, toxicity_level, model_version,
+                count, mean_processing_time_ms, score_histogram
+        """
+        pass
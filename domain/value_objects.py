@@ -9,9 +9,12 @@ Value Objects представляют концепции предметной 
 - Immutability
 """
 
+import time
 from dataclasses import dataclass
 from enum import Enum
 
+from domain.exceptions import DeadlineExceeded
+
 
 class ToxicityLevel(str, Enum):
     """
@@ -63,3 +66,62 @@ class ModelConfig:
     hidden_size: int
     output_size: int
 
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Крайний срок обработки запроса.
+    
+    Immutable Value Object. Момент истечения хранится по монотонным часам
+    процесса (time.monotonic), поэтому не зависит от перевода системного
+    времени. Создается на входе запроса из бюджета клиента в миллисекундах
+    и передается через use case, очередь модели и репозиторий.
+    
+    Attributes:
+        expires_at: Момент истечения по time.monotonic()
+    """
+    expires_at: float
+    
+    @classmethod
+    def after_ms(cls, timeout_ms: float) -> "Deadline":
+        """
+        Создать крайний срок через timeout_ms миллисекунд от текущего момента.
+        
+        Args:
+            timeout_ms: Бюджет времени в миллисекундах
+            
+        Returns:
+            Deadline: Крайний срок
+        """
+        return cls(expires_at=time.monotonic() + timeout_ms / 1000)
+    
+    def remaining_ms(self) -> float:
+        """
+        Оставшееся время в миллисекундах (отрицательное после истечения).
+        
+        Returns:
+            float: Оставшееся время
+        """
+        return (self.expires_at - time.monotonic()) * 1000
+    
+    def expired(self) -> bool:
+        """
+        Проверить, истек ли крайний срок.
+        
+        Returns:
+            bool: True, если срок истек
+        """
+        return time.monotonic() >= self.expires_at
+    
+    def check(self, stage: str) -> None:
+        """
+        Прервать обработку, если крайний срок истек.
+        
+        Args:
+            stage: Этап обработки, перед которым выполняется проверка
+            
+        Raises:
+            DeadlineExceeded: Если срок истек
+        """
+        if self.expired():
+            raise DeadlineExceeded(stage)
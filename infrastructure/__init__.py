@@ -11,13 +11,27 @@ Infrastructure Layer
 """
 
 from infrastructure.database import get_session, Database
-from infrastructure.repositories import PredictionRepository
-from infrastructure.models import PredictionORM
+from infrastructure.repositories import PredictionRepository, PredictionStatsRepository
+from infrastructure.memory_repositories import (
+    InMemoryPredictionRepository,
+    InMemoryPredictionStatsRepository,
+    InMemoryPredictionStore,
+)
+from infrastructure.text_codec import TextCodec, TextStorageMode
+from infrastructure.models import PredictionORM, PredictionStatsHourlyORM, TaskWatermarkORM
 
 __all__ = [
     "get_session",
     "Database",
     "PredictionRepository",
+    "PredictionStatsRepository",
+    "InMemoryPredictionRepository",
+    "InMemoryPredictionStatsRepository",
+    "InMemoryPredictionStore",
+    "TextCodec",
+    "TextStorageMode",
     "PredictionORM",
+    "PredictionStatsHourlyORM",
+    "TaskWatermarkORM",
 ]
 
@@ -4,13 +4,28 @@ Celery Application Configuration
 Настройка Celery для выполнения фоновых задач.
 Используется для асинхронной обработки тяжелых операций.
 
+Задачи разделены на две очереди, чтобы большое задание не задерживало
+короткие запросы:
+- interactive: одиночные предсказания, чувствительные к задержке
+- bulk: чанки заданий и batch_predict, а также периодическое обслуживание
+
+Воркер может слушать обе очереди (общий пул) или одну (выделенные пулы).
+Prefetch выбирается по очередям воркера: воркер bulk очереди резервирует
+не больше одного чанка на процесс сверх выполняемого, поэтому в общем пуле
+interactive задача ждет не дольше одного чанка.
+
 Паттерны:
 - Task Queue Pattern
 - Producer-Consumer Pattern
 - Background Job Pattern
 """
 
+from typing import Any, Dict, Optional
+
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import celeryd_init
+from kombu import Queue
 import structlog
 
 from configs.config import load_configs
@@ -19,6 +34,10 @@ logger = structlog.get_logger(__name__)
 
 config = load_configs()
 redis_config = config.get("redis", {})
+celery_config = config.get("celery", {})
+
+INTERACTIVE_QUEUE = "interactive"
+BULK_QUEUE = "bulk"
 
 # URL для подключения к Redis
 redis_url = (
@@ -44,9 +63,68 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 минут
     task_soft_time_limit=25 * 60,  # 25 минут (soft limit)
-    worker_prefetch_multiplier=4,
+    result_expires=24 * 60 * 60,  # результаты заданий хранятся сутки
+    worker_prefetch_multiplier=int(celery_config.get("interactive_prefetch") or 4),
     worker_max_tasks_per_child=1000,
+    task_queues=(Queue(INTERACTIVE_QUEUE), Queue(BULK_QUEUE)),
+    task_default_queue=INTERACTIVE_QUEUE,
+    task_routes={
+        "predict_text_async": {"queue": INTERACTIVE_QUEUE},
+        "predict_chunk": {"queue": BULK_QUEUE},
+        "batch_predict": {"queue": BULK_QUEUE},
+        "merge_chunk_results": {"queue": BULK_QUEUE},
+        "maintain_prediction_partitions": {"queue": BULK_QUEUE},
+        "refresh_prediction_stats": {"queue": BULK_QUEUE},
+        "cleanup_old_predictions": {"queue": BULK_QUEUE},
+    },
+    # Очереди опрашиваются в порядке -Q: в общем пуле interactive первой
+    broker_transport_options={"queue_order_strategy": "priority"},
 )
 
+
+@celeryd_init.connect
+def configure_worker_prefetch(
+    conf: Any = None, options: Optional[Dict[str, Any]] = None, **kwargs: Any
+) -> None:
+    """
+    Выбрать prefetch по очередям, которые слушает воркер.
+    
+    Воркер, слушающий bulk очередь (выделенный или общий пул), получает
+    celery.bulk_prefetch (по умолчанию 1): иначе каждый процесс заранее
+    резервирует несколько чанков, и interactive задачи ждут их все.
+    Явный --prefetch-multiplier в командной строке имеет приоритет.
+    """
+    queues = (options or {}).get("queues") or []
+    if isinstance(queues, str):
+        queues = queues.split(",")
+    if not queues or BULK_QUEUE in queues:
+        conf.worker_prefetch_multiplier = int(celery_config.get("bulk_prefetch") or 1)
+    logger.info(
+        "Worker queues configured",
+        queues=list(queues) or [INTERACTIVE_QUEUE, BULK_QUEUE],
+        prefetch_multiplier=conf.worker_prefetch_multiplier,
+    )
+
+# Периодические задачи (Celery Beat)
+celery_app.conf.beat_schedule = {
+    # Каждый час: заранее создать суточные партиции predictions
+    "maintain-prediction-partitions": {
+        "task": "maintain_prediction_partitions",
+        "schedule": crontab(minute=15),
+    },
+    # Каждую минуту: дописать новые предсказания в почасовую статистику
+    "refresh-prediction-stats": {
+        "task": "refresh_prediction_stats",
+        "schedule": 60.0,
+    },
+    # Каждый час: удалить партиции и строки старше срока хранения
+    # (удаление строк ограничено retention.delete_max_runtime_seconds за запуск)
+    "cleanup-old-predictions": {
+        "task": "cleanup_old_predictions",
+        "schedule": crontab(minute=30),
+        "options": {"expires": 30 * 60},
+    },
+}
+
 logger.info("Celery app configured", broker=redis_url)
 
@@ -10,8 +10,13 @@ Database Configuration and Session Management
 - Dependency Injection для сессий
 """
 
-from typing import AsyncGenerator
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
 
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -30,6 +35,93 @@ Base = declarative_base()
 # Глобальный объект для управления подключениями
 _engine = None
 _session_factory = None
+_sync_engine: Optional[Engine] = None
+
+
+class PoolMetrics:
+    """
+    Метрики ожидания соединения из пула.
+    
+    Время ожидания измеряется от открытия сессии до получения соединения
+    (checkout из пула, включая установку нового соединения при overflow).
+    Все изменения выполняются в event loop без await, поэтому блокировки
+    не нужны.
+    
+    Attributes:
+        acquisitions: Количество полученных соединений
+        timeouts: Количество ожиданий, завершившихся pool timeout
+        waiting: Количество корутин, ожидающих соединение прямо сейчас
+        wait_seconds_total: Суммарное время ожидания
+        wait_seconds_max: Максимальное время ожидания
+    """
+    
+    def __init__(self):
+        """Инициализация нулевых счетчиков."""
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def observe_wait(self, seconds: float) -> None:
+        """
+        Учесть успешное получение соединения.
+        
+        Args:
+            seconds: Время ожидания соединения
+        """
+        self.acquisitions += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Получить текущие значения метрик.
+        
+        Returns:
+            Dict[str, Any]: Счетчики и среднее время ожидания
+        """
+        return {
+            "acquisitions": self.acquisitions,
+            "timeouts": self.timeouts,
+            "waiting": self.waiting,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.acquisitions, 6)
+            if self.acquisitions else 0.0,
+        }
+
+
+def get_database_url(db_config: Optional[Dict[str, Any]] = None, async_driver: bool = True) -> str:
+    """
+    Сформировать DSN для подключения к БД.
+    
+    Для PostgreSQL async SQLAlchemy использует драйвер asyncpg, а Alembic
+    и Celery задачи работают синхронно через psycopg2. Для backend sqlite
+    используется файл database.sqlite_path (async драйвер aiosqlite).
+    
+    Args:
+        db_config: Секция database из конфига (по умолчанию читается из configs.yml)
+        async_driver: Использовать ли asyncpg драйвер
+        
+    Returns:
+        str: Database URL для подключения
+    """
+    if db_config is None:
+        db_config = load_configs().get("database", {})
+    
+    if db_config.get("backend", "postgres") == "sqlite":
+        driver = "sqlite+aiosqlite" if async_driver else "sqlite"
+        return f"{driver}:///{db_config.get('sqlite_path', './textguard.db')}"
+    
+    user = db_config.get("user", "nlp_user")
+    password = db_config.get("password", "nlp_password")
+    host = db_config.get("host", "localhost")
+    port = db_config.get("port", 5432)
+    db_name = db_config.get("db", "nlp_db")
+    
+    driver = "postgresql+asyncpg" if async_driver else "postgresql"
+    return f"{driver}://{user}:{password}@{host}:{port}/{db_name}"
 
 
 class Database:
@@ -37,42 +129,65 @@ class Database:
     Класс для управления подключением к БД.
     
     Использует Singleton Pattern для единого подключения.
-    Управляет lifecycle подключения к PostgreSQL.
+    Управляет lifecycle подключения к БД.
+    
+    Backend выбирается через database.backend:
+    - postgres: PostgreSQL через asyncpg (по умолчанию)
+    - sqlite: файл SQLite через aiosqlite, таблицы создаются при подключении
+    - memory: БД не используется, репозитории хранят данные в памяти
     """
     
     def __init__(self):
         """Инициализация Database с настройками из конфига."""
         self._engine = None
         self._session_factory = None
+        self.backend = "postgres"
+        self.pool_metrics = PoolMetrics()
+    
+    @property
+    def uses_sql(self) -> bool:
+        """Использует ли backend SQL базу данных (False для memory)."""
+        return self.backend != "memory"
     
     async def connect(self):
         """
         Установить подключение к БД.
         
-        Создает async engine и session factory для работы с PostgreSQL.
+        Создает async engine и session factory для выбранного backend.
         """
         config = load_configs()
         db_config = config.get("database", {})
+        self.backend = db_config.get("backend", "postgres")
         
-        # Формирование DSN для async SQLAlchemy (использует asyncpg драйвер)
-        user = db_config.get("user", "nlp_user")
-        password = db_config.get("password", "nlp_password")
-        host = db_config.get("host", "localhost")
-        port = db_config.get("port", 5432)
-        db_name = db_config.get("db", "nlp_db")
+        if not self.uses_sql:
+            logger.info("Using in-memory storage, database connection skipped")
+            return
         
-        # Async SQLAlchemy использует postgresql+asyncpg://
-        database_url = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{db_name}"
+        database_url = get_database_url(db_config)
         
-        logger.info("Connecting to database", host=host, port=port, db=db_name)
-        
-        self._engine = create_async_engine(
-            database_url,
-            echo=False,  # Включить для отладки SQL запросов
-            pool_size=10,
-            max_overflow=20,
-            pool_pre_ping=True,  # Проверка соединения перед использованием
-        )
+        if self.backend == "sqlite":
+            logger.info(
+                "Connecting to database", backend="sqlite", path=db_config.get("sqlite_path")
+            )
+            self._engine = create_async_engine(database_url, echo=False)
+        else:
+            logger.info(
+                "Connecting to database",
+                host=db_config.get("host", "localhost"),
+                port=db_config.get("port", 5432),
+                db=db_config.get("db", "nlp_db"),
+            )
+            pool_config = db_config.get("pool") or {}
+            self._engine = create_async_engine(
+                database_url,
+                echo=False,  # Включить для отладки SQL запросов
+                pool_size=int(pool_config.get("size", 10)),
+                max_overflow=int(pool_config.get("max_overflow", 20)),
+                pool_timeout=float(pool_config.get("timeout", 30)),
+                pool_recycle=int(pool_config.get("recycle", -1)),
+                # Проверка соединения перед использованием
+                pool_pre_ping=bool(pool_config.get("pre_ping", True)),
+            )
         
         self._session_factory = async_sessionmaker(
             self._engine,
@@ -83,6 +198,10 @@ class Database:
         )
         
         logger.info("Database connection established")
+        
+        # Для SQLite миграции Alembic не используются
+        if self.backend == "sqlite":
+            await self.create_tables()
     
     async def disconnect(self):
         """
@@ -105,6 +224,59 @@ class Database:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._session_factory
     
+    def pool_status(self) -> Dict[str, Any]:
+        """
+        Получить состояние пула соединений.
+        
+        Returns:
+            Dict[str, Any]: Размер пула, занятые и overflow соединения,
+                метрики ожидания соединения
+        """
+        status: Dict[str, Any] = {"backend": self.backend}
+        if self._engine is not None:
+            pool = self._engine.pool
+            for gauge in ("size", "checkedout", "checkedin", "overflow"):
+                if hasattr(pool, gauge):
+                    status[gauge] = getattr(pool, gauge)()
+        status.update(self.pool_metrics.snapshot())
+        return status
+    
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[Optional[AsyncSession]]:
+        """
+        Открыть сессию с commit при успехе и rollback при ошибке.
+        
+        Соединение берется из пула сразу при входе (время ожидания
+        попадает в pool_metrics) и возвращается при выходе, поэтому
+        scope следует открывать только на время работы с БД.
+        Для backend memory сессия не нужна и возвращается None.
+        
+        Yields:
+            Optional[AsyncSession]: Async сессия SQLAlchemy или None
+        """
+        if not self.uses_sql:
+            yield None
+            return
+        
+        async with self.get_session_factory()() as session:
+            started = time.perf_counter()
+            self.pool_metrics.waiting += 1
+            try:
+                await session.connection()
+            except PoolTimeoutError:
+                self.pool_metrics.timeouts += 1
+                raise
+            finally:
+                self.pool_metrics.waiting -= 1
+            self.pool_metrics.observe_wait(time.perf_counter() - started)
+            
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+    
     async def create_tables(self):
         """
         Создать все таблицы в БД.
@@ -115,8 +287,16 @@ class Database:
         if not self._engine:
             raise RuntimeError("Database not connected. Call connect() first.")
         
+        from infrastructure.partitioning import ensure_partitions
+        
+        config = load_configs()
+        premake_days = int(config.get("retention", {}).get("partition_premake_days", 14))
+        
         async with self._engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            # Партиционированная таблица без партиций не принимает INSERT
+            if conn.dialect.name == "postgresql":
+                await conn.run_sync(ensure_partitions, days_ahead=premake_days)
         
         logger.info("Database tables created")
 
@@ -143,6 +323,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     
     Используется в FastAPI dependency injection.
     Автоматически закрывает сессию после использования.
+    Для backend memory возвращает None.
     
     Yields:
         AsyncSession: Async сессия SQLAlchemy
@@ -155,14 +336,26 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             pass
         ```
     """
-    session_factory = _db.get_session_factory()
-    async with session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    async with _db.session_scope() as session:
+        yield session
+
 
+def get_sync_engine() -> Engine:
+    """
+    Получить синхронный engine для фоновых задач.
+    
+    Celery задачи выполняются синхронно, поэтому используют psycopg2.
+    Engine создается лениво в каждом процессе worker'а (после fork).
+    
+    Returns:
+        Engine: Синхронный SQLAlchemy engine
+    """
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(
+            get_database_url(async_driver=False),
+            pool_size=2,
+            max_overflow=2,
+            pool_pre_ping=True,
+        )
+    return _sync_engine
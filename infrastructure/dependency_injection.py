@@ -12,10 +12,30 @@ Dependency Injection Container
 
 from dependency_injector import containers, providers
 
+from application.admission import AdmissionController
+from application.batching import InferenceBatcher
+from application.deadlines import DeadlineMetrics
+from application.persistence import PersistencePolicy
 from application.services import ModelService, TextPreprocessingService
-from application.use_cases import PredictTextUseCase, GetPredictionHistoryUseCase
+from application.use_cases import (
+    PredictTextUseCase,
+    StreamPredictTextUseCase,
+    GetPredictionHistoryUseCase,
+    GetPredictionStatsUseCase,
+)
 from infrastructure.database import Database
-from infrastructure.repositories import PredictionRepository
+from infrastructure.jobs import JobQueue
+from infrastructure.memory_repositories import (
+    InMemoryPredictionRepository,
+    InMemoryPredictionStatsRepository,
+    InMemoryPredictionStore,
+)
+from infrastructure.repositories import (
+    PredictionRepository,
+    PredictionStatsRepository,
+    SQLitePredictionStatsRepository,
+)
+from infrastructure.text_codec import TextCodec
 
 
 class Container(containers.DeclarativeContainer):
@@ -29,6 +49,8 @@ class Container(containers.DeclarativeContainer):
     - Use Cases
     
     Использует Singleton для сервисов и Factory для use cases.
+    Реализация репозиториев выбирается по config.database.backend
+    (postgres, sqlite или memory).
     """
     
     # Configuration
@@ -37,10 +59,45 @@ class Container(containers.DeclarativeContainer):
     # Database
     database = providers.Singleton(Database)
     
-    # Repositories (Factory, создается для каждой сессии)
-    prediction_repository = providers.Factory(
-        PredictionRepository,
-        session=providers.Dependency(),
+    # Unit of work: сессия открывается репозиторием только на время работы с БД
+    session_scope = database.provided.session_scope
+    
+    # Кодек хранения текста (plain, zstd, hash_only)
+    text_codec = providers.Singleton(
+        TextCodec,
+        mode=config.storage.text_mode,
+        level=config.storage.zstd_level,
+    )
+    
+    # In-memory хранилище (Singleton, разделяется всеми запросами)
+    prediction_store = providers.Singleton(
+        InMemoryPredictionStore,
+        text_codec=text_codec,
+        max_size=config.database.memory_max_predictions,
+    )
+    
+    # Repositories (Factory, создается для каждого запроса)
+    # SQLAlchemy реализация одинаково работает с PostgreSQL и SQLite
+    prediction_repository = providers.Selector(
+        config.database.backend,
+        postgres=providers.Factory(
+            PredictionRepository,
+            session_scope=session_scope,
+            text_codec=text_codec,
+        ),
+        sqlite=providers.Factory(
+            PredictionRepository,
+            session_scope=session_scope,
+            text_codec=text_codec,
+        ),
+        memory=providers.Factory(InMemoryPredictionRepository, store=prediction_store),
+    )
+    
+    prediction_stats_repository = providers.Selector(
+        config.database.backend,
+        postgres=providers.Factory(PredictionStatsRepository, session_scope=session_scope),
+        sqlite=providers.Factory(SQLitePredictionStatsRepository, session_scope=session_scope),
+        memory=providers.Factory(InMemoryPredictionStatsRepository, store=prediction_store),
     )
     
     # Services (Singleton, один экземпляр на все приложение)
@@ -53,15 +110,63 @@ class Container(containers.DeclarativeContainer):
         preprocessor=text_preprocessing_service,
     )
     
+    # Общая очередь одиночных предсказаний (HTTP и WebSocket), пачки для модели
+    inference_batcher = providers.Singleton(
+        InferenceBatcher,
+        model_service=model_service,
+        max_batch_size=config.inference.batch_size,
+        max_wait_ms=config.inference.max_wait_ms,
+    )
+    
+    # Контроль допуска запросов на предсказание (общий лимит для процесса)
+    admission_controller = providers.Singleton(
+        AdmissionController,
+        max_in_flight=config.admission.max_in_flight,
+        max_queue_size=config.admission.max_queue_size,
+        max_queue_wait_ms=config.admission.max_queue_wait_ms,
+        adaptive=config.admission.adaptive,
+        target_latency_ms=config.admission.target_latency_ms,
+        min_in_flight=config.admission.min_in_flight,
+        retry_after_seconds=config.admission.retry_after_seconds,
+    )
+    
+    # Асинхронные задания на оценку пачек текстов (Celery)
+    job_queue = providers.Singleton(
+        JobQueue,
+        chunk_size=config.jobs.chunk_size,
+    )
+    
+    # Singleton: счетчики сохраненных/пропущенных предсказаний общие для процесса
+    persistence_policy = providers.Singleton(
+        PersistencePolicy,
+        benign_sample_rate=config.persistence.benign_sample_rate,
+    )
+    
+    # Singleton: счетчики прерванных по крайнему сроку запросов
+    deadline_metrics = providers.Singleton(DeadlineMetrics)
+    
     # Use Cases (Factory, можно создавать несколько экземпляров)
     predict_text_use_case = providers.Factory(
         PredictTextUseCase,
-        model_service=model_service,
+        model_service=inference_batcher,
         prediction_repository=prediction_repository,
+        persistence_policy=persistence_policy,
+        deadline_metrics=deadline_metrics,
+    )
+    
+    stream_predict_text_use_case = providers.Factory(
+        StreamPredictTextUseCase,
+        model_service=model_service,
+        batch_size=config.inference.batch_size,
+        max_in_flight_batches=config.inference.stream_max_in_flight_batches,
     )
     
     get_prediction_history_use_case = providers.Factory(
         GetPredictionHistoryUseCase,
         prediction_repository=prediction_repository,
     )
-
+    
+    get_prediction_stats_use_case = providers.Factory(
+        GetPredictionStatsUseCase,
+        stats_repository=prediction_stats_repository,
+    )
@@ -0,0 +1,263 @@
+"""
+Async Scoring Jobs
+
+Асинхронные задания на оценку больших пачек текстов через Celery.
+Задание делится на чанки, каждый чанк - отдельная задача predict_chunk,
+которую воркер оценивает одним векторизованным проходом модели.
+
+Метаданные и прогресс задания хранятся в Redis (хеш на задание),
+поэтому статус читается одним запросом, без опроса всех задач.
+Результаты хранятся в result backend Celery по чанкам.
+
+Паттерны:
+- Job Pattern
+- Scatter-Gather (group чанков)
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import redis
+import structlog
+from celery import group
+from celery.result import GroupResult
+
+from infrastructure.celery_app import celery_app, redis_url
+
+logger = structlog.get_logger(__name__)
+
+JOB_KEY_PREFIX = "textguard:job:"
+
+
+class JobStore:
+    """
+    Метаданные и прогресс заданий в Redis.
+    
+    Хеш задания: total, chunk_size, chunks, created_at, group_id и по полю
+    chunk:<offset> на каждый завершенный чанк (processed или failed), которые
+    пишут воркеры. Счетчики processed/failed (в текстах) выводятся из полей
+    чанков: повторное выполнение чанка (acks_late после сбоя воркера)
+    перезаписывает его поле, а не увеличивает счетчик второй раз. Ключ
+    живет столько же, сколько результаты задач в result backend.
+    
+    Args:
+        url: URL Redis
+        ttl_seconds: Время жизни метаданных задания
+        client: Клиент Redis (по умолчанию создается по url)
+    """
+    
+    CHUNK_FIELD_PREFIX = "chunk:"
+    
+    def __init__(
+        self,
+        url: str = redis_url,
+        ttl_seconds: Optional[int] = None,
+        client: Optional[redis.Redis] = None,
+    ):
+        """
+        Инициализация хранилища.
+        
+        Args:
+            url: URL Redis
+            ttl_seconds: Время жизни метаданных (по умолчанию result_expires Celery)
+            client: Клиент Redis с decode_responses=True (по умолчанию по url)
+        """
+        self._client = client or redis.Redis.from_url(url, decode_responses=True)
+        self.ttl_seconds = int(ttl_seconds or celery_app.conf.result_expires)
+    
+    @staticmethod
+    def key(job_id: str) -> str:
+        """Ключ Redis для задания."""
+        return f"{JOB_KEY_PREFIX}{job_id}"
+    
+    def create(self, job_id: str, total: int, chunk_size: int, chunks: int) -> None:
+        """
+        Зарегистрировать задание до постановки его чанков в очередь.
+        
+        Args:
+            job_id: Идентификатор задания
+            total: Количество текстов
+            chunk_size: Размер чанка
+            chunks: Количество чанков
+        """
+        key = self.key(job_id)
+        pipeline = self._client.pipeline()
+        pipeline.hset(
+            key,
+            mapping={
+                "total": total,
+                "chunk_size": chunk_size,
+                "chunks": chunks,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        pipeline.expire(key, self.ttl_seconds)
+        pipeline.execute()
+    
+    def set_group(self, job_id: str, group_id: str) -> None:
+        """Сохранить идентификатор group результата Celery."""
+        self._client.hset(self.key(job_id), "group_id", group_id)
+    
+    def record(self, job_id: str, offset: int, failed: bool = False) -> bool:
+        """
+        Учесть завершенный чанк (вызывается воркером).
+        
+        Запись идемпотентна: повторное выполнение того же чанка перезаписывает
+        его итог. Если метаданные задания уже истекли, ничего не пишется, чтобы
+        не создать ключ без TTL и без total.
+        
+        Args:
+            job_id: Идентификатор задания
+            offset: Индекс первого текста чанка
+            failed: Чанк завершился ошибкой
+        
+        Returns:
+            bool: False, если задание не найдено (истекло)
+        """
+        key = self.key(job_id)
+        field = f"{self.CHUNK_FIELD_PREFIX}{offset}"
+        
+        def update(pipeline: redis.client.Pipeline) -> bool:
+            if not pipeline.exists(key):
+                return False
+            pipeline.multi()
+            pipeline.hset(key, field, "failed" if failed else "processed")
+            return True
+        
+        # WATCH key: если ключ истечет между EXISTS и HSET, транзакция повторится
+        return self._client.transaction(update, key, value_from_callable=True)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Получить метаданные и прогресс задания.
+        
+        Args:
+            job_id: Идентификатор задания
+        
+        Returns:
+            Optional[Dict[str, Any]]: Метаданные или None, если задание не найдено
+        """
+        raw = self._client.hgetall(self.key(job_id))
+        if not raw:
+            return None
+        meta: Dict[str, Any] = {
+            name: int(raw.get(name, 0)) for name in ("total", "chunk_size", "chunks")
+        }
+        meta["processed"] = meta["failed"] = 0
+        for name, outcome in raw.items():
+            if name.startswith(self.CHUNK_FIELD_PREFIX):
+                offset = int(name[len(self.CHUNK_FIELD_PREFIX):])
+                meta[outcome] += min(meta["chunk_size"], meta["total"] - offset)
+        meta["created_at"] = raw.get("created_at")
+        meta["group_id"] = raw.get("group_id")
+        return meta
+
+
+class JobQueue:
+    """
+    Постановка заданий в очередь Celery и чтение их статуса.
+    
+    Args:
+        store: Хранилище метаданных заданий
+        chunk_size: Количество текстов в одной задаче predict_chunk
+    """
+    
+    def __init__(self, store: Optional[JobStore] = None, chunk_size: Optional[int] = None):
+        """
+        Инициализация очереди заданий.
+        
+        Args:
+            store: Хранилище метаданных (по умолчанию JobStore на Redis из конфига)
+            chunk_size: Размер чанка (по умолчанию 250)
+        """
+        self.store = store or JobStore()
+        self.chunk_size = int(chunk_size or 250)
+    
+    def submit(self, texts: List[str]) -> Dict[str, Any]:
+        """
+        Поставить задание в очередь.
+        
+        Args:
+            texts: Тексты для оценки
+        
+        Returns:
+            Dict[str, Any]: Статус созданного задания
+        """
+        job_id = str(uuid4())
+        offsets = range(0, len(texts), self.chunk_size)
+        self.store.create(job_id, total=len(texts), chunk_size=self.chunk_size, chunks=len(offsets))
+        
+        result = group(
+            celery_app.signature(
+                "predict_chunk",
+                args=(texts[offset:offset + self.chunk_size], offset),
+                kwargs={"job_id": job_id},
+            )
+            for offset in offsets
+        ).apply_async()
+        result.save()
+        self.store.set_group(job_id, result.id)
+        
+        logger.info("Job submitted", job_id=job_id, texts=len(texts), chunks=len(offsets))
+        return self.status(job_id)
+    
+    def status(
+        self,
+        job_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Получить статус задания и, если оно завершено, страницу результатов.
+        
+        Статусы: queued (ни один чанк не завершен), running, completed,
+        failed (все чанки завершены, но часть из них с ошибкой).
+        
+        Args:
+            job_id: Идентификатор задания
+            offset: Индекс первого результата на странице
+            limit: Максимальное количество результатов (None - все)
+        
+        Returns:
+            Optional[Dict[str, Any]]: Статус задания или None, если задание не найдено
+        """
+        meta = self.store.get(job_id)
+        if meta is None:
+            return None
+        
+        total, processed, failed = meta["total"], meta["processed"], meta["failed"]
+        if processed + failed >= total:
+            status = "failed" if failed else "completed"
+        else:
+            status = "running" if processed or failed else "queued"
+        
+        results = None
+        if status == "completed" and meta["group_id"]:
+            stop = total if limit is None else min(total, offset + limit)
+            results = self._results(meta, offset, stop)
+        
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": total,
+            "processed": processed,
+            "failed": failed,
+            "chunks": meta["chunks"],
+            "created_at": meta["created_at"],
+            "results": results,
+        }
+    
+    def _results(self, meta: Dict[str, Any], start: int, stop: int) -> List[Dict[str, Any]]:
+        """Прочитать из result backend только чанки, покрывающие [start, stop)."""
+        if start >= stop:
+            return []
+        group_result = GroupResult.restore(meta["group_id"], app=celery_app)
+        chunk_size = meta["chunk_size"]
+        first, last = start // chunk_size, (stop - 1) // chunk_size
+        
+        results: List[Dict[str, Any]] = []
+        for chunk in group_result.results[first:last + 1]:
+            results.extend(chunk.result)
+        skip = start - first * chunk_size
+        return results[skip:skip + stop - start]
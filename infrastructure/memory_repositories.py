@@ -0,0 +1,415 @@
+"""
+In-Memory Repository Implementations
+
+Реализации репозиториев, хранящие предсказания в памяти процесса.
+Используются для бенчмарков модели и API без PostgreSQL и для
+легковесных однонодовых развертываний, где история не должна
+переживать рестарт.
+
+Паттерны:
+- Repository Pattern (реализация)
+- In-Memory Storage
+"""
+
+from collections import deque
+from dataclasses import replace
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from uuid import UUID
+
+import structlog
+
+from domain.entities import PredictionResult
+from domain.repositories import IPredictionRepository, IPredictionStatsRepository
+from domain.value_objects import Deadline
+from infrastructure.rollups import SCORE_BUCKETS, finalize_stats_row
+from infrastructure.text_codec import TextCodec, TextStorageMode, hash_placeholder, text_hash
+
+logger = structlog.get_logger(__name__)
+
+# Предел по умолчанию: история in-memory не должна расти без ограничения
+DEFAULT_MAX_PREDICTIONS = 100_000
+
+
+def _history_row(prediction: PredictionResult) -> Dict[str, Any]:
+    """Преобразовать доменную сущность в строку read model истории."""
+    classification = prediction.text_classification
+    return {
+        "id": prediction.id,
+        "text": classification.text,
+        "toxicity_score": classification.toxicity_score,
+        "toxicity_level": classification.toxicity_level.value,
+        "confidence": classification.confidence,
+        "model_version": classification.model_version,
+        "processing_time_ms": prediction.processing_time_ms,
+        "created_at": prediction.created_at,
+    }
+
+
+class InMemoryPredictionStore:
+    """
+    Хранилище предсказаний в памяти процесса.
+    
+    Предсказания хранятся в очереди в порядке сохранения плюс индексы
+    по id и по хешу текста. Размер ограничен max_size: при переполнении
+    вытесняются самые старые предсказания (FIFO) вместе с записями индексов.
+    
+    Текст хранится по режиму storage.text_mode, как в таблице predictions:
+    в режиме hash_only вместо текста хранится заглушка [sha256:...], в
+    режиме zstd - сжатый текст (распаковывается при чтении через decode).
+    
+    Все изменения выполняются в потоке event loop без await, поэтому
+    блокировки не нужны. Один экземпляр разделяется всеми запросами
+    (Singleton в DI контейнере).
+    
+    Args:
+        text_codec: Кодек хранения текста (по умолчанию plain)
+        max_size: Максимальное количество предсказаний (по умолчанию 100000)
+    """
+    
+    def __init__(self, text_codec: Optional[TextCodec] = None, max_size: Optional[int] = None):
+        """
+        Инициализация пустого хранилища.
+        
+        Args:
+            text_codec: Кодек хранения текста (по умолчанию plain)
+            max_size: Максимальное количество предсказаний (по умолчанию 100000)
+        
+        Raises:
+            ValueError: Если max_size меньше 1
+        """
+        self.text_codec = text_codec or TextCodec()
+        self.max_size = int(max_size or DEFAULT_MAX_PREDICTIONS)
+        if self.max_size < 1:
+            raise ValueError(f"max_size must be positive, got {self.max_size}")
+        
+        self.predictions: Deque[PredictionResult] = deque()
+        self.by_id: Dict[UUID, PredictionResult] = {}
+        self.by_text_hash: Dict[str, Deque[PredictionResult]] = {}
+        self._text_hashes: Dict[UUID, str] = {}
+        self._compressed: Dict[UUID, bytes] = {}
+    
+    def append(self, prediction: PredictionResult) -> None:
+        """
+        Добавить предсказание, обновить индексы и вытеснить самые старые.
+        
+        Args:
+            prediction: Результат предсказания
+        """
+        encoded = self.text_codec.encode(prediction.text_classification.text)
+        if self.text_codec.mode != TextStorageMode.PLAIN:
+            # Исходный текст в памяти не остается: только заглушка (и сжатый текст для zstd)
+            prediction = replace(
+                prediction,
+                text_classification=replace(
+                    prediction.text_classification,
+                    text=hash_placeholder(encoded.text_hash),
+                ),
+            )
+            if encoded.compressed is not None:
+                self._compressed[prediction.id] = encoded.compressed
+        
+        self.by_id[prediction.id] = prediction
+        self._text_hashes[prediction.id] = encoded.text_hash
+        self.by_text_hash.setdefault(encoded.text_hash, deque()).append(prediction)
+        self.predictions.append(prediction)
+        
+        while len(self.predictions) > self.max_size:
+            self._evict_oldest()
+    
+    def _evict_oldest(self) -> None:
+        """Удалить самое старое предсказание из очереди и индексов."""
+        evicted = self.predictions.popleft()
+        self.by_id.pop(evicted.id, None)
+        self._compressed.pop(evicted.id, None)
+        digest = self._text_hashes.pop(evicted.id)
+        # Самое старое предсказание - первое и в своей корзине хешей
+        bucket = self.by_text_hash[digest]
+        bucket.popleft()
+        if not bucket:
+            del self.by_text_hash[digest]
+    
+    def decode(self, prediction: PredictionResult) -> PredictionResult:
+        """
+        Восстановить текст сохраненного предсказания.
+        
+        Args:
+            prediction: Предсказание из хранилища
+        
+        Returns:
+            PredictionResult: Предсказание с исходным текстом или заглушкой (hash_only)
+        """
+        compressed = self._compressed.get(prediction.id)
+        if compressed is None:
+            return prediction
+        return replace(
+            prediction,
+            text_classification=replace(
+                prediction.text_classification,
+                text=self.text_codec.decode(None, compressed, None),
+            ),
+        )
+    
+    def newest(self, limit: int, offset: int = 0) -> List[PredictionResult]:
+        """
+        Получить страницу предсказаний, начиная с последних сохраненных.
+        
+        Args:
+            limit: Максимальное количество записей
+            offset: Смещение от последней записи
+        
+        Returns:
+            List[PredictionResult]: Предсказания (новые первые)
+        """
+        return [self.decode(p) for p in islice(reversed(self.predictions), offset, offset + limit)]
+
+
+class InMemoryPredictionRepository(IPredictionRepository):
+    """
+    Реализация репозитория предсказаний в памяти.
+    
+    Порядок "новые первые" определяется порядком сохранения.
+    
+    Args:
+        store: Разделяемое хранилище предсказаний
+    """
+    
+    def __init__(self, store: InMemoryPredictionStore):
+        """
+        Инициализация репозитория.
+        
+        Args:
+            store: Разделяемое хранилище предсказаний
+        """
+        self.store = store
+    
+    async def save(
+        self, prediction: PredictionResult, deadline: Optional[Deadline] = None
+    ) -> PredictionResult:
+        """
+        Сохранить результат предсказания в памяти.
+        
+        Args:
+            prediction: Результат предсказания для сохранения
+            deadline: Крайний срок запроса (None - без ограничения)
+        
+        Returns:
+            PredictionResult: Сохраненный результат
+        
+        Raises:
+            DeadlineExceeded: Если срок истек до записи
+        """
+        if deadline is not None:
+            deadline.check("persist")
+        self.store.append(prediction)
+        return prediction
+    
+    async def get_by_id(self, prediction_id: UUID) -> Optional[PredictionResult]:
+        """
+        Получить предсказание по ID.
+        
+        Args:
+            prediction_id: UUID предсказания
+        
+        Returns:
+            Optional[PredictionResult]: Результат предсказания или None
+        """
+        prediction = self.store.by_id.get(prediction_id)
+        return self.store.decode(prediction) if prediction is not None else None
+    
+    async def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[PredictionResult]:
+        """
+        Получить список предсказаний с пагинацией (новые первые).
+        
+        Args:
+            limit: Максимальное количество записей
+            offset: Смещение для пагинации
+        
+        Returns:
+            List[PredictionResult]: Список результатов предсказаний
+        """
+        return self.store.newest(limit=limit, offset=offset)
+    
+    async def get_by_text(
+        self,
+        text: str,
+        limit: int = 100,
+    ) -> List[PredictionResult]:
+        """
+        Получить предсказания по тексту через индекс хешей.
+        
+        Args:
+            text: Текст для поиска
+            limit: Максимальное количество записей
+        
+        Returns:
+            List[PredictionResult]: Список результатов предсказаний (новые первые)
+        """
+        # SHA-256 совпадает только для одинаковых текстов: сравнение по хешу
+        # работает и для режимов zstd и hash_only, где исходный текст не хранится
+        matches = self.store.by_text_hash.get(text_hash(text), ())
+        return [self.store.decode(p) for p in islice(reversed(matches), limit)]
+    
+    async def get_history_rows(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить страницу истории как плоские строки.
+        
+        Args:
+            limit: Максимальное количество записей
+            offset: Смещение для пагинации
+        
+        Returns:
+            List[Dict[str, Any]]: Строки истории
+        """
+        return [_history_row(p) for p in self.store.newest(limit=limit, offset=offset)]
+    
+    async def get_history_row_by_id(self, prediction_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Получить одну строку истории по ID.
+        
+        Args:
+            prediction_id: UUID предсказания
+        
+        Returns:
+            Optional[Dict[str, Any]]: Строка истории или None
+        """
+        prediction = self.store.by_id.get(prediction_id)
+        return _history_row(self.store.decode(prediction)) if prediction is not None else None
+    
+    async def stream_history_rows(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Потоково выгрузить строки истории в порядке сохранения.
+        
+        Выгружается снимок хранилища на момент начала выгрузки.
+        
+        Args:
+            created_from: Нижняя граница created_at (включительно)
+            created_to: Верхняя граница created_at (не включительно)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+            batch_size: Размер пачки строк
+        
+        Yields:
+            List[Dict[str, Any]]: Пачка строк истории
+        """
+        created_from = _naive_utc(created_from) if created_from is not None else None
+        created_to = _naive_utc(created_to) if created_to is not None else None
+        
+        batch: List[Dict[str, Any]] = []
+        for prediction in list(self.store.predictions):
+            classification = prediction.text_classification
+            created_at = _naive_utc(prediction.created_at)
+            if created_from is not None and created_at < created_from:
+                continue
+            if created_to is not None and created_at >= created_to:
+                continue
+            if toxicity_level is not None and classification.toxicity_level.value != toxicity_level:
+                continue
+            if model_version is not None and classification.model_version != model_version:
+                continue
+            batch.append(_history_row(self.store.decode(prediction)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+class InMemoryPredictionStatsRepository(IPredictionStatsRepository):
+    """
+    Реализация репозитория статистики поверх in-memory хранилища.
+    
+    Агрегаты считаются на лету при каждом запросе: для in-memory
+    развертываний объем истории ограничен памятью процесса. Как и rollup
+    таблица, предсказания суммируются с весом sample_weight.
+    
+    Args:
+        store: Разделяемое хранилище предсказаний
+    """
+    
+    def __init__(self, store: InMemoryPredictionStore):
+        """
+        Инициализация репозитория.
+        
+        Args:
+            store: Разделяемое хранилище предсказаний
+        """
+        self.store = store
+    
+    async def get_hourly_stats(
+        self,
+        created_from: datetime,
+        created_to: datetime,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить почасовую статистику предсказаний.
+        
+        Args:
+            created_from: Начало интервала (включительно, округляется до часа)
+            created_to: Конец интервала (не включительно)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+        
+        Returns:
+            List[Dict[str, Any]]: Почасовая статистика, отсортированная по часу
+        """
+        # created_at в доменных сущностях хранится в UTC без tzinfo
+        created_from = _naive_utc(created_from).replace(minute=0, second=0, microsecond=0)
+        created_to = _naive_utc(created_to)
+        
+        grouped: Dict[tuple, Dict[str, Any]] = {}
+        for prediction in list(self.store.predictions):
+            created_at = _naive_utc(prediction.created_at)
+            if not created_from <= created_at < created_to:
+                continue
+            classification = prediction.text_classification
+            level = classification.toxicity_level.value
+            if toxicity_level is not None and level != toxicity_level:
+                continue
+            if model_version is not None and classification.model_version != model_version:
+                continue
+            
+            hour = created_at.replace(minute=0, second=0, microsecond=0)
+            key = (hour, level, classification.model_version)
+            item = grouped.get(key)
+            if item is None:
+                item = grouped[key] = {
+                    "hour": hour,
+                    "toxicity_level": level,
+                    "model_version": classification.model_version,
+                    "count": 0.0,
+                    "sum_processing_time_ms": 0.0,
+                    "score_histogram": [0.0] * SCORE_BUCKETS,
+                }
+            bucket = min(int(classification.toxicity_score * SCORE_BUCKETS), SCORE_BUCKETS - 1)
+            weight = prediction.sample_weight
+            item["count"] += weight
+            item["sum_processing_time_ms"] += weight * prediction.processing_time_ms
+            item["score_histogram"][bucket] += weight
+        
+        return [finalize_stats_row(grouped[key]) for key in sorted(grouped)]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Привести datetime к naive UTC для сравнения."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -13,13 +13,36 @@ ORM модели для представления данных в PostgreSQL.
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, String, Float, DateTime, JSON, Text
+from sqlalchemy import Column, String, Float, DateTime, Integer, JSON, LargeBinary, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 
 from infrastructure.database import Base
 from domain.value_objects import ToxicityLevel
 
 
+class ClockTimestamp(FunctionElement):
+    """
+    Текущее время в момент вычисления выражения (DEFAULT колонки).
+    
+    В PostgreSQL - clock_timestamp() (now() вернул бы начало транзакции),
+    в SQLite такой функции нет, используется CURRENT_TIMESTAMP.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(ClockTimestamp)
+def _compile_clock_timestamp(element, compiler, **kw):
+    return "clock_timestamp()"
+
+
+@compiles(ClockTimestamp, "sqlite")
+def _compile_clock_timestamp_sqlite(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
 class PredictionORM(Base):
     """
     ORM модель для предсказаний.
@@ -27,29 +50,62 @@ class PredictionORM(Base):
     Представляет таблицу predictions в PostgreSQL.
     Соответствует доменной сущности PredictionResult.
     
+    Таблица партиционирована по диапазону created_at (суточные партиции,
+    см. infrastructure/partitioning.py). PostgreSQL требует, чтобы ключ
+    партиционирования входил в первичный ключ, поэтому PK составной (id, created_at).
+    
     Attributes:
         id: Уникальный идентификатор (UUID)
-        text: Исходный текст
+        text: Исходный текст (режим хранения plain)
+        text_compressed: Текст, сжатый zstd (режим хранения zstd)
+        text_hash: SHA-256 хеш текста (индекс для поиска по тексту)
+        text_length: Длина текста в символах
         toxicity_score: Оценка токсичности (0.0 - 1.0)
         toxicity_level: Уровень токсичности (enum как строка)
         model_version: Версия модели
         confidence: Уверенность модели (0.0 - 1.0)
         processing_time_ms: Время обработки в миллисекундах
-        metadata: Дополнительные метаданные (JSON)
-        created_at: Время создания записи
+        sample_weight: Вес строки в статистике (1 / доля выборки нетоксичных)
+        metadata_: Дополнительные метаданные (JSON, колонка metadata)
+        created_at: Время создания записи (ключ партиционирования)
+        inserted_at: Время вставки строки, назначается БД (окно rollup статистики)
     """
     
     __tablename__ = "predictions"
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
-    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4, index=True)
-    text = Column(Text, nullable=False, index=True)
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    # Текст хранится в зависимости от режима (см. infrastructure/text_codec.py)
+    text = Column(Text, nullable=True)
+    text_compressed = Column(LargeBinary, nullable=True)
+    text_hash = Column(String(64), nullable=False, index=True)
+    text_length = Column(Integer, nullable=False)
     toxicity_score = Column(Float, nullable=False)
     toxicity_level = Column(String(50), nullable=False, index=True)
     model_version = Column(String(50), nullable=False)
     confidence = Column(Float, nullable=False, default=1.0)
     processing_time_ms = Column(Float, nullable=False)
-    metadata = Column(JSON, nullable=True, default={})
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, index=True)
+    # Выборочно сохраненная строка представляет 1 / benign_sample_rate предсказаний
+    sample_weight = Column(Float, nullable=False, default=1.0, server_default="1")
+    # Атрибут metadata зарезервирован declarative API, поэтому имя колонки задано явно
+    metadata_ = Column("metadata", JSON, nullable=True, default={})
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        default=datetime.utcnow,
+        index=True,
+    )
+    # created_at задается приложением в начале запроса, до инференса и коммита;
+    # инкрементальный rollup идет по времени вставки (clock_timestamp() в момент INSERT)
+    inserted_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        server_default=ClockTimestamp(),
+        index=True,
+    )
     
     def __repr__(self):
         """Строковое представление для отладки."""
@@ -59,3 +115,65 @@ class PredictionORM(Base):
             f"toxicity_level={self.toxicity_level})>"
         )
 
+
+class PredictionStatsHourlyORM(Base):
+    """
+    ORM модель почасовой агрегированной статистики предсказаний (rollup).
+    
+    Одна строка хранит агрегаты для (час, уровень токсичности, версия модели,
+    корзина гистограммы score). Таблица обновляется инкрементально задачей
+    refresh_prediction_stats и позволяет строить дашборды без сканирования
+    таблицы predictions.
+    
+    Attributes:
+        hour: Начало часа (date_trunc('hour', created_at))
+        toxicity_level: Уровень токсичности
+        model_version: Версия модели
+        score_bucket: Номер корзины гистограммы toxicity_score (0..SCORE_BUCKETS-1)
+        count: Оценка количества предсказаний (сумма sample_weight строк)
+        sum_processing_time_ms: Взвешенная сумма времени обработки (для среднего)
+    """
+    
+    __tablename__ = "prediction_stats_hourly"
+    
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    toxicity_level = Column(String(50), primary_key=True)
+    model_version = Column(String(50), primary_key=True)
+    score_bucket = Column(Integer, primary_key=True)
+    count = Column(Float, nullable=False, default=0.0)
+    sum_processing_time_ms = Column(Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        """Строковое представление для отладки."""
+        return (
+            f"<PredictionStatsHourlyORM(hour={self.hour}, "
+            f"toxicity_level={self.toxicity_level}, "
+            f"model_version={self.model_version}, "
+            f"score_bucket={self.score_bucket}, count={self.count})>"
+        )
+
+
+class TaskWatermarkORM(Base):
+    """
+    ORM модель водяных знаков (watermarks) фоновых задач.
+    
+    Хранит позицию, до которой задача уже обработала данные, чтобы
+    следующий запуск обрабатывал только новые строки.
+    
+    Attributes:
+        name: Имя задачи
+        watermark: Граница, до которой данные обработаны (для статистики - по inserted_at)
+        details: Дополнительное состояние задачи (JSON)
+        updated_at: Время последнего обновления
+    """
+    
+    __tablename__ = "task_watermarks"
+    
+    name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=True)
+    details = Column(JSON, nullable=True, default={})
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        """Строковое представление для отладки."""
+        return f"<TaskWatermarkORM(name={self.name}, watermark={self.watermark})>"
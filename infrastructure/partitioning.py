@@ -0,0 +1,234 @@
+"""
+Partition Management
+
+Управление партициями таблицы predictions.
+Таблица партиционирована по диапазону created_at (одна партиция на сутки),
+что позволяет удалять устаревшие данные через DETACH + DROP партиции
+вместо массового DELETE (без нагрузки на vacuum и раздувания таблицы).
+
+Паттерны:
+- Table Partitioning Pattern
+- Retention Policy Pattern
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+PARENT_TABLE = "predictions"
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+
+
+@dataclass(frozen=True)
+class PartitionInfo:
+    """
+    Описание суточной партиции.
+    
+    Attributes:
+        name: Имя таблицы-партиции
+        day: День, данные за который хранит партиция (UTC)
+        estimated_rows: Оценка числа строк из статистики pg_class
+    """
+    name: str
+    day: date
+    estimated_rows: int
+
+
+def partition_name(day: date) -> str:
+    """
+    Имя партиции для указанного дня.
+    
+    Args:
+        day: День (UTC)
+    
+    Returns:
+        str: Имя таблицы, например predictions_p20240131
+    """
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def _parse_partition_day(name: str) -> Optional[date]:
+    """Извлечь день из имени партиции (None для посторонних таблиц)."""
+    if not name.startswith(PARTITION_PREFIX):
+        return None
+    try:
+        return datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def retention_cutoff(retention_days: int) -> datetime:
+    """
+    Граница срока хранения, округленная вниз до начала суток (UTC).
+    
+    Совпадает с границей суточных партиций: строки до нее лежат только
+    в партициях, целиком вышедших за срок, поэтому удаление строк не
+    затрагивает партицию на границе срока.
+    
+    Args:
+        retention_days: Срок хранения в днях
+    
+    Returns:
+        datetime: Начало суток _utc_today() - retention_days (UTC)
+    """
+    day = _utc_today() - timedelta(days=retention_days)
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def create_partition(connection: Connection, day: date) -> str:
+    """
+    Создать партицию для указанного дня, если она еще не существует.
+    
+    Границы задаются явно в UTC, чтобы не зависеть от TimeZone сессии.
+    
+    Args:
+        connection: Синхронное подключение SQLAlchemy
+        day: День (UTC)
+    
+    Returns:
+        str: Имя партиции
+    """
+    name = partition_name(day)
+    lower = f"{day.isoformat()} 00:00:00+00"
+    upper = f"{(day + timedelta(days=1)).isoformat()} 00:00:00+00"
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+    return name
+
+
+def ensure_partitions(
+    connection: Connection,
+    days_ahead: int = 14,
+    start: Optional[date] = None,
+) -> List[str]:
+    """
+    Создать партиции на сегодня и на days_ahead дней вперед.
+    
+    Операция идемпотентна и вызывается периодически (Celery beat),
+    чтобы вставка никогда не упиралась в отсутствующую партицию.
+    
+    Args:
+        connection: Синхронное подключение SQLAlchemy
+        days_ahead: На сколько дней вперед создавать партиции
+        start: Первый день (по умолчанию сегодня, UTC)
+    
+    Returns:
+        List[str]: Имена партиций (существующих и созданных)
+    """
+    start = start or _utc_today()
+    names = [create_partition(connection, start + timedelta(days=i)) for i in range(days_ahead + 1)]
+    logger.info("Partitions ensured", first=names[0], last=names[-1], count=len(names))
+    return names
+
+
+def list_partitions(connection: Connection) -> List[PartitionInfo]:
+    """
+    Получить список суточных партиций таблицы predictions.
+    
+    Args:
+        connection: Синхронное подключение SQLAlchemy
+    
+    Returns:
+        List[PartitionInfo]: Партиции, отсортированные по дню
+    """
+    rows = connection.execute(
+        text(
+            "SELECT child.relname, child.reltuples "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    ).all()
+    
+    partitions = []
+    for name, reltuples in rows:
+        day = _parse_partition_day(name)
+        if day is not None:
+            partitions.append(
+                PartitionInfo(name=name, day=day, estimated_rows=max(int(reltuples), 0))
+            )
+    return sorted(partitions, key=lambda p: p.day)
+
+
+def unpartitioned_rows_table(connection: Connection) -> Optional[str]:
+    """
+    Таблица со строками predictions вне суточных партиций.
+    
+    Суточные партиции удаляются через DROP; строки вне их - DEFAULT
+    партиция или таблица, созданная без партиционирования
+    (Database.create_tables до миграций), - удаляются построчно
+    (см. infrastructure/retention.py).
+    
+    Args:
+        connection: Синхронное подключение SQLAlchemy
+    
+    Returns:
+        Optional[str]: predictions, если таблица не партиционирована; имя
+            DEFAULT партиции, если она есть; None, если все строки лежат
+            в суточных партициях (или таблицы нет)
+    """
+    kind = connection.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:parent)"),
+        {"parent": PARENT_TABLE},
+    ).scalar()
+    if kind is None:
+        return None
+    if kind != "p":
+        return PARENT_TABLE
+    return connection.execute(
+        text(
+            "SELECT partdefid::regclass::text FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(:parent) AND partdefid <> 0"
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalar()
+
+
+def drop_expired_partitions(connection: Connection, retention_days: int) -> List[PartitionInfo]:
+    """
+    Отсоединить и удалить партиции, целиком вышедшие за срок хранения.
+    
+    Партиция удаляется, только если ее верхняя граница не позже
+    retention_cutoff(retention_days), т.е. в ней не осталось актуальных строк.
+    DETACH PARTITION CONCURRENTLY не блокирует чтение и запись в родительскую
+    таблицу, но не может выполняться внутри транзакции, поэтому подключение
+    должно быть в режиме AUTOCOMMIT.
+    
+    Args:
+        connection: Синхронное подключение SQLAlchemy в режиме AUTOCOMMIT
+        retention_days: Срок хранения в днях
+    
+    Returns:
+        List[PartitionInfo]: Удаленные партиции
+    """
+    cutoff = retention_cutoff(retention_days).date()
+    expired = [p for p in list_partitions(connection) if p.day + timedelta(days=1) <= cutoff]
+    
+    for partition in expired:
+        logger.info(
+            "Dropping expired partition",
+            partition=partition.name,
+            estimated_rows=partition.estimated_rows,
+        )
+        connection.execute(
+            text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name} CONCURRENTLY")
+        )
+        connection.execute(text(f"DROP TABLE IF EXISTS {partition.name}"))
+    
+    return expired
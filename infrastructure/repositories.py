@@ -10,20 +10,26 @@ Repository Implementations
 - Unit of Work (через SQLAlchemy сессии)
 """
 
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, Integer, Select, cast, func, select, type_coerce
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from domain.entities import PredictionResult
-from domain.repositories import IPredictionRepository
-from domain.value_objects import ToxicityLevel
-from infrastructure.models import PredictionORM
+from domain.repositories import IPredictionRepository, IPredictionStatsRepository
+from domain.value_objects import Deadline, ToxicityLevel
+from infrastructure.models import PredictionORM, PredictionStatsHourlyORM
+from infrastructure.rollups import SCORE_BUCKETS, finalize_stats_row
+from infrastructure.text_codec import TextCodec, text_hash
 
 logger = structlog.get_logger(__name__)
 
+# Фабрика unit of work: открывает сессию (с соединением из пула) и коммитит при выходе
+SessionScope = Callable[[], AsyncContextManager[AsyncSession]]
+
 
 class PredictionRepository(IPredictionRepository):
     """
@@ -32,18 +38,46 @@ class PredictionRepository(IPredictionRepository):
     Использует SQLAlchemy ORM для работы с БД.
     Преобразует между ORM моделями и доменными сущностями.
     
+    Каждый метод открывает короткий unit of work через session_scope,
+    поэтому соединение из пула занято только на время запроса к БД,
+    а не на все время обработки HTTP запроса (включая инференс модели).
+    
+    Текст хранится через TextCodec (plain, zstd или только хеш);
+    кодирование и декодирование прозрачны для вызывающего кода.
+    
     Args:
-        session: Async сессия SQLAlchemy
+        session_scope: Фабрика unit of work (Database.session_scope)
+        text_codec: Кодек хранения текста (по умолчанию plain)
     """
     
-    def __init__(self, session: AsyncSession):
+    # Колонки read model истории (без metadata и без ORM/доменных объектов)
+    HISTORY_COLUMNS = (
+        PredictionORM.id,
+        PredictionORM.text,
+        PredictionORM.toxicity_score,
+        PredictionORM.toxicity_level,
+        PredictionORM.confidence,
+        PredictionORM.model_version,
+        PredictionORM.processing_time_ms,
+        PredictionORM.created_at,
+    )
+    
+    # Колонки хранения текста, из которых codec восстанавливает поле text
+    _TEXT_STORAGE_COLUMNS = (
+        PredictionORM.text_compressed,
+        PredictionORM.text_hash,
+    )
+    
+    def __init__(self, session_scope: SessionScope, text_codec: Optional[TextCodec] = None):
         """
         Инициализация репозитория.
         
         Args:
-            session: Async сессия SQLAlchemy
+            session_scope: Фабрика unit of work (Database.session_scope)
+            text_codec: Кодек хранения текста
         """
-        self.session = session
+        self.session_scope = session_scope
+        self.text_codec = text_codec or TextCodec()
     
     def _to_domain(self, orm_model: PredictionORM) -> PredictionResult:
         """
@@ -53,14 +87,16 @@ class PredictionRepository(IPredictionRepository):
         
         Args:
             orm_model: ORM модель из БД
-            
+        
         Returns:
             PredictionResult: Доменная сущность
         """
         from domain.entities import TextClassification
         
         classification = TextClassification(
-            text=orm_model.text,
+            text=self.text_codec.decode(
+                orm_model.text, orm_model.text_compressed, orm_model.text_hash
+            ),
             toxicity_score=orm_model.toxicity_score,
             toxicity_level=ToxicityLevel(orm_model.toxicity_level),
             model_version=orm_model.model_version,
@@ -72,7 +108,8 @@ class PredictionRepository(IPredictionRepository):
             text_classification=classification,
             created_at=orm_model.created_at,
             processing_time_ms=orm_model.processing_time_ms,
-            metadata=orm_model.metadata or {},
+            metadata=orm_model.metadata_ or {},
+            sample_weight=orm_model.sample_weight,
         )
     
     def _from_domain(self, domain_entity: PredictionResult) -> PredictionORM:
@@ -81,45 +118,84 @@ class PredictionRepository(IPredictionRepository):
         
         Args:
             domain_entity: Доменная сущность
-            
+        
         Returns:
             PredictionORM: ORM модель для сохранения в БД
         """
+        encoded = self.text_codec.encode(domain_entity.text_classification.text)
         return PredictionORM(
             id=domain_entity.id,
-            text=domain_entity.text_classification.text,
+            text=encoded.text,
+            text_compressed=encoded.compressed,
+            text_hash=encoded.text_hash,
+            text_length=encoded.text_length,
             toxicity_score=domain_entity.text_classification.toxicity_score,
             toxicity_level=domain_entity.text_classification.toxicity_level.value,
             model_version=domain_entity.text_classification.model_version,
             confidence=domain_entity.text_classification.confidence,
             processing_time_ms=domain_entity.processing_time_ms,
-            metadata=domain_entity.metadata,
+            sample_weight=domain_entity.sample_weight,
+            metadata_=domain_entity.metadata,
             created_at=domain_entity.created_at,
         )
     
-    async def save(self, prediction: PredictionResult) -> PredictionResult:
+    def _history_row(self, row: Any) -> Dict[str, Any]:
+        """
+        Преобразовать строку проекции в строку истории с декодированным текстом.
+        
+        Args:
+            row: Строка результата (mapping) с колонками HISTORY_COLUMNS
+                и _TEXT_STORAGE_COLUMNS
+        
+        Returns:
+            Dict[str, Any]: Строка истории (ключи HISTORY_COLUMNS)
+        """
+        item = dict(row)
+        compressed = item.pop("text_compressed")
+        digest = item.pop("text_hash")
+        item["text"] = self.text_codec.decode(item["text"], compressed, digest)
+        return item
+    
+    async def save(
+        self, prediction: PredictionResult, deadline: Optional[Deadline] = None
+    ) -> PredictionResult:
         """
         Сохранить результат предсказания в БД.
         
         Использует merge для обновления существующих записей
         или создания новых.
         
+        Крайний срок проверяется после получения соединения из пула
+        (ожидание пула может быть долгим), непосредственно перед записью.
+        
+        Строка не перечитывается из БД: в режиме hash_only декодированный
+        текст - заглушка [sha256:...], а вызывающей стороне нужен исходный.
+        Возвращается переданная сущность с полями, назначенными при записи.
+        
         Args:
             prediction: Результат предсказания для сохранения
-            
+            deadline: Крайний срок запроса (None - без ограничения)
+        
         Returns:
-            PredictionResult: Сохраненный результат
+            PredictionResult: Сохраненный результат (исходный текст)
+        
+        Raises:
+            DeadlineExceeded: Если срок истек до записи
         """
         logger.debug("Saving prediction", prediction_id=str(prediction.id))
         
         orm_model = self._from_domain(prediction)
-        self.session.add(orm_model)
-        await self.session.flush()  # Получить ID если был сгенерирован
-        await self.session.refresh(orm_model)
+        async with self.session_scope() as session:
+            if deadline is not None:
+                deadline.check("persist")
+            session.add(orm_model)
+            await session.flush()  # Получить ID если был сгенерирован
         
-        logger.info("Prediction saved", prediction_id=str(orm_model.id))
+        prediction.id = orm_model.id
+        prediction.created_at = orm_model.created_at
+        logger.info("Prediction saved", prediction_id=str(prediction.id))
         
-        return self._to_domain(orm_model)
+        return prediction
     
     async def get_by_id(self, prediction_id: UUID) -> Optional[PredictionResult]:
         """
@@ -127,15 +203,16 @@ class PredictionRepository(IPredictionRepository):
         
         Args:
             prediction_id: UUID предсказания
-            
+        
         Returns:
             Optional[PredictionResult]: Результат предсказания или None
         """
         logger.debug("Fetching prediction by id", prediction_id=str(prediction_id))
         
         stmt = select(PredictionORM).where(PredictionORM.id == prediction_id)
-        result = await self.session.execute(stmt)
-        orm_model = result.scalar_one_or_none()
+        async with self.session_scope() as session:
+            result = await session.execute(stmt)
+            orm_model = result.scalar_one_or_none()
         
         if orm_model is None:
             return None
@@ -151,11 +228,14 @@ class PredictionRepository(IPredictionRepository):
         Получить список предсказаний с пагинацией.
         
         Сортирует по времени создания (новые первые).
+        ORDER BY по ключу партиционирования с LIMIT выполняется как
+        упорядоченный Append по партициям: читаются только самые свежие
+        партиции через их индексы по created_at.
         
         Args:
             limit: Максимальное количество записей
             offset: Смещение для пагинации
-            
+        
         Returns:
             List[PredictionResult]: Список результатов предсказаний
         """
@@ -167,8 +247,9 @@ class PredictionRepository(IPredictionRepository):
             .limit(limit)
             .offset(offset)
         )
-        result = await self.session.execute(stmt)
-        orm_models = result.scalars().all()
+        async with self.session_scope() as session:
+            result = await session.execute(stmt)
+            orm_models = result.scalars().all()
         
         return [self._to_domain(orm_model) for orm_model in orm_models]
     
@@ -181,11 +262,13 @@ class PredictionRepository(IPredictionRepository):
         Получить предсказания по тексту.
         
         Используется для кеширования и поиска похожих предсказаний.
+        Поиск идет по индексу text_hash, поэтому работает во всех
+        режимах хранения текста.
         
         Args:
             text: Текст для поиска
             limit: Максимальное количество записей
-            
+        
         Returns:
             List[PredictionResult]: Список результатов предсказаний
         """
@@ -193,12 +276,285 @@ class PredictionRepository(IPredictionRepository):
         
         stmt = (
             select(PredictionORM)
-            .where(PredictionORM.text == text)
+            .where(PredictionORM.text_hash == text_hash(text))
             .order_by(PredictionORM.created_at.desc())
             .limit(limit)
         )
-        result = await self.session.execute(stmt)
-        orm_models = result.scalars().all()
+        async with self.session_scope() as session:
+            result = await session.execute(stmt)
+            orm_models = result.scalars().all()
         
         return [self._to_domain(orm_model) for orm_model in orm_models]
+    
+    async def get_history_rows(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить страницу истории как плоские строки.
+        
+        Выбирает только колонки HISTORY_COLUMNS, минуя ORM identity map,
+        _to_domain и валидацию TextClassification.
+        
+        Args:
+            limit: Максимальное количество записей
+            offset: Смещение для пагинации
+        
+        Returns:
+            List[Dict[str, Any]]: Строки истории
+        """
+        logger.debug("Fetching history rows", limit=limit, offset=offset)
+        
+        stmt = (
+            select(*self.HISTORY_COLUMNS, *self._TEXT_STORAGE_COLUMNS)
+            .order_by(PredictionORM.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        async with self.session_scope() as session:
+            result = await session.execute(stmt)
+            return [self._history_row(row) for row in result.mappings()]
+    
+    async def get_history_row_by_id(self, prediction_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Получить одну строку истории по ID.
+        
+        Args:
+            prediction_id: UUID предсказания
+        
+        Returns:
+            Optional[Dict[str, Any]]: Строка истории или None
+        """
+        logger.debug("Fetching history row by id", prediction_id=str(prediction_id))
+        
+        stmt = (
+            select(*self.HISTORY_COLUMNS, *self._TEXT_STORAGE_COLUMNS)
+            .where(PredictionORM.id == prediction_id)
+        )
+        async with self.session_scope() as session:
+            result = await session.execute(stmt)
+            row = result.mappings().one_or_none()
+        
+        return self._history_row(row) if row is not None else None
+    
+    async def stream_history_rows(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Потоково выгрузить строки истории через server-side курсор.
+        
+        session.stream с yield_per читает результат порциями из курсора
+        PostgreSQL, не материализуя весь результат в памяти. Фильтр по
+        created_at отсекает лишние партиции (partition pruning).
+        
+        Args:
+            created_from: Нижняя граница created_at (включительно)
+            created_to: Верхняя граница created_at (не включительно)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+            batch_size: Размер пачки строк
+        
+        Yields:
+            List[Dict[str, Any]]: Пачка строк истории
+        """
+        logger.debug(
+            "Streaming history rows",
+            created_from=str(created_from),
+            created_to=str(created_to),
+            toxicity_level=toxicity_level,
+            model_version=model_version,
+        )
+        
+        stmt = (
+            select(*self.HISTORY_COLUMNS, *self._TEXT_STORAGE_COLUMNS)
+            .order_by(PredictionORM.created_at)
+        )
+        if created_from is not None:
+            stmt = stmt.where(PredictionORM.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(PredictionORM.created_at < created_to)
+        if toxicity_level is not None:
+            stmt = stmt.where(PredictionORM.toxicity_level == toxicity_level)
+        if model_version is not None:
+            stmt = stmt.where(PredictionORM.model_version == model_version)
+        
+        async with self.session_scope() as session:
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            try:
+                async for partition in result.mappings().partitions():
+                    yield [self._history_row(row) for row in partition]
+            finally:
+                # Закрыть курсор, даже если потребитель прервал выгрузку
+                await result.close()
+
+
+class PredictionStatsRepository(IPredictionStatsRepository):
+    """
+    Реализация репозитория статистики поверх rollup таблицы prediction_stats_hourly.
+    
+    Читает только агрегаты (час x уровень x версия x корзина гистограммы),
+    не обращаясь к таблице predictions.
+    
+    Args:
+        session_scope: Фабрика unit of work (Database.session_scope)
+    """
+    
+    def __init__(self, session_scope: SessionScope):
+        """
+        Инициализация репозитория.
+        
+        Args:
+            session_scope: Фабрика unit of work (Database.session_scope)
+        """
+        self.session_scope = session_scope
+    
+    async def get_hourly_stats(
+        self,
+        created_from: datetime,
+        created_to: datetime,
+        toxicity_level: Optional[str] = None,
+        model_version: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Получить почасовую статистику предсказаний.
+        
+        Строки rollup таблицы по корзинам гистограммы сворачиваются
+        в одну запись на (час, уровень токсичности, версия модели).
+        
+        Args:
+            created_from: Начало интервала (включительно, округляется до часа)
+            created_to: Конец интервала (не включительно)
+            toxicity_level: Фильтр по уровню токсичности
+            model_version: Фильтр по версии модели
+        
+        Returns:
+            List[Dict[str, Any]]: Почасовая статистика, отсортированная по часу
+        """
+        logger.debug(
+            "Fetching hourly stats",
+            created_from=str(created_from),
+            created_to=str(created_to),
+        )
+        
+        stmt = self._bucket_query(
+            created_from.replace(minute=0, second=0, microsecond=0),
+            created_to,
+            toxicity_level,
+            model_version,
+        )
+        async with self.session_scope() as session:
+            result = (await session.execute(stmt)).all()
+        
+        grouped: Dict[tuple, Dict[str, Any]] = {}
+        for hour, level, version, bucket, count, sum_ms in result:
+            item = grouped.get((hour, level, version))
+            if item is None:
+                item = grouped[(hour, level, version)] = {
+                    "hour": hour,
+                    "toxicity_level": level,
+                    "model_version": version,
+                    "count": 0.0,
+                    "sum_processing_time_ms": 0.0,
+                    "score_histogram": [0.0] * SCORE_BUCKETS,
+                }
+            item["count"] += count
+            item["sum_processing_time_ms"] += sum_ms
+            item["score_histogram"][bucket] += count
+        
+        return [finalize_stats_row(item) for item in grouped.values()]
+    
+    def _bucket_query(
+        self,
+        hour_from: datetime,
+        created_to: datetime,
+        toxicity_level: Optional[str],
+        model_version: Optional[str],
+    ) -> Select:
+        """
+        Запрос строк (час, уровень, версия, корзина, count, сумма времени обработки).
+        
+        Строки должны быть отсортированы по часу.
+        """
+        stats = PredictionStatsHourlyORM
+        stmt = (
+            select(
+                stats.hour,
+                stats.toxicity_level,
+                stats.model_version,
+                stats.score_bucket,
+                stats.count,
+                stats.sum_processing_time_ms,
+            )
+            .where(stats.hour >= hour_from, stats.hour < created_to)
+            .order_by(stats.hour, stats.toxicity_level, stats.model_version)
+        )
+        if toxicity_level is not None:
+            stmt = stmt.where(stats.toxicity_level == toxicity_level)
+        if model_version is not None:
+            stmt = stmt.where(stats.model_version == model_version)
+        return stmt
+
+
+class SQLitePredictionStatsRepository(PredictionStatsRepository):
+    """
+    Реализация репозитория статистики для backend sqlite.
+    
+    Rollup таблицу prediction_stats_hourly заполняет только задача Celery
+    для PostgreSQL, поэтому для SQLite агрегаты считаются на лету по
+    таблице predictions (как в InMemoryPredictionStatsRepository): объем
+    истории однонодового развертывания невелик, а запрос идет по индексу
+    created_at. Предсказания суммируются с весом sample_weight.
+    
+    Args:
+        session_scope: Фабрика unit of work (Database.session_scope)
+    """
+    
+    def _bucket_query(
+        self,
+        hour_from: datetime,
+        created_to: datetime,
+        toxicity_level: Optional[str],
+        model_version: Optional[str],
+    ) -> Select:
+        """Агрегировать predictions по (час, уровень, версия, корзина гистограммы)."""
+        prediction = PredictionORM
+        # SQLite хранит DateTime строкой без часового пояса; created_at пишется в UTC
+        hour = type_coerce(func.strftime("%Y-%m-%d %H:00:00", prediction.created_at), DateTime())
+        bucket = func.min(
+            cast(prediction.toxicity_score * SCORE_BUCKETS, Integer),
+            SCORE_BUCKETS - 1,
+        )
+        stmt = (
+            select(
+                hour,
+                prediction.toxicity_level,
+                prediction.model_version,
+                bucket,
+                func.sum(prediction.sample_weight),
+                func.sum(prediction.sample_weight * prediction.processing_time_ms),
+            )
+            .where(
+                prediction.created_at >= _naive_utc(hour_from),
+                prediction.created_at < _naive_utc(created_to),
+            )
+            .group_by(hour, prediction.toxicity_level, prediction.model_version, bucket)
+            .order_by(hour, prediction.toxicity_level, prediction.model_version)
+        )
+        if toxicity_level is not None:
+            stmt = stmt.where(prediction.toxicity_level == toxicity_level)
+        if model_version is not None:
+            stmt = stmt.where(prediction.model_version == model_version)
+        return stmt
+
 
+def _naive_utc(value: datetime) -> datetime:
+    """Привести datetime к naive UTC (формат хранения DateTime в SQLite)."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,284 @@
+"""
+Retention Deletes
+
+Удаление предсказаний старше срока хранения небольшими пачками.
+
+Суточные партиции удаляются целиком (см. infrastructure/partitioning.py),
+но строки вне суточных партиций (DEFAULT партиция, непартиционированная
+таблица, см. unpartitioned_rows_table) так не удаляются. Для них
+выполняется DELETE пачками по ключу (created_at, id) с LIMIT: каждая
+пачка - короткая транзакция, которая не держит долгих блокировок и не
+создает всплеска WAL и отставания реплик.
+
+Граница срока округляется вниз до начала суток (retention_cutoff), как и
+для партиций: партиция на границе срока целиком остается до следующих
+суток и затем удаляется через DROP, а не построчно.
+
+Ход удаления хранится в строке task_watermarks: watermark - created_at
+последней удаленной строки, details - таблица, граница срока, id последней
+строки и итог запуска (deleted_rows, batches, seconds, rows_per_second,
+completed). Позиция сохраняется в транзакции каждой пачки. Запуск,
+остановленный по max_runtime_seconds, следующий запуск продолжает с
+сохраненной позиции, если граница срока и таблица те же: сканирование
+индекса начинается с нее, а не проходит заново по мертвым записям уже
+удаленных строк. После завершенного прохода (completed) следующий запуск
+начинает с наименьшего ключа, поэтому строки с ключом меньше позиции,
+вставленные во время прохода, удаляются следующим проходом.
+
+Паттерны:
+- Retention Policy Pattern
+- Keyset Pagination
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+import structlog
+
+from infrastructure.partitioning import PARENT_TABLE, retention_cutoff
+
+logger = structlog.get_logger(__name__)
+
+RETENTION_WATERMARK = "predictions_retention"
+
+Position = Tuple[datetime, str]
+
+
+@dataclass(frozen=True)
+class RetentionRun:
+    """
+    Итог запуска удаления.
+    
+    Attributes:
+        deleted_rows: Количество удаленных строк
+        batches: Количество выполненных пачек
+        seconds: Длительность запуска
+        completed: True, если строк старше срока не осталось;
+            False, если запуск остановлен по max_runtime_seconds
+    """
+    deleted_rows: int
+    batches: int
+    seconds: float
+    completed: bool
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Скорость удаления."""
+        return self.deleted_rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def delete_expired_rows(
+    engine: Engine,
+    retention_days: int,
+    table: str = PARENT_TABLE,
+    batch_size: int = 5000,
+    pause_seconds: float = 0.1,
+    max_rows_per_second: Optional[float] = None,
+    max_runtime_seconds: float = 600,
+) -> RetentionRun:
+    """
+    Удалить строки table старше retention_days пачками.
+    
+    Удаляются строки с created_at до начала суток retention_cutoff.
+    Каждая пачка удаляет до batch_size строк с наименьшими (created_at, id)
+    после сохраненной позиции и коммитится отдельно. Между пачками
+    выдерживается пауза pause_seconds, а при заданном max_rows_per_second -
+    еще и пауза, ограничивающая среднюю скорость удаления. Запуск
+    заканчивается, когда пачка оказалась неполной (строк старше срока
+    больше нет) или истек max_runtime_seconds; в последнем случае
+    следующий запуск продолжит с сохраненной позиции.
+    
+    Args:
+        engine: Синхронный engine (PostgreSQL)
+        retention_days: Срок хранения в днях
+        table: Таблица со строками вне суточных партиций (unpartitioned_rows_table)
+        batch_size: Строк в одной пачке
+        pause_seconds: Пауза между пачками
+        max_rows_per_second: Ограничение средней скорости (None - без ограничения)
+        max_runtime_seconds: Максимальная длительность запуска
+    
+    Returns:
+        RetentionRun: Итог запуска
+    """
+    cutoff = retention_cutoff(retention_days)
+    position = _load_position(engine, table, cutoff)
+    
+    deleted_rows = 0
+    batches = 0
+    start = time.monotonic()
+    completed = False
+    
+    while time.monotonic() - start < max_runtime_seconds:
+        deleted, position = _delete_batch(engine, table, cutoff, batch_size, position)
+        deleted_rows += deleted
+        batches += 1
+        if deleted < batch_size:
+            completed = True
+            break
+        
+        pause = pause_seconds
+        if max_rows_per_second:
+            # Пауза, после которой средняя скорость не превысит лимит
+            pause = max(pause, deleted_rows / max_rows_per_second - (time.monotonic() - start))
+        time.sleep(pause)
+    
+    run = RetentionRun(
+        deleted_rows=deleted_rows,
+        batches=batches,
+        seconds=time.monotonic() - start,
+        completed=completed,
+    )
+    _save_run(engine, table, cutoff, position, run)
+    logger.info(
+        "Expired rows deleted",
+        table=table,
+        cutoff=cutoff.isoformat(),
+        deleted_rows=run.deleted_rows,
+        batches=run.batches,
+        seconds=round(run.seconds, 2),
+        rows_per_second=round(run.rows_per_second, 1),
+        completed=run.completed,
+    )
+    return run
+
+
+def _load_position(engine: Engine, table: str, cutoff: datetime) -> Optional[Position]:
+    """
+    Позиция, с которой начинается запуск.
+    
+    Создает строку task_watermarks, если ее нет. Возвращает сохраненную
+    позицию, если прошлый проход по той же таблице и границе срока не
+    завершен, иначе None (с наименьшего ключа).
+    """
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO task_watermarks (name, watermark, details, updated_at) "
+                "VALUES (:name, NULL, '{}', now()) ON CONFLICT (name) DO NOTHING"
+            ),
+            {"name": RETENTION_WATERMARK},
+        )
+        state = connection.execute(
+            text("SELECT watermark, details FROM task_watermarks WHERE name = :name"),
+            {"name": RETENTION_WATERMARK},
+        ).one()
+    
+    details = state.details or {}
+    resumable = (
+        state.watermark is not None
+        and details.get("last_id")
+        and not details.get("completed", True)
+        and details.get("table") == table
+        and details.get("cutoff") == cutoff.isoformat()
+    )
+    return (state.watermark, details["last_id"]) if resumable else None
+
+
+def _save_run(
+    engine: Engine,
+    table: str,
+    cutoff: datetime,
+    position: Optional[Position],
+    run: RetentionRun,
+) -> None:
+    """Сохранить итог запуска в details строки task_watermarks."""
+    details = {
+        "table": table,
+        "cutoff": cutoff.isoformat(),
+        "last_id": position[1] if position else None,
+        "deleted_rows": run.deleted_rows,
+        "batches": run.batches,
+        "seconds": round(run.seconds, 3),
+        "rows_per_second": round(run.rows_per_second, 1),
+        "completed": run.completed,
+    }
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "UPDATE task_watermarks SET watermark = :created_at, "
+                "details = CAST(:details AS json), updated_at = now() WHERE name = :name"
+            ),
+            {
+                "name": RETENTION_WATERMARK,
+                "created_at": position[0] if position else None,
+                "details": json.dumps(details),
+            },
+        )
+
+
+def _delete_batch(
+    engine: Engine,
+    table: str,
+    cutoff: datetime,
+    batch_size: int,
+    position: Optional[Position] = None,
+) -> Tuple[int, Optional[Position]]:
+    """
+    Удалить одну пачку после позиции position и сохранить новую позицию.
+    
+    Строка task_watermarks блокируется FOR UPDATE, поэтому параллельные
+    запуски выполняют пачки по очереди. Позиция записывается в той же
+    транзакции, что и DELETE: после сбоя запуск продолжится с нее.
+    
+    Returns:
+        Tuple: (количество удаленных строк, ключ (created_at, id) последней
+            строки пачки или прежняя позиция, если пачка пуста)
+    """
+    with engine.begin() as connection:
+        connection.execute(
+            text("SELECT name FROM task_watermarks WHERE name = :name FOR UPDATE"),
+            {"name": RETENTION_WATERMARK},
+        )
+        
+        params = {"cutoff": cutoff, "limit": batch_size}
+        after = ""
+        if position is not None:
+            params.update(last_created_at=position[0], last_id=position[1])
+            # created_at >= ... позволяет планировщику начать с позиции в индексе
+            after = (
+                "AND created_at >= :last_created_at "
+                "AND (created_at, id) > (:last_created_at, CAST(:last_id AS uuid)) "
+            )
+        
+        row = connection.execute(
+            text(
+                "WITH batch AS ("
+                f"SELECT id, created_at FROM {table} "
+                f"WHERE created_at < :cutoff {after}"
+                "ORDER BY created_at, id LIMIT :limit"
+                "), deleted AS ("
+                f"DELETE FROM {table} p USING batch "
+                "WHERE p.id = batch.id AND p.created_at = batch.created_at "
+                "RETURNING p.id"
+                ") "
+                "SELECT (SELECT count(*) FROM deleted) AS deleted, last.created_at, last.id "
+                "FROM (SELECT created_at, id FROM batch "
+                "ORDER BY created_at DESC, id DESC LIMIT 1) last"
+            ),
+            params,
+        ).first()
+        if row is None:
+            return 0, position
+        
+        connection.execute(
+            text(
+                "UPDATE task_watermarks SET watermark = :created_at, "
+                "details = CAST(:details AS json), updated_at = now() WHERE name = :name"
+            ),
+            {
+                "name": RETENTION_WATERMARK,
+                "created_at": row.created_at,
+                "details": json.dumps({
+                    "table": table,
+                    "cutoff": cutoff.isoformat(),
+                    "last_id": str(row.id),
+                    "completed": False,
+                }),
+            },
+        )
+        return int(row.deleted), (row.created_at, str(row.id))
@@ -0,0 +1,170 @@
+"""
+Statistics Rollups
+
+Инкрементальное обновление почасовой статистики предсказаний.
+Каждый запуск агрегирует только строки predictions, вставленные после
+сохраненного водяного знака, и добавляет их к таблице prediction_stats_hourly.
+
+Окно выбирается по inserted_at (время INSERT, назначается БД), а корзина
+часа - по created_at. created_at приложение задает в начале запроса, до
+инференса и коммита, поэтому строка может появиться в таблице намного
+позже своего created_at: окно по created_at такие строки пропускало.
+Верхняя граница окна не заходит за начало незавершенных пишущих
+транзакций: их строки, закоммиченные позже, попадут в следующее окно.
+
+Строки суммируются с весом sample_weight: нетоксичные предсказания
+сохраняются выборочно (persistence.benign_sample_rate), и count - оценка
+числа всех предсказаний, а не только сохраненных строк.
+
+Паттерны:
+- Materialized Rollup Pattern
+- Watermark (инкрементальная обработка)
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+STATS_WATERMARK = "prediction_stats_hourly"
+
+# Количество корзин гистограммы toxicity_score на отрезке [0, 1]
+SCORE_BUCKETS = 10
+
+
+def refresh_hourly_stats(connection: Connection, lag_seconds: int = 60) -> int:
+    """
+    Добавить к rollup таблице предсказания, вставленные после водяного знака.
+    
+    Обрабатывается окно inserted_at в (watermark, upper], где upper -
+    now() - lag_seconds, но не позже начала самой старой незавершенной
+    пишущей транзакции (oldest_write_transaction_start). inserted_at
+    назначается в момент INSERT, а строка становится видна только после
+    коммита: без этой границы строки транзакции, закоммиченной позже, чем
+    через lag_seconds после INSERT, оказались бы за уже сдвинутым водяным
+    знаком и не попали бы в статистику. Граница окна берется по часам БД,
+    как и inserted_at.
+    
+    Строки без inserted_at (вставлены до его появления) учитываются первым
+    запуском, пока водяного знака нет. Строка водяного знака блокируется
+    FOR UPDATE, поэтому параллельные запуски выполняются последовательно
+    и не посчитают одни и те же строки дважды. Вызывать внутри транзакции.
+    
+    Args:
+        connection: Синхронное подключение SQLAlchemy (внутри транзакции)
+        lag_seconds: Отставание верхней границы окна от текущего времени
+    
+    Returns:
+        int: Количество обновленных строк rollup таблицы
+    """
+    connection.execute(
+        text(
+            "INSERT INTO task_watermarks (name, watermark, details, updated_at) "
+            "VALUES (:name, NULL, '{}', now()) ON CONFLICT (name) DO NOTHING"
+        ),
+        {"name": STATS_WATERMARK},
+    )
+    lower = connection.execute(
+        text("SELECT watermark FROM task_watermarks WHERE name = :name FOR UPDATE"),
+        {"name": STATS_WATERMARK},
+    ).scalar()
+    upper = connection.execute(
+        text("SELECT clock_timestamp() - make_interval(secs => CAST(:lag AS double precision))"),
+        {"lag": lag_seconds},
+    ).scalar()
+    oldest_write = oldest_write_transaction_start(connection)
+    if oldest_write is not None:
+        # Строки этой транзакции получат inserted_at >= ее начала
+        upper = min(upper, oldest_write - timedelta(microseconds=1))
+    
+    if lower is not None and lower >= upper:
+        return 0
+    
+    params = {"upper": upper}
+    if lower is None:
+        window = "(inserted_at <= :upper OR inserted_at IS NULL)"
+    else:
+        params["lower"] = lower
+        window = "inserted_at > :lower AND inserted_at <= :upper"
+    result = connection.execute(
+        text(
+            "INSERT INTO prediction_stats_hourly "
+            "(hour, toxicity_level, model_version, score_bucket, count, sum_processing_time_ms) "
+            "SELECT date_trunc('hour', created_at), toxicity_level, model_version, "
+            f"LEAST(floor(toxicity_score * {SCORE_BUCKETS})::int, {SCORE_BUCKETS - 1}), "
+            "sum(sample_weight), sum(sample_weight * processing_time_ms) "
+            f"FROM predictions WHERE {window} "
+            "GROUP BY 1, 2, 3, 4 "
+            "ON CONFLICT (hour, toxicity_level, model_version, score_bucket) DO UPDATE SET "
+            "count = prediction_stats_hourly.count + EXCLUDED.count, "
+            "sum_processing_time_ms = prediction_stats_hourly.sum_processing_time_ms "
+            "+ EXCLUDED.sum_processing_time_ms"
+        ),
+        params,
+    )
+    connection.execute(
+        text(
+            "UPDATE task_watermarks SET watermark = :upper, updated_at = now() "
+            "WHERE name = :name"
+        ),
+        {"name": STATS_WATERMARK, "upper": upper},
+    )
+    
+    logger.info(
+        "Hourly stats refreshed",
+        window_from=str(lower),
+        window_to=str(upper),
+        oldest_write_transaction=str(oldest_write),
+        rollup_rows=result.rowcount,
+    )
+    return result.rowcount
+
+
+def oldest_write_transaction_start(connection: Connection) -> Optional[datetime]:
+    """
+    Начало самой старой незавершенной пишущей транзакции в текущей БД.
+    
+    Транзакция считается пишущей, если ей уже назначен xid (backend_xid),
+    т.е. она что-то изменила; транзакции без xid еще ничего не вставили, и
+    их будущие строки получат inserted_at позже текущего момента.
+    Собственная транзакция не учитывается. Роль задачи должна видеть
+    backend_xid сессий приложения в pg_stat_activity (та же роль или
+    pg_read_all_stats); иначе окно ограничено только lag_seconds.
+    
+    Args:
+        connection: Синхронное подключение SQLAlchemy
+    
+    Returns:
+        Optional[datetime]: xact_start или None, если таких транзакций нет
+    """
+    return connection.execute(
+        text(
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND backend_xid IS NOT NULL "
+            "AND pid <> pg_backend_pid()"
+        )
+    ).scalar()
+
+
+def finalize_stats_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Привести накопленные взвешенные суммы к строке почасовой статистики.
+    
+    Среднее время обработки считается по взвешенным суммам, count и
+    гистограмма округляются до целых (веса выборки дробные).
+    
+    Args:
+        item: Строка с count, sum_processing_time_ms и score_histogram
+    
+    Returns:
+        Dict[str, Any]: Строка с mean_processing_time_ms вместо суммы
+    """
+    sum_ms = item.pop("sum_processing_time_ms")
+    item["mean_processing_time_ms"] = sum_ms / item["count"] if item["count"] else 0.0
+    item["count"] = round(item["count"])
+    item["score_histogram"] = [round(value) for value in item["score_histogram"]]
+    return item
@@ -10,13 +10,92 @@ Celery Background Tasks
 - Job Pattern
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from celery import chord, group
+from celery.signals import worker_process_init
 import structlog
 
+from application.services import ModelService, TextPreprocessingService
+from configs.config import load_configs
+from domain.value_objects import ToxicityLevel
 from infrastructure.celery_app import celery_app
+from infrastructure.database import get_sync_engine
+from infrastructure.jobs import JobStore
+from infrastructure.partitioning import (
+    drop_expired_partitions,
+    ensure_partitions,
+    unpartitioned_rows_table,
+)
+from infrastructure.retention import delete_expired_rows
+from infrastructure.rollups import refresh_hourly_stats
 
 logger = structlog.get_logger(__name__)
 
+config = load_configs()
+retention_config = config.get("retention", {})
+stats_config = config.get("stats", {})
+jobs_config = config.get("jobs", {})
+
+# Модель и хранилище заданий процесса воркера (создаются в worker_process_init)
+_model_service: Optional[ModelService] = None
+_job_store: Optional[JobStore] = None
+
+
+def get_model_service() -> ModelService:
+    """
+    Получить загруженную модель процесса воркера.
+    
+    Обычно модель уже загружена в worker_process_init; ленивая загрузка
+    нужна для пулов без дочерних процессов (solo, threads) и eager режима.
+    
+    Returns:
+        ModelService: Сервис модели с загруженными весами
+    """
+    global _model_service
+    if _model_service is None:
+        service = ModelService(preprocessor=TextPreprocessingService())
+        service.load()
+        _model_service = service
+    return _model_service
+
+
+def get_job_store() -> JobStore:
+    """Получить хранилище прогресса заданий процесса воркера."""
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
+
+
+@worker_process_init.connect
+def load_worker_model(**kwargs: Any) -> None:
+    """
+    Загрузить модель один раз при старте процесса воркера.
+    
+    Число потоков torch ограничивается (jobs.worker_torch_threads):
+    параллелизм дают процессы prefork пула, и потоки каждого процесса
+    не должны конкурировать за одни и те же ядра.
+    """
+    import torch
+    
+    torch.set_num_threads(int(jobs_config.get("worker_torch_threads") or 1))
+    get_model_service()
+    logger.info("Worker model loaded", torch_threads=torch.get_num_threads())
+
+
+def _score_rows(texts: List[str], offset: int = 0) -> List[Dict[str, Any]]:
+    """Оценить тексты одним проходом модели и вернуть строки результатов."""
+    scores = get_model_service().predict_batch_sync(texts)
+    return [
+        {
+            "index": offset + i,
+            "toxicity_score": toxicity_score,
+            "toxicity_level": ToxicityLevel.from_score(toxicity_score).value,
+            "confidence": confidence,
+        }
+        for i, (toxicity_score, confidence) in enumerate(scores)
+    ]
+
 
 @celery_app.task(name="predict_text_async", bind=True, max_retries=3)
 def predict_text_async(self, text: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -39,13 +118,14 @@ def predict_text_async(self, text: str, metadata: Dict[str, Any] = None) -> Dict
     try:
         logger.info("Processing async prediction task", text_length=len(text))
         
-        # Здесь можно использовать синхронную версию модели
-        # или создать отдельный сервис для Celery задач
-        
-        # Пример результата (в реальности здесь будет вызов модели)
+        row = _score_rows([text])[0]
         result = {
             "text": text,
-            "toxicity_score": 0.5,  # Заглушка
+            "toxicity_score": row["toxicity_score"],
+            "toxicity_level": row["toxicity_level"],
+            "confidence": row["confidence"],
+            "model_version": get_model_service().get_model_version(),
+            "metadata": metadata or {},
             "status": "completed",
         }
         
@@ -58,49 +138,195 @@ def predict_text_async(self, text: str, metadata: Dict[str, Any] = None) -> Dict
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
 
-@celery_app.task(name="batch_predict")
-def batch_predict(texts: list[str]) -> list[Dict[str, Any]]:
+@celery_app.task(name="predict_chunk", acks_late=True)
+def predict_chunk(
+    texts: List[str], offset: int = 0, job_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Оценить чанк текстов одним векторизованным проходом модели.
+    
+    Если задача - часть задания (job_id), итог чанка (оценен или упал)
+    записывается в JobStore по offset: повторная доставка чанка после
+    сбоя воркера не учитывается в прогрессе дважды.
+    
+    Сообщение подтверждается после выполнения (acks_late): вместе с
+    prefetch 1 процесс bulk воркера держит только выполняемый чанк.
+    
+    Args:
+        texts: Тексты чанка
+        offset: Индекс первого текста чанка во всем задании
+        job_id: Идентификатор задания (None - задача вне задания)
+        
+    Returns:
+        List[Dict[str, Any]]: {"index", "toxicity_score", "toxicity_level", "confidence"}
+            для каждого текста в порядке входа
+    """
+    try:
+        rows = _score_rows(texts, offset)
+    except Exception as exc:
+        logger.error(
+            "Chunk prediction failed", job_id=job_id, offset=offset, error=str(exc), exc_info=True
+        )
+        if job_id is not None:
+            get_job_store().record(job_id, offset, failed=True)
+        raise
+    
+    if job_id is not None:
+        get_job_store().record(job_id, offset)
+    return rows
+
+
+@celery_app.task(name="batch_predict", bind=True)
+def batch_predict(self, texts: list[str], chunk_size: Optional[int] = None) -> list[Dict[str, Any]]:
     """
     Батч обработка текстов.
     
-    Обрабатывает список текстов параллельно.
+    Делит тексты на чанки и заменяет себя chord: чанки (predict_chunk)
+    оцениваются параллельно на всех воркерах, каждый одним векторизованным
+    проходом модели, а merge_chunk_results собирает результаты в порядке
+    входа. Задача не ждет подзадачи через .get() и не занимает слот
+    воркера: результат batch_predict - результат chord.
     
     Args:
         texts: Список текстов для обработки
+        chunk_size: Размер чанка (по умолчанию jobs.chunk_size)
         
     Returns:
-        list[Dict[str, Any]]: Список результатов
+        list[Dict[str, Any]]: {"index", "toxicity_score", "toxicity_level", "confidence"}
+            для каждого текста в порядке входа
     """
-    logger.info("Starting batch prediction", count=len(texts))
+    if not texts:
+        return []
+    
+    size = int(chunk_size or jobs_config.get("chunk_size") or 250)
+    chunks = [
+        predict_chunk.s(texts[offset:offset + size], offset)
+        for offset in range(0, len(texts), size)
+    ]
+    logger.info("Starting batch prediction", count=len(texts), chunks=len(chunks))
     
-    results = []
-    for text in texts:
-        result = predict_text_async.apply_async(args=[text]).get()
-        results.append(result)
+    return self.replace(chord(group(chunks), merge_chunk_results.s()))
+
+
+@celery_app.task(name="merge_chunk_results")
+def merge_chunk_results(chunks: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Собрать результаты чанков batch_predict в один список.
     
-    logger.info("Batch prediction completed", count=len(results))
+    Args:
+        chunks: Результаты predict_chunk в порядке чанков
+        
+    Returns:
+        List[Dict[str, Any]]: Результаты всех текстов в порядке входа
+    """
+    results = [row for chunk in chunks for row in chunk]
+    results.sort(key=lambda row: row["index"])
+    logger.info("Batch prediction completed", count=len(results), chunks=len(chunks))
     return results
 
 
+@celery_app.task(name="maintain_prediction_partitions")
+def maintain_prediction_partitions(days_ahead: Optional[int] = None) -> int:
+    """
+    Задача создания будущих партиций таблицы predictions.
+    
+    Запускается по расписанию через Celery Beat и заранее создает
+    суточные партиции, чтобы вставка не упиралась в отсутствующую партицию.
+    
+    Args:
+        days_ahead: На сколько дней вперед создавать партиции
+        
+    Returns:
+        int: Количество партиций в окне (существующих и созданных)
+    """
+    if days_ahead is None:
+        days_ahead = int(retention_config.get("partition_premake_days", 14))
+    
+    with get_sync_engine().begin() as connection:
+        names = ensure_partitions(connection, days_ahead=days_ahead)
+    
+    return len(names)
+
+
 @celery_app.task(name="cleanup_old_predictions")
-def cleanup_old_predictions(days_old: int = 30) -> int:
+def cleanup_old_predictions(days_old: Optional[int] = None) -> int:
     """
     Задача очистки старых предсказаний из БД.
     
-    Удаляет предсказания старше указанного количества дней.
-    Может быть запущена по расписанию через Celery Beat.
+    Удаляет предсказания старше указанного количества дней через
+    DETACH + DROP суточных партиций. В отличие от DELETE не создает
+    мертвых строк, не нагружает vacuum и не держит долгих блокировок.
+    Граница срока округляется до начала суток, поэтому партиция на
+    границе остается целиком до следующего запуска. Строки вне суточных
+    партиций (DEFAULT партиция или таблица без партиционирования, например
+    созданная Database.create_tables) удаляются пачками с паузами
+    (см. infrastructure/retention.py), не дольше
+    retention.delete_max_runtime_seconds за запуск; если таких строк
+    быть не может, этот шаг пропускается. Запускается по расписанию через
+    Celery Beat.
     
     Args:
-        days_old: Количество дней для хранения
+        days_old: Количество дней для хранения (по умолчанию из конфига)
         
     Returns:
-        int: Количество удаленных записей
+        int: Количество удаленных записей (для партиций - оценка по статистике)
     """
+    if days_old is None:
+        days_old = int(retention_config.get("predictions_days", 30))
+    
     logger.info("Starting cleanup of old predictions", days_old=days_old)
     
-    # Здесь будет логика удаления старых записей из БД
-    # Для примера возвращаем 0
+    # DETACH PARTITION CONCURRENTLY нельзя выполнять внутри транзакции
+    engine = get_sync_engine().execution_options(isolation_level="AUTOCOMMIT")
+    with engine.connect() as connection:
+        dropped = drop_expired_partitions(connection, retention_days=days_old)
+        table = unpartitioned_rows_table(connection)
+    
+    partition_rows = sum(partition.estimated_rows for partition in dropped)
     
-    logger.info("Cleanup completed")
-    return 0
+    run = None
+    if table is not None:
+        max_rows_per_second = float(retention_config.get("delete_max_rows_per_second") or 0)
+        run = delete_expired_rows(
+            get_sync_engine(),
+            retention_days=days_old,
+            table=table,
+            batch_size=int(retention_config.get("delete_batch_size") or 5000),
+            pause_seconds=float(retention_config.get("delete_pause_ms") or 0) / 1000,
+            max_rows_per_second=max_rows_per_second or None,
+            max_runtime_seconds=float(retention_config.get("delete_max_runtime_seconds") or 600),
+        )
+    deleted_rows = run.deleted_rows if run else 0
+    
+    logger.info(
+        "Cleanup completed",
+        dropped_partitions=len(dropped),
+        estimated_partition_rows=partition_rows,
+        rows_table=table,
+        deleted_rows=deleted_rows,
+        rows_per_second=round(run.rows_per_second, 1) if run else None,
+        completed=run.completed if run else True,
+    )
+    return partition_rows + deleted_rows
+
 
+@celery_app.task(name="refresh_prediction_stats")
+def refresh_prediction_stats(lag_seconds: Optional[int] = None) -> int:
+    """
+    Задача инкрементального обновления почасовой статистики.
+    
+    Агрегирует только предсказания, созданные после водяного знака
+    предыдущего запуска, и добавляет их к таблице prediction_stats_hourly.
+    Запускается по расписанию через Celery Beat.
+    
+    Args:
+        lag_seconds: Отставание окна от текущего времени (по умолчанию из конфига)
+        
+    Returns:
+        int: Количество обновленных строк rollup таблицы
+    """
+    if lag_seconds is None:
+        lag_seconds = int(stats_config.get("refresh_lag_seconds", 60))
+    
+    with get_sync_engine().begin() as connection:
+        return refresh_hourly_stats(connection, lag_seconds=lag_seconds)
@@ -0,0 +1,167 @@
+"""
+Text Storage Codec
+
+Кодирование текста предсказания для хранения в таблице predictions.
+Поддерживает три режима хранения:
+- plain: текст как есть в колонке text
+- zstd: текст, сжатый zstd, в колонке text_compressed (bytea)
+- hash_only: только SHA-256 хеш и длина текста (режим приватности)
+
+Во всех режимах сохраняются text_hash и text_length, поэтому поиск
+по тексту работает через индекс по хешу независимо от режима.
+Декодирование определяется тем, какие колонки заполнены, поэтому
+строки, записанные в разных режимах, читаются одинаково.
+
+Паттерны:
+- Codec Pattern
+- Strategy Pattern (режим хранения)
+"""
+
+import hashlib
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd нужен только для режима zstd и чтения сжатых строк
+    zstandard = None
+
+
+class TextStorageMode(str, Enum):
+    """Режим хранения текста предсказания."""
+    PLAIN = "plain"
+    ZSTD = "zstd"
+    HASH_ONLY = "hash_only"
+
+
+@dataclass(frozen=True)
+class EncodedText:
+    """
+    Представление текста для записи в БД.
+    
+    Attributes:
+        text: Исходный текст (только в режиме plain)
+        compressed: Сжатый zstd текст (только в режиме zstd)
+        text_hash: SHA-256 хеш текста (hex)
+        text_length: Длина текста в символах
+    """
+    text: Optional[str]
+    compressed: Optional[bytes]
+    text_hash: str
+    text_length: int
+
+
+def text_hash(text: str) -> str:
+    """
+    SHA-256 хеш текста (hex) для индексации по тексту.
+    
+    Args:
+        text: Исходный текст
+    
+    Returns:
+        str: Hex-строка хеша
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_placeholder(digest: str) -> str:
+    """
+    Текст-заглушка для строк, сохраненных в режиме hash_only.
+    
+    Args:
+        digest: SHA-256 хеш текста (hex)
+    
+    Returns:
+        str: Заглушка вида [sha256:<hash>]
+    """
+    return f"[sha256:{digest}]"
+
+
+class TextCodec:
+    """
+    Кодек текста предсказаний.
+    
+    Режим влияет только на запись: decode читает любую строку по
+    заполненным колонкам, поэтому режим можно менять без миграции данных.
+    
+    Args:
+        mode: Режим хранения (plain, zstd, hash_only)
+        level: Уровень сжатия zstd (1-22)
+    """
+    
+    def __init__(self, mode: Optional[str] = None, level: Optional[int] = None):
+        """
+        Инициализация кодека.
+        
+        Args:
+            mode: Режим хранения (по умолчанию plain)
+            level: Уровень сжатия zstd (по умолчанию 3)
+        
+        Raises:
+            ValueError: Если режим неизвестен
+            RuntimeError: Если для режима zstd не установлен пакет zstandard
+        """
+        self.mode = TextStorageMode(mode or TextStorageMode.PLAIN)
+        self.level = int(level or 3)
+        self._compressor = None
+        self._decompressor = None
+        
+        if self.mode == TextStorageMode.ZSTD:
+            self._compressor = _require_zstd().ZstdCompressor(level=self.level)
+    
+    def encode(self, text: str) -> EncodedText:
+        """
+        Закодировать текст для записи в БД.
+        
+        Args:
+            text: Исходный текст
+        
+        Returns:
+            EncodedText: Значения колонок text, text_compressed, text_hash, text_length
+        """
+        digest = text_hash(text)
+        if self.mode == TextStorageMode.ZSTD:
+            return EncodedText(
+                text=None,
+                compressed=self._compressor.compress(text.encode("utf-8")),
+                text_hash=digest,
+                text_length=len(text),
+            )
+        if self.mode == TextStorageMode.HASH_ONLY:
+            return EncodedText(text=None, compressed=None, text_hash=digest, text_length=len(text))
+        return EncodedText(text=text, compressed=None, text_hash=digest, text_length=len(text))
+    
+    def decode(
+        self,
+        text: Optional[str],
+        compressed: Optional[bytes],
+        digest: Optional[str],
+    ) -> str:
+        """
+        Восстановить текст из колонок строки.
+        
+        Args:
+            text: Значение колонки text
+            compressed: Значение колонки text_compressed
+            digest: Значение колонки text_hash
+        
+        Returns:
+            str: Исходный текст или заглушка для режима hash_only
+        """
+        if text is not None:
+            return text
+        if compressed is not None:
+            if self._decompressor is None:
+                self._decompressor = _require_zstd().ZstdDecompressor()
+            return self._decompressor.decompress(compressed).decode("utf-8")
+        return hash_placeholder(digest or "")
+
+
+def _require_zstd():
+    """Вернуть модуль zstandard или сообщить, как его установить."""
+    if zstandard is None:
+        raise RuntimeError(
+            "zstd text storage requires the 'zstandard' package: pip install zstandard"
+        )
+    return zstandard
@@ -47,19 +47,10 @@ def get_url() -> str:
     Returns:
         str: Database URL для подключения
     """
-    from configs.config import load_configs
-    
-    cfg = load_configs()
-    db_config = cfg.get("database", {})
-    
-    user = db_config.get("user", "nlp_user")
-    password = db_config.get("password", "nlp_password")
-    host = db_config.get("host", "localhost")
-    port = db_config.get("port", 5432)
-    db_name = db_config.get("db", "nlp_db")
+    from infrastructure.database import get_database_url
     
     # Alembic работает с sync SQLAlchemy, используем psycopg2
-    return f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
+    return get_database_url(async_driver=False)
 
 
 def run_migrations_offline() -> None:
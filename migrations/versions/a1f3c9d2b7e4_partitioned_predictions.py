@@ -0,0 +1,88 @@
+"""Partition predictions table by created_at
+
+Revision ID: a1f3c9d2b7e4
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+Создает таблицу predictions, партиционированную по диапазону created_at
+(суточные партиции). Если таблица уже была создана без партиционирования
+(например, через Database.create_tables), данные переносятся в новую таблицу.
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from infrastructure.partitioning import ensure_partitions
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a1f3c9d2b7e4"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_DAYS = 14
+
+
+def _create_partitioned_table() -> None:
+    op.execute(
+        """
+        CREATE TABLE predictions (
+            id UUID NOT NULL,
+            text TEXT NOT NULL,
+            toxicity_score DOUBLE PRECISION NOT NULL,
+            toxicity_level VARCHAR(50) NOT NULL,
+            model_version VARCHAR(50) NOT NULL,
+            confidence DOUBLE PRECISION NOT NULL DEFAULT 1.0,
+            processing_time_ms DOUBLE PRECISION NOT NULL,
+            metadata JSON,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index("ix_predictions_created_at", "predictions", ["created_at"])
+    op.create_index("ix_predictions_toxicity_level", "predictions", ["toxicity_level"])
+    op.create_index("ix_predictions_text", "predictions", ["text"], postgresql_using="hash")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    legacy_exists = sa.inspect(bind).has_table("predictions")
+
+    if legacy_exists:
+        op.rename_table("predictions", "predictions_legacy")
+        # Имена индексов уникальны в схеме, освобождаем их для новой таблицы
+        op.execute(
+            "ALTER TABLE predictions_legacy "
+            "RENAME CONSTRAINT predictions_pkey TO predictions_legacy_pkey"
+        )
+        for index in sa.inspect(bind).get_indexes("predictions_legacy"):
+            op.drop_index(index["name"], table_name="predictions_legacy")
+
+    _create_partitioned_table()
+
+    today = datetime.now(timezone.utc).date()
+    start = today
+    if legacy_exists:
+        oldest = bind.execute(sa.text("SELECT min(created_at) FROM predictions_legacy")).scalar()
+        if oldest is not None:
+            start = min(start, oldest.astimezone(timezone.utc).date())
+
+    ensure_partitions(bind, days_ahead=(today - start).days + PREMAKE_DAYS, start=start)
+
+    if legacy_exists:
+        op.execute(
+            "INSERT INTO predictions "
+            "SELECT id, text, toxicity_score, toxicity_level, model_version, confidence, "
+            "processing_time_ms, metadata, created_at FROM predictions_legacy"
+        )
+        op.drop_table("predictions_legacy")
+
+
+def downgrade() -> None:
+    # Партиции удаляются вместе с родительской таблицей
+    op.drop_table("predictions")
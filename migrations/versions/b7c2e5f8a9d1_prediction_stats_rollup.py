@@ -0,0 +1,46 @@
+"""Add hourly prediction stats rollup and task watermarks
+
+Revision ID: b7c2e5f8a9d1
+Revises: a1f3c9d2b7e4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c2e5f8a9d1"
+down_revision: Union[str, None] = "a1f3c9d2b7e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "prediction_stats_hourly",
+        sa.Column("hour", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("toxicity_level", sa.String(length=50), nullable=False),
+        sa.Column("model_version", sa.String(length=50), nullable=False),
+        sa.Column("score_bucket", sa.Integer(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("sum_processing_time_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("hour", "toxicity_level", "model_version", "score_bucket"),
+    )
+    op.create_table(
+        "task_watermarks",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_watermarks")
+    op.drop_table("prediction_stats_hourly")
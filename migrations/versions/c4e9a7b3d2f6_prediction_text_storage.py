@@ -0,0 +1,120 @@
+"""Add compressed / hash-only text storage columns to predictions
+
+Revision ID: c4e9a7b3d2f6
+Revises: b7c2e5f8a9d1
+Create Date: 2026-10-18 15:00:00.000000
+
+text_hash и text_length существующих строк заполняются пачками по
+(created_at, id) вне транзакции миграции: каждая пачка коммитится
+отдельно, и блокировки строк не держатся до конца миграции.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e9a7b3d2f6"
+down_revision: Union[str, None] = "b7c2e5f8a9d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    # ALTER на партиционированной таблице применяется ко всем партициям
+    op.add_column("predictions", sa.Column("text_compressed", sa.LargeBinary(), nullable=True))
+    op.add_column("predictions", sa.Column("text_hash", sa.String(length=64), nullable=True))
+    op.add_column("predictions", sa.Column("text_length", sa.Integer(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        _backfill_text_hash(op.get_bind())
+
+    op.alter_column("predictions", "text_hash", nullable=False)
+    op.alter_column("predictions", "text_length", nullable=False)
+    op.alter_column("predictions", "text", nullable=True)
+
+    # Поиск по тексту идет через хеш, hash индекс по самому тексту больше не нужен
+    op.create_index("ix_predictions_text_hash", "predictions", ["text_hash"])
+    op.drop_index("ix_predictions_text", table_name="predictions")
+
+
+def _backfill_text_hash(bind) -> None:
+    """Заполнить text_hash и text_length пачками по ключу (created_at, id)."""
+    position = None
+    while True:
+        params = {"limit": BATCH_SIZE}
+        after = "TRUE"
+        if position is not None:
+            after = "(created_at, id) > (:after_created_at, :after_id)"
+            params.update(after_created_at=position[0], after_id=position[1])
+
+        # Последний ключ следующей пачки; пачка - строки в (position, last]
+        last = bind.execute(
+            sa.text(
+                "SELECT created_at, id FROM ("
+                f"SELECT created_at, id FROM predictions WHERE {after} "
+                "ORDER BY created_at, id LIMIT :limit"
+                ") AS batch ORDER BY created_at DESC, id DESC LIMIT 1"
+            ),
+            params,
+        ).first()
+        if last is None:
+            return
+
+        params.update(last_created_at=last[0], last_id=last[1])
+        bind.execute(
+            sa.text(
+                "UPDATE predictions SET "
+                "text_hash = encode(sha256(convert_to(text, 'UTF8')), 'hex'), "
+                "text_length = char_length(text) "
+                f"WHERE text_hash IS NULL AND {after} "
+                "AND (created_at, id) <= (:last_created_at, :last_id)"
+            ),
+            params,
+        )
+        position = last
+
+
+def downgrade() -> None:
+    from infrastructure.text_codec import TextCodec
+
+    bind = op.get_bind()
+    codec = TextCodec()
+
+    # Вернуть текст строкам, записанным в режиме zstd. Строки читаются
+    # серверным курсором пачками (yield_per), а не загружаются в память целиком
+    result = bind.execute(
+        sa.text(
+            "SELECT id, created_at, text_compressed FROM predictions "
+            "WHERE text IS NULL AND text_compressed IS NOT NULL"
+        ).execution_options(yield_per=BATCH_SIZE)
+    )
+    update = sa.text(
+        "UPDATE predictions SET text = :text WHERE id = :id AND created_at = :created_at"
+    )
+    for rows in result.partitions():
+        bind.execute(
+            update,
+            [
+                {
+                    "text": codec.decode(None, compressed, None),
+                    "id": prediction_id,
+                    "created_at": created_at,
+                }
+                for prediction_id, created_at, compressed in rows
+            ],
+        )
+    # Для режима hash_only исходный текст восстановить нельзя
+    # (та же заглушка, что в hash_placeholder)
+    op.execute("UPDATE predictions SET text = '[sha256:' || text_hash || ']' WHERE text IS NULL")
+
+    op.create_index("ix_predictions_text", "predictions", ["text"], postgresql_using="hash")
+    op.drop_index("ix_predictions_text_hash", table_name="predictions")
+    op.alter_column("predictions", "text", nullable=False)
+    op.drop_column("predictions", "text_length")
+    op.drop_column("predictions", "text_hash")
+    op.drop_column("predictions", "text_compressed")
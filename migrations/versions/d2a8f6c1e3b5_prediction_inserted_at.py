@@ -0,0 +1,49 @@
+"""Add DB-assigned inserted_at to predictions for the stats rollup window
+
+Revision ID: d2a8f6c1e3b5
+Revises: c4e9a7b3d2f6
+Create Date: 2026-10-19 10:00:00.000000
+
+Окно инкрементального rollup (infrastructure/rollups.py) раньше шло по
+created_at, который приложение задает до инференса и коммита. Новая колонка
+inserted_at заполняется БД в момент INSERT (clock_timestamp()).
+
+Колонка добавляется без значения по умолчанию для существующих строк
+(NULL - уже учтены в rollup), затем задается DEFAULT для новых строк.
+Строкам, которые rollup еще не обработал (created_at после водяного знака),
+inserted_at заполняется из created_at, чтобы следующий запуск их учел.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a8f6c1e3b5"
+down_revision: Union[str, None] = "c4e9a7b3d2f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ADD COLUMN без DEFAULT не переписывает партиции
+    op.add_column(
+        "predictions", sa.Column("inserted_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.alter_column("predictions", "inserted_at", server_default=sa.text("clock_timestamp()"))
+
+    # Строки после водяного знака статистики еще не учтены. Если rollup еще не
+    # запускался (водяного знака нет), первый запуск учтет и строки с NULL (см. rollups.py)
+    op.execute(
+        "UPDATE predictions SET inserted_at = created_at "
+        "WHERE inserted_at IS NULL AND created_at > ("
+        "SELECT watermark FROM task_watermarks WHERE name = 'prediction_stats_hourly')"
+    )
+    op.create_index("ix_predictions_inserted_at", "predictions", ["inserted_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_predictions_inserted_at", table_name="predictions")
+    op.drop_column("predictions", "inserted_at")
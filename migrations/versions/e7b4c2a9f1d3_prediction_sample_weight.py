@@ -0,0 +1,55 @@
+"""Add sample_weight to predictions and weight the hourly stats rollup
+
+Revision ID: e7b4c2a9f1d3
+Revises: d2a8f6c1e3b5
+Create Date: 2026-10-19 12:00:00.000000
+
+Нетоксичные предсказания сохраняются выборочно (persistence.benign_sample_rate),
+поэтому rollup по числу строк занижал статистику. Каждая строка получает вес
+sample_weight (1 / доля выборки), prediction_stats_hourly.count становится
+суммой весов (double precision), sum_processing_time_ms - взвешенной суммой.
+
+Существующие строки получают вес 1: доля выборки, с которой они сохранены,
+не записывалась.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b4c2a9f1d3"
+down_revision: Union[str, None] = "d2a8f6c1e3b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Константный DEFAULT не переписывает партиции (PostgreSQL 11+)
+    op.add_column(
+        "predictions",
+        sa.Column("sample_weight", sa.Float(), nullable=False, server_default=sa.text("1")),
+    )
+    # Rollup таблица маленькая (час x уровень x версия x корзина), смена типа дешевая
+    op.alter_column(
+        "prediction_stats_hourly",
+        "count",
+        type_=sa.Float(),
+        existing_type=sa.BigInteger(),
+        existing_nullable=False,
+        postgresql_using="count::double precision",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "prediction_stats_hourly",
+        "count",
+        type_=sa.BigInteger(),
+        existing_type=sa.Float(),
+        existing_nullable=False,
+        postgresql_using="round(count)::bigint",
+    )
+    op.drop_column("predictions", "sample_weight")
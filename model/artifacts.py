@@ -0,0 +1,120 @@
+"""
+Training Artifacts
+
+Content-addressed кеш промежуточных результатов обучения.
+
+Ключ артефакта - хеш имени стадии и всех ее входов: содержимого входных
+файлов (или ключей артефактов предыдущих стадий) и параметров. Если
+входы и параметры не изменились, ключ тот же и стадия берет готовый
+артефакт с диска; любое изменение дает новый ключ, поэтому устаревший
+артефакт никогда не используется. Артефакт появляется под своим именем
+только после полной записи (запись во временный путь + os.replace),
+поэтому прерванный запуск не оставляет битых артефактов.
+
+Паттерны:
+- Content-Addressed Storage
+- Memoization (стадии конвейера обучения)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+# Версия формата артефактов: увеличить, если меняется код стадии,
+# а не только ее входы (например, логика предобработки)
+ARTIFACTS_VERSION = 1
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 содержимого файла.
+    
+    Args:
+        path: Путь к файлу
+        chunk_size: Размер блока чтения
+    
+    Returns:
+        str: Hex дайджест
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Каталог артефактов стадий обучения.
+    
+    Args:
+        root: Каталог артефактов
+    """
+    
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+    
+    def key(self, stage: str, **inputs: Any) -> str:
+        """
+        Ключ артефакта стадии.
+        
+        Args:
+            stage: Имя стадии
+            **inputs: Входы стадии (дайджесты файлов, ключи артефактов, параметры),
+                сериализуемые в JSON
+        
+        Returns:
+            str: Ключ вида <stage>-<hash>
+        """
+        payload = json.dumps(
+            {"stage": stage, "version": ARTIFACTS_VERSION, "inputs": inputs},
+            sort_keys=True,
+            default=str,
+        )
+        return f"{stage}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]}"
+    
+    def path(self, key: str, suffix: str = "") -> str:
+        """Путь к артефакту (файлу или каталогу)."""
+        return os.path.join(self.root, f"{key}{suffix}")
+    
+    def exists(self, key: str, suffix: str = "") -> bool:
+        """Есть ли готовый артефакт."""
+        return os.path.exists(self.path(key, suffix))
+    
+    @contextmanager
+    def writing(self, key: str, suffix: str = "", directory: bool = False) -> Iterator[str]:
+        """
+        Записать артефакт атомарно.
+        
+        Блок with получает временный путь; после успешного выхода он
+        переименовывается в путь артефакта, при ошибке удаляется.
+        
+        Args:
+            key: Ключ артефакта
+            suffix: Расширение файла
+            directory: Артефакт - каталог (временный каталог создается заранее)
+        
+        Yields:
+            str: Временный путь для записи
+        """
+        final_path = self.path(key, suffix)
+        tmp_path = f"{final_path}.tmp-{os.getpid()}"
+        if directory:
+            os.makedirs(tmp_path, exist_ok=True)
+        try:
+            yield tmp_path
+            if directory and os.path.exists(final_path):
+                # Тот же артефакт уже записан параллельным запуском
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            else:
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.isdir(tmp_path):
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
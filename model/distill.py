@@ -0,0 +1,309 @@
+"""
+Knowledge Distillation
+
+Дистилляция обученного TextClassifier (учитель, TF-IDF со словарем
+биграмм) в компактного ученика на хешированных признаках
+(HashedTfidfVectorizer, по умолчанию 2^18 столбцов) с меньшим скрытым
+слоем. Размер модели учителя определяется fc1 (словарь x hidden_size),
+у ученика fc1 - n_features x --hidden-size, а векторайзер хранит только idf.
+
+Ученик обучается на мягких метках учителя (softmax логитов с температурой
+--temperature) по обучающей выборке и неразмеченным текстам (--unlabeled:
+CSV, JSONL или Parquet, как у model/score_file.py). Для размеченных строк
+к KL-дивергенции добавляется cross-entropy по истинной метке с весом
+1 - --alpha.
+
+Результат - state_dict ученика и pickle HashedTfidfVectorizer: оба
+подходят ModelService без изменений кода (MODEL_PATH, VECTORIZER_PATH).
+В конце печатается отчет по тестовой выборке: размер, задержка
+векторизации и forward на один текст, точность и согласие с учителем.
+
+Запуск:
+    python -m model.distill --unlabeled comments.jsonl --hidden-size 32
+    MODEL_PATH=./model/student.pt VECTORIZER_PATH=./model/student_vectorizer.pkl python main.py
+"""
+
+import argparse
+import io
+import pickle
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from scipy import sparse
+from torch.nn import functional as F
+from torch.optim import AdamW
+
+from configs.config import load_configs
+from model.artifacts import ArtifactStore
+from model.hashing import N_FEATURES, DocumentFrequency, HashedTfidfVectorizer, make_hasher
+from model.modeling import TextClassifier, TextPreprocessor, load_classifier
+from model.score_file import INPUT_FORMATS, detect_format, iter_records
+from model.sparse import SparseTextDataset, csr_to_torch, sparse_loader
+from model.train import (
+    BATCH_SIZE,
+    LABEL_COLUMN,
+    LEARNING_RATE,
+    TEXT_COLUMN,
+    configure_threads,
+    preprocess_stage,
+)
+
+STUDENT_HIDDEN_SIZE = 32
+TEMPERATURE = 2.0
+ALPHA = 0.7
+EPOCHS = 5
+LATENCY_RUNS = 200
+
+# Метка неразмеченной строки
+UNLABELED = -1
+
+
+class DistillationDataset(SparseTextDataset):
+    """
+    Датасет ученика: признаки и цели (логиты учителя, истинная метка или UNLABELED).
+    
+    Args:
+        features: Хешированные признаки ученика
+        targets: Матрица (строки, классы + 1): логиты учителя и метка в последнем столбце
+    """
+    
+    def __init__(self, features: sparse.spmatrix, targets: np.ndarray):
+        self.features = sparse.csr_matrix(features, dtype=np.float32)
+        self.labels = torch.as_tensor(targets, dtype=torch.float32)
+
+
+def load_corpus(store, train_csv, unlabeled_paths, text_field, unlabeled_limit, preprocessor):
+    """
+    Предобработанные тексты обучающей выборки и неразмеченных файлов.
+    
+    Returns:
+        tuple: (тексты, метки; UNLABELED для неразмеченных)
+    """
+    _, train_path = preprocess_stage(store, train_csv)
+    train_data = pd.read_parquet(train_path)
+    texts = train_data[TEXT_COLUMN].tolist()
+    labels = train_data[LABEL_COLUMN].tolist()
+    
+    for path in unlabeled_paths:
+        start = time.perf_counter()
+        count = 0
+        records = iter_records(path, detect_format(path, INPUT_FORMATS), text_field=text_field)
+        for _, text in records:
+            if unlabeled_limit and count >= unlabeled_limit:
+                break
+            texts.append(preprocessor.preprocess(text))
+            labels.append(UNLABELED)
+            count += 1
+        print(f"Unlabeled: {count} texts from {path} in {time.perf_counter() - start:.1f}s")
+    return texts, np.asarray(labels, dtype=np.int64)
+
+
+def teacher_logits(model, vectorizer, texts, batch_size=1024):
+    """Логиты учителя для предобработанных текстов."""
+    outputs = []
+    with torch.no_grad():
+        for start in range(0, len(texts), batch_size):
+            features = vectorizer.transform(texts[start:start + batch_size])
+            outputs.append(model(csr_to_torch(features)).numpy())
+    return np.concatenate(outputs)
+
+
+def fit_student_vectorizer(texts, n_features):
+    """
+    HashedTfidfVectorizer по корпусу дистилляции.
+    
+    Returns:
+        tuple: (векторайзер, TF-IDF признаки корпуса)
+    """
+    counts = make_hasher(n_features).transform(texts)
+    frequency = DocumentFrequency(n_features)
+    frequency.update(counts)
+    vectorizer = HashedTfidfVectorizer(frequency.idf())
+    return vectorizer, vectorizer.weight(counts)
+
+
+def distillation_loss(student_logits, targets, temperature, alpha):
+    """
+    alpha * T^2 * KL(учитель || ученик) при температуре T + (1 - alpha) * CE по меткам.
+    
+    CE считается только по размеченным строкам; маска вместо индексации,
+    чтобы не синхронизироваться на каждом шаге.
+    """
+    teacher = targets[:, :-1]
+    labels = targets[:, -1].long()
+    soft = F.kl_div(
+        F.log_softmax(student_logits / temperature, dim=1),
+        F.softmax(teacher / temperature, dim=1),
+        reduction="batchmean",
+    ) * temperature ** 2
+    labeled = (labels != UNLABELED).float()
+    hard = F.cross_entropy(student_logits, labels.clamp(min=0), reduction="none")
+    hard = (hard * labeled).sum() / labeled.sum().clamp(min=1)
+    return alpha * soft + (1 - alpha) * hard
+
+
+def train_student(
+    features, targets, hidden_size, learning_rate, batch_size, epochs, temperature, alpha
+):
+    """Обучить ученика на признаках features и целях targets (см. DistillationDataset)."""
+    loader = sparse_loader(
+        DistillationDataset(features, targets), batch_size=batch_size, shuffle=True
+    )
+    model = TextClassifier(
+        input_size=features.shape[1], hidden_size=hidden_size, output_size=targets.shape[1] - 1
+    )
+    optimizer = AdamW(model.parameters(), lr=learning_rate)
+    
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        model.train()
+        total_loss = torch.zeros(())
+        agreement = torch.zeros((), dtype=torch.long)
+        for texts, batch_targets in loader:
+            optimizer.zero_grad()
+            outputs = model(texts)
+            loss = distillation_loss(outputs, batch_targets, temperature, alpha)
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.detach()
+            agreement += (outputs.argmax(dim=1) == batch_targets[:, :-1].argmax(dim=1)).sum()
+        samples_per_second = features.shape[0] / (time.perf_counter() - start)
+        print(
+            f"Epoch {epoch+1}/{epochs}, "
+            f"Distillation Loss: {total_loss.item() / len(loader):.4f}, "
+            f"Teacher Agreement: {agreement.item() / features.shape[0]:.4f}, "
+            f"{samples_per_second:,.0f} samples/s"
+        )
+    return model.eval()
+
+
+def _serialized_mb(write):
+    buffer = io.BytesIO()
+    write(buffer)
+    return buffer.getbuffer().nbytes / 2 ** 20
+
+
+def _predict(model, vectorizer, texts):
+    with torch.no_grad():
+        return model(csr_to_torch(vectorizer.transform(texts))).argmax(dim=1).numpy()
+
+
+def describe(name, model, vectorizer, texts, labels, reference=None):
+    """Строка отчета: размер, задержка на один текст, точность, согласие с reference."""
+    predictions = _predict(model, vectorizer, texts)
+    latencies = []
+    for text in texts[:LATENCY_RUNS]:
+        start = time.perf_counter()
+        _predict(model, vectorizer, [text])
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "model": name,
+        "parameters": sum(parameter.numel() for parameter in model.parameters()),
+        "model_mb": _serialized_mb(lambda f: torch.save(model.state_dict(), f)),
+        "vectorizer_mb": _serialized_mb(lambda f: pickle.dump(vectorizer, f)),
+        "latency_ms_p50": statistics.median(latencies),
+        "latency_ms_p95": latencies[int(len(latencies) * 0.95)],
+        "accuracy": float((predictions == labels).mean()),
+        "teacher_agreement": (
+            float((predictions == reference).mean()) if reference is not None else 1.0
+        ),
+    }, predictions
+
+
+def main():
+    configs = load_configs()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--teacher-model", default=configs["model"]["model_path"])
+    parser.add_argument("--teacher-vectorizer", default=configs["model"]["vectorizer_path"])
+    parser.add_argument(
+        "--train-data", default=configs["data"]["train_data"], help="CSV обучающей выборки"
+    )
+    parser.add_argument("--test-data", default=configs["data"]["test_data"], help="CSV для отчета")
+    parser.add_argument(
+        "--unlabeled", nargs="*", default=[], help="Файлы с неразмеченными текстами"
+    )
+    parser.add_argument(
+        "--text-field", default="text", help="Поле текста в неразмеченных файлах"
+    )
+    parser.add_argument(
+        "--unlabeled-limit", type=int, default=0, help="Не больше строк из каждого файла (0 - все)"
+    )
+    parser.add_argument(
+        "--artifacts-dir", default=configs["model"].get("artifacts_dir") or "./model/artifacts"
+    )
+    parser.add_argument(
+        "--n-features", type=int, default=N_FEATURES, help="Столбцов хеширования ученика"
+    )
+    parser.add_argument("--hidden-size", type=int, default=STUDENT_HIDDEN_SIZE)
+    parser.add_argument("--temperature", type=float, default=TEMPERATURE)
+    parser.add_argument(
+        "--alpha", type=float, default=ALPHA, help="Вес мягких меток (1 - только учитель)"
+    )
+    parser.add_argument("--lr", type=float, default=LEARNING_RATE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op потоков torch")
+    parser.add_argument("--student-model-path", default="./model/student.pt")
+    parser.add_argument("--student-vectorizer-path", default="./model/student_vectorizer.pkl")
+    args = parser.parse_args()
+    configure_threads(args.threads)
+    
+    store = ArtifactStore(args.artifacts_dir)
+    preprocessor = TextPreprocessor()
+    teacher = load_classifier(args.teacher_model, torch.device("cpu"))
+    with open(args.teacher_vectorizer, "rb") as f:
+        teacher_vectorizer = pickle.load(f)
+    
+    texts, labels = load_corpus(
+        store, args.train_data, args.unlabeled, args.text_field, args.unlabeled_limit, preprocessor
+    )
+    start = time.perf_counter()
+    targets = np.column_stack([teacher_logits(teacher, teacher_vectorizer, texts), labels])
+    student_vectorizer, features = fit_student_vectorizer(texts, args.n_features)
+    print(
+        f"Distillation corpus: {len(texts)} texts ({(labels == UNLABELED).sum()} unlabeled), "
+        f"teacher labels and student features in {time.perf_counter() - start:.1f}s"
+    )
+    
+    student = train_student(
+        features,
+        targets,
+        args.hidden_size,
+        args.lr,
+        args.batch_size,
+        args.epochs,
+        args.temperature,
+        args.alpha,
+    )
+    torch.save(student.state_dict(), args.student_model_path)
+    with open(args.student_vectorizer_path, "wb") as f:
+        pickle.dump(student_vectorizer, f)
+    print(f"Student saved to {args.student_model_path}, {args.student_vectorizer_path}")
+    
+    _, test_path = preprocess_stage(store, args.test_data)
+    test_data = pd.read_parquet(test_path)
+    test_texts = test_data[TEXT_COLUMN].tolist()
+    test_labels = test_data[LABEL_COLUMN].to_numpy()
+    teacher_row, teacher_predictions = describe(
+        "teacher", teacher, teacher_vectorizer, test_texts, test_labels
+    )
+    student_row, _ = describe(
+        "student",
+        student,
+        student_vectorizer,
+        test_texts,
+        test_labels,
+        reference=teacher_predictions,
+    )
+    table = pd.DataFrame([teacher_row, student_row])
+    print(table.to_string(index=False, float_format=lambda value: f"{value:.4g}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,74 @@
-from configs.config import load_configs
-import torch
+"""
+Offline Inference
+
+Предсказание класса для отдельных текстов без сервиса. Модель,
+векторайзер и предобработка загружаются при первом вызове, а не
+при импорте модуля.
+
+Запуск:
+    python -m model.inference "some comment text"
+"""
+
+import argparse
 import pickle
-from model.train import TextPreprocessor
 
-configs = load_configs()
+import torch
+
+from configs.config import load_configs
+from model.modeling import TextPreprocessor, load_classifier
+from model.sparse import csr_to_torch
+
+_model = None
+_vectorizer = None
+_preprocessor = None
+
+
+def load_inference(model_path=None, vectorizer_path=None):
+    """Загрузить модель, векторайзер и предобработку (пути по умолчанию из конфига)."""
+    global _model, _vectorizer, _preprocessor
+    if model_path is None or vectorizer_path is None:
+        configs = load_configs()
+        model_path = model_path or configs["model"]["model_path"]
+        vectorizer_path = vectorizer_path or configs["model"]["vectorizer_path"]
+    
+    _model = load_classifier(model_path, torch.device("cpu"))
+    with open(vectorizer_path, "rb") as f:
+        _vectorizer = pickle.load(f)
+    _preprocessor = TextPreprocessor()
+
+
+def predict_inference(text: str) -> int:
+    """
+    Предсказать класс текста (1 - токсичный).
+    
+    Args:
+        text: Исходный текст
+    
+    Returns:
+        int: Индекс класса
+    """
+    if _model is None:
+        load_inference()
+    features = _vectorizer.transform([_preprocessor.preprocess(text)])
+    tensor = csr_to_torch(features)
+    with torch.no_grad():
+        output = _model(tensor)
+    return output.argmax(dim=1).item()
 
-model = configs["model"]["model_path"]
-vectorizer = configs["model"]["vectorizer_path"]
 
-model = torch.load(model)
-vectorizer = pickle.load(open(vectorizer, "rb"))
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("texts", nargs="+", help="Тексты для классификации")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--vectorizer-path", default=None)
+    args = parser.parse_args()
+    
+    load_inference(args.model_path, args.vectorizer_path)
+    for text in args.texts:
+        print(f"{predict_inference(text)}\t{text}")
 
-preprocessor = TextPreprocessor()
 
-def predict_inference(text: str):
-    text = preprocessor.preprocess(text)
-    text = vectorizer.transform([text])
-    text = text.toarray()
-    text = torch.tensor(text, dtype=torch.float32)
-    text = text.unsqueeze(0)
-    output = model(text)
-    output = output.argmax(dim=1)
-    return output.item()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Model Definitions
+
+Определения модели и предобработки без побочных эффектов при импорте:
+модуль не читает данные, не скачивает NLTK и не обучает модель, поэтому
+сервис импортирует классификатор за миллисекунды. NLTK импортируется
+только при создании TextPreprocessor.
+
+Используется при обучении (model/train.py), в офлайн инференсе
+(model/inference.py) и в ModelService.
+"""
+
+from typing import Any, Dict, Tuple
+
+import torch
+from torch.nn import Dropout, Linear, Module, ReLU
+from torch.nn import functional as F
+
+
+def load_nltk_resources() -> Tuple[Any, Any, Any]:
+    """
+    Загрузить стоп-слова, лемматизатор и токенизатор NLTK.
+    
+    Данные NLTK скачиваются, только если их нет локально.
+    
+    Returns:
+        Tuple[Any, Any, Any]: (стоп-слова, лемматизатор, токенизатор)
+    """
+    import nltk
+    
+    try:
+        stopwords = nltk.corpus.stopwords.words("english")
+        lemmatizer = nltk.WordNetLemmatizer()
+        lemmatizer.lemmatize("warmup")
+    except LookupError:
+        nltk.download('punkt', quiet=True)
+        nltk.download('stopwords', quiet=True)
+        nltk.download('wordnet', quiet=True)
+        stopwords = nltk.corpus.stopwords.words("english")
+        lemmatizer = nltk.WordNetLemmatizer()
+    return stopwords, lemmatizer, nltk.tokenize.RegexpTokenizer(r'\w+')
+
+
+class TextPreprocessor:
+    """Предобработка текста: нижний регистр, токенизация, стоп-слова, лемматизация."""
+    
+    def __init__(self):
+        self.stopwords, self.lemmatizer, self.tokenizer = load_nltk_resources()
+    
+    def preprocess(self, text: str) -> str:
+        text = text.lower()
+        tokens = self.tokenizer.tokenize(text)
+        tokens = [word for word in tokens if word not in self.stopwords]
+        tokens = [self.lemmatizer.lemmatize(word) for word in tokens]
+        return " ".join(tokens)
+
+
+def sparse_linear(x: torch.Tensor, linear: Linear) -> torch.Tensor:
+    """
+    Применить Linear к входу: x @ W^T + b.
+    
+    Для CSR входа результат каждой строки - сумма строк W^T по ее
+    ненулевым признакам с весами-значениями; плотный вход передается
+    в Linear как обычно.
+    
+    Args:
+        x: CSR или плотный тензор (batch, in_features)
+        linear: Слой Linear
+    
+    Returns:
+        torch.Tensor: Плотный тензор (batch, out_features)
+    """
+    if x.layout != torch.sparse_csr:
+        return linear(x)
+    output = F.embedding_bag(
+        x.col_indices(),
+        linear.weight.t(),
+        x.crow_indices()[:-1],
+        mode="sum",
+        per_sample_weights=x.values(),
+        include_last_offset=False,
+    )
+    return output + linear.bias
+
+
+class TextClassifier(Module):
+    """
+    MLP над TF-IDF признаками: fc1 -> ReLU -> Dropout -> fc2.
+    
+    Args:
+        input_size: Число признаков
+        hidden_size: Размер скрытого слоя
+        output_size: Число классов
+        dropout: Вероятность dropout скрытого слоя (на инференс не влияет)
+    """
+    
+    def __init__(self, input_size: int, hidden_size: int, output_size: int, dropout: float = 0.5):
+        super(TextClassifier, self).__init__()
+        self.fc1 = Linear(input_size, hidden_size)
+        self.fc2 = Linear(hidden_size, output_size)
+        self.relu = ReLU()
+        self.dropout = Dropout(dropout)
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        # CSR вход - gather-sum по ненулевым признакам, плотный - обычный Linear
+        x = sparse_linear(x, self.fc1)
+        x = self.relu(x)
+        x = self.dropout(x)
+        x = self.fc2(x)
+        return x
+    
+    @classmethod
+    def from_state_dict(cls, state_dict: Dict[str, torch.Tensor]) -> "TextClassifier":
+        """
+        Создать модель по state_dict (размеры слоев берутся из весов).
+        
+        Args:
+            state_dict: Веса, сохраненные model/train.py
+        
+        Returns:
+            TextClassifier: Модель с загруженными весами
+        """
+        hidden_size, input_size = state_dict["fc1.weight"].shape
+        output_size = state_dict["fc2.weight"].shape[0]
+        model = cls(input_size=input_size, hidden_size=hidden_size, output_size=output_size)
+        model.load_state_dict(state_dict)
+        return model
+
+
+def load_classifier(model_path: str, device: torch.device) -> Module:
+    """
+    Загрузить обученную модель в режиме eval.
+    
+    Args:
+        model_path: Путь к state_dict (или к целиком сохраненной модели, legacy)
+        device: Устройство
+    
+    Returns:
+        Module: Модель на устройстве device
+    """
+    checkpoint = torch.load(model_path, map_location=device)
+    if isinstance(checkpoint, dict):
+        model = TextClassifier.from_state_dict(checkpoint)
+    else:
+        model = checkpoint
+    model.eval()
+    return model.to(device)
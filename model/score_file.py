@@ -0,0 +1,467 @@
+"""
+Offline Bulk Scoring
+
+Оценка токсичности текстов из файла без HTTP API: для пересчета истории
+после обновления модели. Используется тот же ModelService и та же
+предобработка, что и в API и Celery воркерах.
+
+Входной файл читается потоково чанками (CSV, JSONL или Parquet), чанки
+оцениваются в пуле процессов (модель загружается один раз на процесс),
+результаты дописываются в выходной файл (JSONL или CSV) в порядке входа.
+В памяти одновременно не больше 2 * workers чанков, поэтому размер файла
+не ограничен объемом RAM.
+
+Прогресс сохраняется в checkpoint после каждого записанного чанка:
+число обработанных строк входа и размер выходного файла. После падения
+повторный запуск с теми же аргументами обрезает выход до последнего
+checkpoint и продолжает со следующей строки.
+
+JSONL: строка - JSON объект с текстом в --text-field и идентификатором
+в --id-field (по умолчанию "text" и "id", как в POST /api/v1/predict/stream)
+или JSON строка с текстом.
+
+Запуск:
+    python -m model.score_file input.jsonl scores.jsonl --workers 8 --chunk-size 1000
+    python -m model.score_file comments.csv scores.csv --text-field comment_text --id-field id
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+import structlog
+
+from domain.value_objects import ToxicityLevel
+
+logger = structlog.get_logger(__name__)
+
+INPUT_FORMATS = ("csv", "jsonl", "parquet")
+OUTPUT_FORMATS = ("jsonl", "csv")
+OUTPUT_FIELDS = ("id", "toxicity_score", "toxicity_level", "confidence")
+
+# Строка входа: (идентификатор, текст)
+Record = Tuple[Any, str]
+
+# Модель процесса пула (создается в _init_worker)
+_model_service = None
+
+
+def detect_format(path: str, formats: Tuple[str, ...]) -> str:
+    """
+    Определить формат файла по расширению.
+    
+    Args:
+        path: Путь к файлу
+        formats: Допустимые форматы
+    
+    Returns:
+        str: Формат
+    
+    Raises:
+        ValueError: Если расширение не соответствует ни одному формату
+    """
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    extension = {"ndjson": "jsonl", "pq": "parquet"}.get(extension, extension)
+    if extension not in formats:
+        raise ValueError(
+            f"Cannot detect format of {path}, expected one of: {', '.join(formats)}"
+        )
+    return extension
+
+
+def iter_records(
+    path: str,
+    input_format: str,
+    text_field: str = "text",
+    id_field: str = "id",
+    skip: int = 0,
+) -> Iterator[Record]:
+    """
+    Потоково прочитать (id, text) из файла.
+    
+    Строки без текста возвращаются с пустым текстом, а не пропускаются:
+    номер строки входа должен совпадать с числом строк в checkpoint.
+    Если идентификатора нет, используется номер строки (с нуля).
+    
+    Args:
+        path: Путь к файлу
+        input_format: csv, jsonl или parquet
+        text_field: Поле (колонка) с текстом
+        id_field: Поле (колонка) с идентификатором
+        skip: Количество уже обработанных строк в начале файла
+    
+    Yields:
+        Record: (идентификатор, текст)
+    """
+    if input_format == "jsonl":
+        yield from _iter_jsonl(path, text_field, id_field, skip)
+    elif input_format == "csv":
+        yield from _iter_csv(path, text_field, id_field, skip)
+    elif input_format == "parquet":
+        yield from _iter_parquet(path, text_field, id_field, skip)
+    else:
+        raise ValueError(f"Unsupported input format: {input_format}")
+
+
+def _iter_jsonl(path: str, text_field: str, id_field: str, skip: int) -> Iterator[Record]:
+    """Строки JSONL; пропущенные строки не разбираются."""
+    with open(path, "rb") as f:
+        row = 0
+        for line in f:
+            if not line.strip():
+                continue
+            if row >= skip:
+                try:
+                    value = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    value = None
+                if isinstance(value, dict):
+                    yield value.get(id_field, row), _as_text(value.get(text_field))
+                else:
+                    yield row, _as_text(value)
+            row += 1
+
+
+def _iter_csv(path: str, text_field: str, id_field: str, skip: int) -> Iterator[Record]:
+    """Строки CSV с заголовком; поля с переводами строк поддерживаются."""
+    csv.field_size_limit(sys.maxsize)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if text_field not in header:
+            raise ValueError(f"Column {text_field!r} not found in {path}")
+        text_index = header.index(text_field)
+        id_index = header.index(id_field) if id_field in header else None
+        
+        for row, values in enumerate(reader):
+            if row < skip:
+                continue
+            text = values[text_index] if text_index < len(values) else ""
+            record_id = values[id_index] if id_index is not None and id_index < len(values) else row
+            yield record_id, text
+
+
+def _iter_parquet(path: str, text_field: str, id_field: str, skip: int) -> Iterator[Record]:
+    """Row groups Parquet батчами; пропущенные батчи не материализуются."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("Parquet input requires pyarrow (pip install pyarrow)") from exc
+    
+    parquet_file = pq.ParquetFile(path)
+    names = parquet_file.schema_arrow.names
+    if text_field not in names:
+        raise ValueError(f"Column {text_field!r} not found in {path}")
+    columns = [text_field] + ([id_field] if id_field in names else [])
+    
+    row = 0
+    for batch in parquet_file.iter_batches(batch_size=10_000, columns=columns):
+        if row + batch.num_rows <= skip:
+            row += batch.num_rows
+            continue
+        texts = batch.column(text_field).to_pylist()
+        ids = batch.column(id_field).to_pylist() if id_field in names else None
+        for i, text in enumerate(texts):
+            if row >= skip:
+                yield (ids[i] if ids is not None else row), _as_text(text)
+            row += 1
+
+
+def _as_text(value: Any) -> str:
+    """Привести значение поля к тексту (None - пустой текст)."""
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def iter_chunks(records: Iterator[Record], chunk_size: int) -> Iterator[List[Record]]:
+    """Разбить поток строк на чанки."""
+    chunk: List[Record] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker(torch_threads: int) -> None:
+    """Загрузить модель в процессе пула."""
+    global _model_service
+    import torch
+    
+    from application.services import ModelService, TextPreprocessingService
+    
+    torch.set_num_threads(torch_threads)
+    _model_service = ModelService(preprocessor=TextPreprocessingService())
+    _model_service.load()
+
+
+def _score_chunk(chunk: List[Record]) -> List[Dict[str, Any]]:
+    """Оценить чанк одним векторизованным проходом модели (в процессе пула)."""
+    scores = _model_service.predict_batch_sync([text for _, text in chunk])
+    return [
+        {
+            "id": record_id,
+            "toxicity_score": toxicity_score,
+            "toxicity_level": ToxicityLevel.from_score(toxicity_score).value,
+            "confidence": confidence,
+        }
+        for (record_id, _), (toxicity_score, confidence) in zip(chunk, scores)
+    ]
+
+
+class Checkpoint:
+    """
+    Прогресс оценки файла.
+    
+    Хранит число обработанных строк входа и размер выходного файла после
+    их записи. Файл checkpoint заменяется атомарно (os.replace), а выход
+    сбрасывается на диск до него, поэтому checkpoint никогда не опережает
+    выход. Все, что записано в выход после последнего checkpoint,
+    отбрасывается при возобновлении.
+    
+    Args:
+        path: Путь к файлу checkpoint
+        input_path: Входной файл (размер и mtime проверяются при возобновлении)
+    """
+    
+    def __init__(self, path: str, input_path: str):
+        self.path = path
+        stat = os.stat(input_path)
+        self.input = {
+            "path": os.path.abspath(input_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+        self.rows_done = 0
+        self.output_bytes = 0
+    
+    def load(self) -> bool:
+        """
+        Прочитать сохраненный прогресс.
+        
+        Returns:
+            bool: True, если checkpoint найден
+        
+        Raises:
+            ValueError: Если checkpoint относится к другому или измененному входу
+        """
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "rb") as f:
+            state = orjson.loads(f.read())
+        if state.get("input") != self.input:
+            raise ValueError(
+                f"Checkpoint {self.path} belongs to a different or modified input file"
+            )
+        self.rows_done = int(state["rows_done"])
+        self.output_bytes = int(state["output_bytes"])
+        return True
+    
+    def save(self, rows_done: int, output_bytes: int) -> None:
+        """Атомарно сохранить прогресс."""
+        self.rows_done = rows_done
+        self.output_bytes = output_bytes
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            state = {"input": self.input, "rows_done": rows_done, "output_bytes": output_bytes}
+            f.write(orjson.dumps(state))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+    
+    def remove(self) -> None:
+        """Удалить checkpoint после успешного завершения."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ResultWriter:
+    """
+    Дописывание результатов в JSONL или CSV.
+    
+    Args:
+        path: Путь к выходному файлу
+        output_format: jsonl или csv
+        truncate_to: Размер, до которого обрезать существующий файл
+            (None - начать файл заново)
+    """
+    
+    def __init__(self, path: str, output_format: str, truncate_to: Optional[int] = None):
+        self.output_format = output_format
+        resume = truncate_to is not None and os.path.exists(path)
+        self._file = open(path, "r+b" if resume else "wb")
+        if resume:
+            self._file.truncate(truncate_to)
+            self._file.seek(truncate_to)
+        elif output_format == "csv":
+            self._write_csv([dict(zip(OUTPUT_FIELDS, OUTPUT_FIELDS))])
+    
+    def write(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Дописать строки и сбросить их на диск.
+        
+        Returns:
+            int: Размер файла после записи
+        """
+        if self.output_format == "csv":
+            self._write_csv(rows)
+        else:
+            self._file.write(b"".join(orjson.dumps(row, default=str) + b"\n" for row in rows))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+    
+    def close(self) -> None:
+        """Закрыть файл."""
+        self._file.close()
+    
+    def _write_csv(self, rows: List[Dict[str, Any]]) -> None:
+        """Записать строки CSV."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=OUTPUT_FIELDS, lineterminator="\n")
+        writer.writerows(rows)
+        self._file.write(buffer.getvalue().encode("utf-8"))
+
+
+def score_file(args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Оценить входной файл с возобновлением по checkpoint.
+    
+    Returns:
+        Dict[str, float]: Обработано строк в этом запуске, всего, секунд, docs/s
+    """
+    input_format = args.input_format or detect_format(args.input, INPUT_FORMATS)
+    output_format = args.output_format or detect_format(args.output, OUTPUT_FORMATS)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint", args.input)
+    
+    resumed = not args.restart and checkpoint.load()
+    if resumed and (
+        not os.path.exists(args.output) or os.path.getsize(args.output) < checkpoint.output_bytes
+    ):
+        raise ValueError(
+            f"Output {args.output} is missing or shorter than its checkpoint, use --restart"
+        )
+    if resumed:
+        logger.info(
+            "Resuming from checkpoint",
+            rows_done=checkpoint.rows_done,
+            output_bytes=checkpoint.output_bytes,
+        )
+    writer = ResultWriter(
+        args.output, output_format, truncate_to=checkpoint.output_bytes if resumed else None
+    )
+    if not resumed:
+        checkpoint.save(0, writer.write([]))
+    
+    records = iter_records(
+        args.input, input_format, args.text_field, args.id_field, skip=checkpoint.rows_done
+    )
+    chunks = iter_chunks(records, args.chunk_size)
+    rows_done = checkpoint.rows_done
+    scored = 0
+    start = last_report = time.perf_counter()
+    
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.torch_threads,),
+    ) as pool:
+        pending: Deque[Tuple[int, Future]] = deque()
+        exhausted = False
+        while pending or not exhausted:
+            # Не больше 2 * workers чанков в работе: вход читается по мере записи
+            while not exhausted and len(pending) < 2 * args.workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    pending.append((len(chunk), pool.submit(_score_chunk, chunk)))
+            if not pending:
+                break
+            
+            size, future = pending.popleft()
+            output_bytes = writer.write(future.result())
+            rows_done += size
+            scored += size
+            checkpoint.save(rows_done, output_bytes)
+            
+            now = time.perf_counter()
+            if now - last_report >= args.report_every:
+                last_report = now
+                logger.info(
+                    "Scoring progress",
+                    rows_done=rows_done,
+                    docs_per_second=round(scored / (now - start), 1),
+                )
+    
+    writer.close()
+    checkpoint.remove()
+    elapsed = time.perf_counter() - start
+    return {
+        "scored": scored,
+        "rows_total": rows_done,
+        "seconds": round(elapsed, 2),
+        "docs_per_second": round(scored / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Аргументы командной строки score_file."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("input", help="Входной файл (.csv, .jsonl/.ndjson, .parquet)")
+    parser.add_argument("output", help="Выходной файл (.jsonl или .csv)")
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default=None,
+        help="Формат входа (по умолчанию по расширению)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default=None,
+        help="Формат выхода (по умолчанию по расширению)",
+    )
+    parser.add_argument("--text-field", default="text", help="Поле/колонка с текстом")
+    parser.add_argument(
+        "--id-field", default="id", help="Поле/колонка с идентификатором (нет - номер строки)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Процессов пула")
+    parser.add_argument("--torch-threads", type=int, default=1, help="Потоков torch на процесс")
+    parser.add_argument(
+        "--chunk-size", type=int, default=1000, help="Текстов в чанке (один forward pass)"
+    )
+    parser.add_argument(
+        "--checkpoint", default=None, help="Файл checkpoint (по умолчанию <output>.checkpoint)"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Игнорировать checkpoint и начать заново"
+    )
+    parser.add_argument(
+        "--report-every", type=float, default=10.0, help="Период отчета о прогрессе в секундах"
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    
+    result = score_file(args)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Sparse Training Utilities
+
+Обучение MLP на разреженных TF-IDF признаках без перевода корпуса
+в плотную матрицу. Признаки хранятся в CSR (память пропорциональна
+числу ненулевых элементов), минибатч - срез строк CSR, который
+без копирования оборачивается в CSR тензор torch, а первый слой
+считается как взвешенная сумма строк W^T по ненулевым признакам
+(embedding_bag, см. model/modeling.py: sparse_linear): без плотного
+батча (batch x словарь) в памяти.
+
+Паттерны:
+- Batch Sampler (один срез CSR на минибатч)
+- Gather-Sum (embedding_bag вместо плотного умножения)
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from scipy import sparse
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
+
+
+def csr_to_torch(matrix: sparse.spmatrix) -> torch.Tensor:
+    """
+    Преобразовать scipy матрицу в CSR тензор float32.
+    
+    Args:
+        matrix: Разреженная матрица
+    
+    Returns:
+        torch.Tensor: CSR тензор той же формы
+    """
+    matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+    return torch.sparse_csr_tensor(
+        torch.from_numpy(matrix.indptr.astype(np.int64)),
+        torch.from_numpy(matrix.indices.astype(np.int64)),
+        torch.from_numpy(matrix.data),
+        size=matrix.shape,
+        # Срез scipy CSR корректен по построению
+        check_invariants=False,
+    )
+
+
+class SparseTextDataset(Dataset):
+    """
+    Датасет над CSR матрицей признаков.
+    
+    __getitem__ принимает список индексов (см. sparse_loader) и возвращает
+    весь минибатч сразу: один срез CSR вместо batch_size обращений к строкам.
+    
+    Args:
+        features: Матрица признаков (любой scipy.sparse формат)
+        labels: Метки классов
+    """
+    
+    def __init__(self, features: sparse.spmatrix, labels: Sequence[int]):
+        self.features = sparse.csr_matrix(features, dtype=np.float32)
+        self.labels = torch.as_tensor(np.asarray(labels), dtype=torch.long)
+    
+    def __len__(self) -> int:
+        return self.features.shape[0]
+    
+    def __getitem__(self, indices: Sequence[int]) -> Tuple[torch.Tensor, torch.Tensor]:
+        indices = np.asarray(indices)
+        return csr_to_torch(self.features[indices]), self.labels[torch.from_numpy(indices)]
+
+
+def sparse_loader(
+    dataset: SparseTextDataset,
+    batch_size: int,
+    shuffle: bool,
+    num_workers: int = 0,
+    prefetch_factor: Optional[int] = None,
+    pin_memory: bool = False,
+) -> DataLoader:
+    """
+    DataLoader, отдающий минибатчи SparseTextDataset.
+    
+    С num_workers > 0 срезы CSR готовятся в отдельных процессах (воркеры
+    живут между эпохами), пока основной процесс считает шаг обучения.
+    
+    Args:
+        dataset: Разреженный датасет
+        batch_size: Размер минибатча
+        shuffle: Перемешивать порядок строк каждую эпоху
+        num_workers: Число процессов загрузки (0 - в основном процессе)
+        prefetch_factor: Минибатчей, заранее готовых у каждого воркера
+        pin_memory: Pinned memory для асинхронного копирования на GPU
+    
+    Returns:
+        DataLoader: Итератор (разреженные признаки, метки)
+    """
+    sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    return DataLoader(
+        dataset,
+        sampler=BatchSampler(sampler, batch_size, drop_last=False),
+        batch_size=None,
+        num_workers=num_workers,
+        # prefetch_factor и persistent_workers допустимы только с воркерами
+        prefetch_factor=prefetch_factor if num_workers > 0 else None,
+        persistent_workers=num_workers > 0,
+        pin_memory=pin_memory,
+    )
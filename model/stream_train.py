@@ -0,0 +1,252 @@
+"""
+Out-of-Core Training
+
+Обучение TextClassifier на CSV, который не помещается в память.
+В отличие от model/train.py (pd.read_csv целиком и TfidfVectorizer со
+словарем по всему корпусу) CSV читается частями по --chunk-size строк,
+а признаки - хешированный TF-IDF (model/hashing.py):
+
+1. **hash** - каждая часть предобрабатывается и хешируется в матрицу
+   частот, которая пишется на диск (CSR .npz); только для обучающей
+   выборки по пути накапливается документная частота (idf). Стадия
+   кешируется в MODEL_ARTIFACTS_DIR по содержимому CSV и параметрам
+   хеширования.
+2. **train** - каждую эпоху части читаются с диска по одной (в случайном
+   порядке), к ним применяется idf и из них нарезаются перемешанные
+   минибатчи. В памяти одновременно одна часть и модель.
+
+Сохраняются state_dict модели и HashedTfidfVectorizer (только idf, без
+словаря) - оба подходят ModelService как MODEL_PATH и VECTORIZER_PATH.
+
+Запуск:
+    python -m model.stream_train --chunk-size 50000 --n-features 262144
+"""
+
+import argparse
+import json
+import math
+import os
+import pickle
+import random
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from scipy import sparse
+
+from configs.config import load_configs
+from model.artifacts import ArtifactStore, file_digest
+from model.hashing import N_FEATURES, DocumentFrequency, HashedTfidfVectorizer, make_hasher
+from model.modeling import TextClassifier, TextPreprocessor
+from model.sparse import SparseTextDataset, sparse_loader
+from model.train import (
+    BATCH_SIZE,
+    EPOCHS,
+    HIDDEN_SIZE,
+    LABEL_COLUMN,
+    LEARNING_RATE,
+    TEXT_COLUMN,
+    configure_threads,
+    fit,
+)
+
+CHUNK_SIZE = 50_000
+NGRAM_RANGE = (1, 2)
+
+
+def hash_stage(store, csv_path, n_features, chunk_size, preprocessor, document_frequency=True):
+    """
+    Стадия 1: предобработка и хеширование CSV по частям.
+    
+    Артефакт - каталог с частями counts-NNNNN.npz (частоты), labels-NNNNN.npy,
+    документной частотой df.npy и meta.json (число документов, строки частей).
+    При document_frequency=False (тестовая выборка: ее idf не используется)
+    df не накапливается, а df.npy и n_documents не пишутся.
+    
+    Returns:
+        str: Путь к каталогу артефакта
+    """
+    key = store.key(
+        "hash",
+        data=file_digest(csv_path),
+        n_features=n_features,
+        ngram_range=NGRAM_RANGE,
+        chunk_size=chunk_size,
+        document_frequency=document_frequency,
+    )
+    path = store.path(key)
+    if os.path.exists(path):
+        print(f"Hash: reusing {path}")
+        return path
+    
+    start = time.perf_counter()
+    hasher = make_hasher(n_features, NGRAM_RANGE)
+    frequency = DocumentFrequency(n_features) if document_frequency else None
+    chunk_rows = []
+    with store.writing(key, directory=True) as tmp_path:
+        chunks = pd.read_csv(
+            csv_path, usecols=[TEXT_COLUMN, LABEL_COLUMN], chunksize=chunk_size
+        )
+        for number, chunk in enumerate(chunks):
+            texts = chunk[TEXT_COLUMN].fillna("").astype(str).map(preprocessor.preprocess)
+            counts = hasher.transform(texts)
+            if frequency is not None:
+                frequency.update(counts)
+            sparse.save_npz(os.path.join(tmp_path, f"counts-{number:05d}.npz"), counts)
+            np.save(
+                os.path.join(tmp_path, f"labels-{number:05d}.npy"),
+                chunk[LABEL_COLUMN].to_numpy(dtype=np.int64),
+            )
+            chunk_rows.append(len(chunk))
+            print(
+                f"Hash: chunk {number} "
+                f"({sum(chunk_rows)} rows, {time.perf_counter() - start:.1f}s)"
+            )
+        meta = {"chunk_rows": chunk_rows}
+        if frequency is not None:
+            np.save(os.path.join(tmp_path, "df.npy"), frequency.df)
+            meta["n_documents"] = frequency.n_documents
+        with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    print(
+        f"Hash: {sum(chunk_rows)} rows in {len(chunk_rows)} chunks, "
+        f"{time.perf_counter() - start:.1f}s -> {path}"
+    )
+    return path
+
+
+def load_vectorizer(path):
+    """HashedTfidfVectorizer по документной частоте артефакта hash."""
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    frequency = DocumentFrequency(0)
+    frequency.df = np.load(os.path.join(path, "df.npy"))
+    frequency.n_documents = meta["n_documents"]
+    return HashedTfidfVectorizer(frequency.idf(), NGRAM_RANGE)
+
+
+class ChunkStream:
+    """
+    Минибатчи по частям артефакта hash; каждый проход читает части с диска заново.
+    
+    Args:
+        path: Каталог артефакта hash
+        vectorizer: Векторайзер с idf обучающей выборки
+        batch_size: Размер минибатча
+        shuffle: Перемешивать порядок частей и строки внутри части
+    """
+    
+    def __init__(self, path, vectorizer, batch_size, shuffle):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.chunk_rows = json.load(f)["chunk_rows"]
+        self.path = path
+        self.vectorizer = vectorizer
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+    
+    def __len__(self):
+        return sum(math.ceil(rows / self.batch_size) for rows in self.chunk_rows)
+    
+    def __iter__(self):
+        order = list(range(len(self.chunk_rows)))
+        if self.shuffle:
+            random.shuffle(order)
+        for number in order:
+            counts = sparse.load_npz(os.path.join(self.path, f"counts-{number:05d}.npz"))
+            labels = np.load(os.path.join(self.path, f"labels-{number:05d}.npy"))
+            dataset = SparseTextDataset(self.vectorizer.weight(counts), labels)
+            yield from sparse_loader(dataset, batch_size=self.batch_size, shuffle=self.shuffle)
+
+
+def train_streaming(
+    train_csv,
+    test_csv,
+    artifacts_dir,
+    n_features=N_FEATURES,
+    chunk_size=CHUNK_SIZE,
+    hidden_size=HIDDEN_SIZE,
+    learning_rate=LEARNING_RATE,
+    batch_size=BATCH_SIZE,
+    epochs=EPOCHS,
+    bf16=False,
+):
+    """
+    Конвейер out-of-core обучения: hash (train, test) -> train.
+    
+    Returns:
+        tuple: (обученная модель, HashedTfidfVectorizer)
+    """
+    store = ArtifactStore(artifacts_dir)
+    preprocessor = TextPreprocessor()
+    train_path = hash_stage(store, train_csv, n_features, chunk_size, preprocessor)
+    test_path = hash_stage(
+        store, test_csv, n_features, chunk_size, preprocessor, document_frequency=False
+    )
+    vectorizer = load_vectorizer(train_path)
+    
+    model = TextClassifier(input_size=n_features, hidden_size=hidden_size, output_size=2)
+    model = fit(
+        model,
+        ChunkStream(train_path, vectorizer, batch_size, shuffle=True),
+        ChunkStream(test_path, vectorizer, batch_size, shuffle=False),
+        learning_rate=learning_rate,
+        epochs=epochs,
+        bf16=bf16,
+    )
+    return model, vectorizer
+
+
+def main():
+    configs = load_configs()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--train-data", default=configs["data"]["train_data"], help="CSV обучающей выборки"
+    )
+    parser.add_argument(
+        "--test-data", default=configs["data"]["test_data"], help="CSV тестовой выборки"
+    )
+    parser.add_argument(
+        "--artifacts-dir", default=configs["model"].get("artifacts_dir") or "./model/artifacts"
+    )
+    parser.add_argument("--model-path", default=configs["model"]["model_path"])
+    parser.add_argument("--vectorizer-path", default=configs["model"]["vectorizer_path"])
+    parser.add_argument(
+        "--n-features", type=int, default=N_FEATURES, help="Число столбцов хеширования"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="Строк CSV в одной части"
+    )
+    parser.add_argument("--hidden-size", type=int, default=HIDDEN_SIZE)
+    parser.add_argument("--lr", type=float, default=LEARNING_RATE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op потоков torch")
+    parser.add_argument("--interop-threads", type=int, default=None, help="Inter-op потоков torch")
+    parser.add_argument("--bf16", action="store_true", help="Autocast в bfloat16")
+    args = parser.parse_args()
+    configure_threads(args.threads, args.interop_threads)
+    
+    model, vectorizer = train_streaming(
+        args.train_data,
+        args.test_data,
+        args.artifacts_dir,
+        n_features=args.n_features,
+        chunk_size=args.chunk_size,
+        hidden_size=args.hidden_size,
+        learning_rate=args.lr,
+        batch_size=args.batch_size,
+        epochs=args.epochs,
+        bf16=args.bf16,
+    )
+    
+    torch.save(model.state_dict(), args.model_path)
+    with open(args.vectorizer_path, "wb") as f:
+        pickle.dump(vectorizer, f)
+    print("Model and vectorizer saved successfully")
+
+
+if __name__ == "__main__":
+    main()
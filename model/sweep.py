@@ -0,0 +1,299 @@
+"""
+Hyperparameter Sweep
+
+Параллельный перебор гиперпараметров TextClassifier на одних и тех же
+признаках. Признаки строятся один раз стадиями model/train.py
+(preprocess -> vectorize, с кешем), затем массивы CSR (data, indices,
+indptr) и метки сохраняются в .npy и открываются каждым процессом пула
+через np.load(mmap_mode="r"): все процессы читают одни страницы page cache,
+матрица не копируется и не передается через pickle.
+
+Перебираются hidden_size, dropout, lr и ограничение словаря. Ограничение
+словаря (--max-features) - приближение TfidfVectorizer(max_features):
+берутся столбцы с наибольшей документной частотой в обучающей выборке,
+строки заново нормируются по L2; idf остается от полного словаря.
+
+Для каждой конфигурации: точность на тестовой выборке, размер модели
+(параметры и байты state_dict) и измеренная задержка forward на одном
+тексте и на минибатче. Результаты - одна таблица (и CSV с --output).
+
+Запуск:
+    python -m model.sweep --hidden-size 64 128 256 --dropout 0.3 0.5 \
+        --lr 0.001 0.0005 --max-features 0 50000
+    python -m model.sweep --search random --samples 12 --workers 4 --threads-per-worker 8
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+import torch
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from configs.config import load_configs
+from model.artifacts import ArtifactStore
+from model.modeling import TextClassifier
+from model.sparse import SparseTextDataset, csr_to_torch, sparse_loader
+from model.train import (
+    BATCH_SIZE,
+    DROPOUT,
+    EPOCHS,
+    HIDDEN_SIZE,
+    LEARNING_RATE,
+    VECTORIZER_PARAMS,
+    fit,
+    load_features,
+    preprocess_stage,
+    vectorize_stage,
+)
+
+LATENCY_RUNS = 200
+LATENCY_BATCH_SIZE = 256
+
+# Признаки, открытые в процессе пула (mmap)
+_shared = {}
+
+
+def share_stage(store, features_path):
+    """
+    Сохранить признаки артефакта vectorize как .npy для mmap.
+    
+    Артефакт - каталог с {train,test}_{data,indices,indptr}.npy,
+    {train,test}_labels.npy, columns_by_df.npy (столбцы по убыванию
+    документной частоты) и meta.json (формы матриц).
+    
+    Returns:
+        str: Путь к каталогу артефакта
+    """
+    key = store.key("share", features=os.path.basename(features_path))
+    path = store.path(key)
+    if os.path.exists(path):
+        print(f"Share: reusing {path}")
+        return path
+    
+    train_features, train_labels, test_features, test_labels, _ = load_features(features_path)
+    with store.writing(key, directory=True) as tmp_path:
+        shapes = {}
+        splits = (("train", train_features, train_labels), ("test", test_features, test_labels))
+        for name, matrix, labels in splits:
+            matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+            np.save(os.path.join(tmp_path, f"{name}_data.npy"), matrix.data)
+            np.save(os.path.join(tmp_path, f"{name}_indices.npy"), matrix.indices)
+            np.save(os.path.join(tmp_path, f"{name}_indptr.npy"), matrix.indptr)
+            np.save(os.path.join(tmp_path, f"{name}_labels.npy"), labels)
+            shapes[name] = list(matrix.shape)
+        document_frequency = np.bincount(train_features.indices, minlength=train_features.shape[1])
+        columns_by_df = np.argsort(-document_frequency, kind="stable")
+        np.save(os.path.join(tmp_path, "columns_by_df.npy"), columns_by_df)
+        with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"shapes": shapes}, f)
+    print(f"Share: {path}")
+    return path
+
+
+def _open_shared(path, threads):
+    """Инициализатор процесса пула: открыть признаки через mmap."""
+    torch.set_num_threads(threads)
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        shapes = json.load(f)["shapes"]
+    
+    def load(name):
+        parts = ("data", "indices", "indptr")
+        arrays = [
+            np.load(os.path.join(path, f"{name}_{part}.npy"), mmap_mode="r") for part in parts
+        ]
+        # Метки малы - копия в памяти процесса (torch не принимает read-only массивы)
+        labels = np.load(os.path.join(path, f"{name}_labels.npy"))
+        return sparse.csr_matrix(tuple(arrays), shape=tuple(shapes[name]), copy=False), labels
+    
+    _shared["train"] = load("train")
+    _shared["test"] = load("test")
+    _shared["columns_by_df"] = np.load(os.path.join(path, "columns_by_df.npy"), mmap_mode="r")
+
+
+def _select_columns(matrix, columns):
+    """Оставить столбцы columns и заново нормировать строки по L2."""
+    return normalize(matrix[:, columns], norm="l2", copy=False)
+
+
+def evaluate(model, features, labels, batch_size):
+    """Точность модели на матрице признаков."""
+    model.eval()
+    correct = 0
+    with torch.no_grad():
+        for start in range(0, features.shape[0], batch_size):
+            outputs = model(csr_to_torch(features[start:start + batch_size]))
+            correct += (outputs.argmax(dim=1).numpy() == labels[start:start + batch_size]).sum()
+    return correct / features.shape[0]
+
+
+def measure_latency(model, features, batch_size):
+    """Задержка forward (мс): медиана и p95 на одном тексте, медиана на минибатче."""
+    model.eval()
+    rows = [csr_to_torch(features[i:i + 1]) for i in range(min(LATENCY_RUNS, features.shape[0]))]
+    batch = csr_to_torch(features[:batch_size])
+    single = []
+    batched = []
+    with torch.no_grad():
+        for row in rows:
+            start = time.perf_counter()
+            model(row)
+            single.append((time.perf_counter() - start) * 1000)
+        for _ in range(20):
+            start = time.perf_counter()
+            model(batch)
+            batched.append((time.perf_counter() - start) * 1000)
+    single.sort()
+    return {
+        "latency_ms_p50": statistics.median(single),
+        "latency_ms_p95": single[int(len(single) * 0.95)],
+        f"batch{batch_size}_ms_p50": statistics.median(batched),
+    }
+
+
+def run_config(config, batch_size, epochs):
+    """Обучить и оценить одну конфигурацию (в процессе пула)."""
+    started = time.perf_counter()
+    train_features, train_labels = _shared["train"]
+    test_features, test_labels = _shared["test"]
+    if config["max_features"]:
+        columns = np.sort(_shared["columns_by_df"][:config["max_features"]])
+        train_features = _select_columns(train_features, columns)
+        test_features = _select_columns(test_features, columns)
+    
+    model = TextClassifier(
+        input_size=train_features.shape[1],
+        hidden_size=config["hidden_size"],
+        output_size=2,
+        dropout=config["dropout"],
+    )
+    train_loader = sparse_loader(
+        SparseTextDataset(train_features, train_labels), batch_size=batch_size, shuffle=True
+    )
+    test_loader = sparse_loader(
+        SparseTextDataset(test_features, test_labels), batch_size=batch_size, shuffle=False
+    )
+    # Лог эпох fit() из параллельных процессов перемешался бы - в таблицу идут только итоги
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = fit(model, train_loader, test_loader, learning_rate=config["lr"], epochs=epochs)
+    model.to("cpu")
+    
+    state = io.BytesIO()
+    torch.save(model.state_dict(), state)
+    result = dict(config)
+    result.update({
+        "features": train_features.shape[1],
+        "test_accuracy": evaluate(model, test_features, test_labels, batch_size),
+        "parameters": sum(parameter.numel() for parameter in model.parameters()),
+        "model_mb": state.getbuffer().nbytes / 2 ** 20,
+        **measure_latency(model, test_features, LATENCY_BATCH_SIZE),
+        "train_seconds": time.perf_counter() - started,
+    })
+    return result
+
+
+def make_configs(grid, search, samples, seed):
+    """Конфигурации: полная сетка или samples случайных точек сетки."""
+    names = list(grid)
+    configs = [
+        dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))
+    ]
+    if search == "random" and samples < len(configs):
+        configs = random.Random(seed).sample(configs, samples)
+    return configs
+
+
+def main():
+    configs = load_configs()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--train-data", default=configs["data"]["train_data"], help="CSV обучающей выборки"
+    )
+    parser.add_argument(
+        "--test-data", default=configs["data"]["test_data"], help="CSV тестовой выборки"
+    )
+    parser.add_argument(
+        "--artifacts-dir", default=configs["model"].get("artifacts_dir") or "./model/artifacts"
+    )
+    parser.add_argument("--hidden-size", type=int, nargs="+", default=[HIDDEN_SIZE])
+    parser.add_argument("--dropout", type=float, nargs="+", default=[DROPOUT])
+    parser.add_argument("--lr", type=float, nargs="+", default=[LEARNING_RATE])
+    parser.add_argument(
+        "--max-features", type=int, nargs="+", default=[0], help="Ограничение словаря (0 - весь)"
+    )
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=8, help="Конфигураций при --search random")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Процессов пула")
+    parser.add_argument(
+        "--threads-per-worker", type=int, default=1, help="Потоков torch в процессе пула"
+    )
+    parser.add_argument("--output", default=None, help="CSV с результатами")
+    args = parser.parse_args()
+    
+    store = ArtifactStore(args.artifacts_dir)
+    train_key, train_path = preprocess_stage(store, args.train_data)
+    test_key, test_path = preprocess_stage(store, args.test_data)
+    features_path = vectorize_stage(
+        store, train_key, train_path, test_key, test_path, VECTORIZER_PARAMS
+    )
+    shared_path = share_stage(store, features_path)
+    
+    grid = {
+        "hidden_size": args.hidden_size,
+        "dropout": args.dropout,
+        "lr": args.lr,
+        "max_features": args.max_features,
+    }
+    sweep = make_configs(grid, args.search, args.samples, args.seed)
+    print(
+        f"Sweep: {len(sweep)} configurations, "
+        f"{args.workers} workers x {args.threads_per_worker} threads"
+    )
+    
+    results = []
+    start = time.perf_counter()
+    # spawn: дочерние процессы не наследуют пулы потоков torch родителя
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=get_context("spawn"),
+        initializer=_open_shared,
+        initargs=(shared_path, args.threads_per_worker),
+    ) as pool:
+        futures = [
+            pool.submit(run_config, config, args.batch_size, args.epochs) for config in sweep
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(
+                f"[{len(results)}/{len(sweep)}] hidden={result['hidden_size']} "
+                f"dropout={result['dropout']} lr={result['lr']} "
+                f"max_features={result['max_features']}: accuracy {result['test_accuracy']:.4f}"
+            )
+    
+    table = pd.DataFrame(results).sort_values("test_accuracy", ascending=False)
+    print(f"\nSweep finished in {time.perf_counter() - start:.1f}s")
+    print(table.to_string(index=False, float_format=lambda value: f"{value:.4g}"))
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
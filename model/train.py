@@ -1,150 +1,344 @@
-import pandas as pd 
-from configs.config import load_configs
-import pickle
+"""
+Model Training
+
+Обучение TextClassifier на CSV с колонками comment_text и toxic.
+Стадии preprocess и vectorize кешируются (см. model/artifacts.py),
+train выполняется каждый раз. Импорт модуля ничего не запускает:
+обучение - функция train() и CLI.
 
-configs = load_configs()
+Запуск:
+    python -m model.train
+    python -m model.train --hidden-size 256 --lr 0.0005 --epochs 5
+    python -m model.train --workers 8 --prefetch-factor 4 --threads 24 --interop-threads 2 --bf16
+"""
 
-train_data = pd.read_csv(configs["data"]["train_data"])
-test_data = pd.read_csv(configs["data"]["test_data"])
+import argparse
+import os
+import pickle
+import time
 
-print(train_data.head())
-print(test_data.head())
+import numpy as np
+import pandas as pd
+from configs.config import load_configs
 
-import nltk
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('wordnet')
+import torch
+from torch.optim import AdamW
+from model.artifacts import ArtifactStore, file_digest
+from model.modeling import TextClassifier, TextPreprocessor
+from model.sparse import SparseTextDataset, sparse_loader
+
+TEXT_COLUMN = "comment_text"
+LABEL_COLUMN = "toxic"
+
+# Параметры стадии векторизации (изменение - новый артефакт признаков)
+VECTORIZER_PARAMS = {"ngram_range": (1, 2)}
 
-stopwords = nltk.corpus.stopwords.words("english")
-lemmatizer = nltk.WordNetLemmatizer()
-tokenizer = nltk.tokenize.RegexpTokenizer(r'\w+')
+# Гиперпараметры обучения по умолчанию (изменение не инвалидирует артефакты)
+HIDDEN_SIZE = 128
+DROPOUT = 0.5
+LEARNING_RATE = 0.001
+BATCH_SIZE = 128
+EPOCHS = 10
 
-class TextPreprocessor:
-    def __init__(self):
-        self.stopwords = stopwords
-        self.lemmatizer = lemmatizer
-        self.tokenizer = tokenizer
+
+def preprocess_stage(store, csv_path):
+    """
+    Стадия 1: предобработка текстов CSV.
+    
+    Артефакт - Parquet с предобработанным текстом и меткой. Ключ зависит
+    от содержимого CSV, поэтому тот же файл не предобрабатывается повторно.
     
-    def preprocess(self, text):
-        text = text.lower()
-        tokens = self.tokenizer.tokenize(text)
-        tokens = [word for word in tokens if word not in self.stopwords]
-        tokens = [self.lemmatizer.lemmatize(word) for word in tokens]
-        return " ".join(tokens)
+    Returns:
+        tuple: (ключ артефакта, путь к Parquet)
+    """
+    key = store.key("preprocess", data=file_digest(csv_path), columns=[TEXT_COLUMN, LABEL_COLUMN])
+    path = store.path(key, ".parquet")
+    if os.path.exists(path):
+        print(f"Preprocess: reusing {path}")
+        return key, path
+    
+    start = time.perf_counter()
+    data = pd.read_csv(csv_path, usecols=[TEXT_COLUMN, LABEL_COLUMN])
+    preprocessor = TextPreprocessor()
+    data[TEXT_COLUMN] = data[TEXT_COLUMN].fillna("").astype(str).apply(preprocessor.preprocess)
+    with store.writing(key, ".parquet") as tmp_path:
+        data.to_parquet(tmp_path, index=False)
+    print(
+        f"Preprocess: {len(data)} rows from {csv_path} "
+        f"in {time.perf_counter() - start:.1f}s -> {path}"
+    )
+    return key, path
+
+
+def vectorize_stage(store, train_key, train_path, test_key, test_path, vectorizer_params):
+    """
+    Стадия 2: обучение TF-IDF и векторизация.
+    
+    Артефакт - каталог с CSR признаками (train.npz, test.npz), метками
+    (labels.npz) и векторайзером (vectorizer.pkl). Ключ зависит от ключей
+    артефактов предобработки и параметров векторайзера.
+    
+    Returns:
+        str: Путь к каталогу артефакта
+    """
+    key = store.key("vectorize", train=train_key, test=test_key, params=vectorizer_params)
+    path = store.path(key)
+    if os.path.exists(path):
+        print(f"Vectorize: reusing {path}")
+        return path
+    
+    start = time.perf_counter()
+    train_data = pd.read_parquet(train_path)
+    test_data = pd.read_parquet(test_path)
+    # Признаки остаются в CSR: плотная матрица (строки x словарь биграмм) не помещается в память
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    train_features = vectorizer.fit_transform(train_data[TEXT_COLUMN])
+    test_features = vectorizer.transform(test_data[TEXT_COLUMN])
+    
+    with store.writing(key, directory=True) as tmp_path:
+        sparse.save_npz(os.path.join(tmp_path, "train.npz"), train_features.astype(np.float32))
+        sparse.save_npz(os.path.join(tmp_path, "test.npz"), test_features.astype(np.float32))
+        np.savez(
+            os.path.join(tmp_path, "labels.npz"),
+            train=train_data[LABEL_COLUMN].to_numpy(dtype=np.int64),
+            test=test_data[LABEL_COLUMN].to_numpy(dtype=np.int64),
+        )
+        with open(os.path.join(tmp_path, "vectorizer.pkl"), "wb") as f:
+            pickle.dump(vectorizer, f)
+    print(
+        f"Vectorize: {train_features.shape[1]} features "
+        f"in {time.perf_counter() - start:.1f}s -> {path}"
+    )
+    return path
 
-preprocessor = TextPreprocessor()
-train_data["comment_text"] = train_data["comment_text"].apply(preprocessor.preprocess)
-test_data["comment_text"] = test_data["comment_text"].apply(preprocessor.preprocess)
 
-print(train_data.head())
-print(test_data.head())
+def load_features(path):
+    """Загрузить артефакт векторизации: (train_X, train_y, test_X, test_y, vectorizer)."""
+    labels = np.load(os.path.join(path, "labels.npz"))
+    with open(os.path.join(path, "vectorizer.pkl"), "rb") as f:
+        vectorizer = pickle.load(f)
+    return (
+        sparse.load_npz(os.path.join(path, "train.npz")),
+        labels["train"],
+        sparse.load_npz(os.path.join(path, "test.npz")),
+        labels["test"],
+        vectorizer,
+    )
 
-vectorizer = TfidfVectorizer(ngram_range=(1, 2))
-train_texts = vectorizer.fit_transform(train_data["comment_text"]).toarray()
-test_texts = vectorizer.transform(test_data["comment_text"]).toarray()
 
-train_labels = train_data["toxic"].tolist()
-test_labels = test_data["toxic"].tolist()
+def train_stage(
+    train_texts,
+    train_labels,
+    test_texts,
+    test_labels,
+    hidden_size=HIDDEN_SIZE,
+    dropout=DROPOUT,
+    learning_rate=LEARNING_RATE,
+    batch_size=BATCH_SIZE,
+    epochs=EPOCHS,
+    num_workers=0,
+    prefetch_factor=None,
+    bf16=False,
+):
+    """Стадия 3: обучение MLP (не кешируется - именно ее меняют гиперпараметры)."""
+    loader_options = {
+        "num_workers": num_workers,
+        "prefetch_factor": prefetch_factor,
+        "pin_memory": torch.cuda.is_available(),
+    }
+    train_loader = sparse_loader(
+        SparseTextDataset(train_texts, train_labels),
+        batch_size=batch_size,
+        shuffle=True,
+        **loader_options,
+    )
+    test_loader = sparse_loader(
+        SparseTextDataset(test_texts, test_labels),
+        batch_size=batch_size,
+        shuffle=False,
+        **loader_options,
+    )
+    model = TextClassifier(
+        input_size=train_texts.shape[1], hidden_size=hidden_size, output_size=2, dropout=dropout
+    )
+    return fit(
+        model, train_loader, test_loader, learning_rate=learning_rate, epochs=epochs, bf16=bf16
+    )
 
-import torch
-from torch.optim import AdamW
-from torch.utils.data import DataLoader, Dataset
-from sklearn.model_selection import train_test_split
-from torch.nn import Linear, Dropout, ReLU, Module
-
-class CustomTextDataset(Dataset):
-    def __init__(self, texts, labels):
-        self.texts = torch.tensor(texts, dtype=torch.float32)
-        self.labels = torch.tensor(labels, dtype=torch.long)
-    
-    def __len__(self):
-        return len(self.labels)
-    
-    def __getitem__(self, index):
-        return self.texts[index], self.labels[index]
-
-train_dataset = CustomTextDataset(train_texts, train_labels)
-test_dataset = CustomTextDataset(test_texts, test_labels)
-
-train_loader = DataLoader(train_dataset, batch_size=128, shuffle=True)
-test_loader = DataLoader(test_dataset, batch_size=128, shuffle=False)
-
-input_size = train_texts.shape[1]
-
-class TextClassifier(Module):
-    def __init__(self, input_size, hidden_size, output_size):
-        super(TextClassifier, self).__init__()
-        self.fc1 = Linear(input_size, hidden_size)
-        self.fc2 = Linear(hidden_size, output_size)
-        self.relu = ReLU()
-        self.dropout = Dropout(0.5)
-    
-    def forward(self, x):
-        x = self.fc1(x)
-        x = self.relu(x)
-        x = self.dropout(x)
-        x = self.fc2(x)
-        return x
-
-model = TextClassifier(input_size=input_size, hidden_size=128, output_size=2)
-optimizer = AdamW(model.parameters(), lr=0.001)
-criterion = torch.nn.CrossEntropyLoss()
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model.to(device)
-
-train_losses = []
-test_losses = []
-train_accuracies = []
-test_accuracies = []
-
-epochs = 10
-for epoch in range(epochs):
-    model.train()
-    train_loss = 0.0
-    train_correct = 0
-    train_total = 0
-    for texts, labels in train_loader:
-        texts = texts.to(device)
-        labels = labels.to(device)
-        optimizer.zero_grad()
-        outputs = model(texts)
-        loss = criterion(outputs, labels)
-        loss.backward()
-        optimizer.step()
-        train_loss += loss.item()
-        train_correct += (outputs.argmax(dim=1) == labels).sum().item()
-        train_total += labels.size(0)
-    train_loss /= len(train_loader)
-    train_accuracy = train_correct / train_total
-    train_losses.append(train_loss)
-    train_accuracies.append(train_accuracy)
-    
-    model.eval()
-    test_loss = 0.0
-    test_correct = 0
-    test_total = 0
-    with torch.no_grad():
-        for texts, labels in test_loader:
-            texts = texts.to(device)
-            labels = labels.to(device)
-            outputs = model(texts)
-            loss = criterion(outputs, labels)
-            test_loss += loss.item()
-            test_correct += (outputs.argmax(dim=1) == labels).sum().item()
-            test_total += labels.size(0)
-    test_loss /= len(test_loader)
-    test_accuracy = test_correct / test_total
-    test_losses.append(test_loss)
-    test_accuracies.append(test_accuracy)
-    print(f"Epoch {epoch+1}/{epochs}, Train Loss: {train_loss:.4f}, Train Accuracy: {train_accuracy:.4f}, Test Loss: {test_loss:.4f}, Test Accuracy: {test_accuracy:.4f}")
-
-print(train_losses)
-print(train_accuracies)
-print(test_losses)
-print(test_accuracies)
-
-torch.save(model.state_dict(), configs["model"]["model_path"])
-pickle.dump(vectorizer, open(configs["model"]["vectorizer_path"], "wb"))
-print("Model and vectorizer saved successfully")
\ No newline at end of file
+
+def configure_threads(threads=None, interop_threads=None):
+    """
+    Задать число потоков torch: внутри операции (threads) и между операциями.
+    
+    Вызывается до первой операции torch: число inter-op потоков после
+    старта пула изменить нельзя. None - значение torch по умолчанию.
+    """
+    if interop_threads:
+        torch.set_num_interop_threads(interop_threads)
+    if threads:
+        torch.set_num_threads(threads)
+    print(
+        f"Torch threads: intra-op {torch.get_num_threads()}, "
+        f"inter-op {torch.get_num_interop_threads()}"
+    )
+
+
+def fit(model, train_loader, test_loader, learning_rate=LEARNING_RATE, epochs=EPOCHS, bf16=False):
+    """
+    Цикл обучения и оценки по эпохам.
+    
+    Потери и число верных ответов накапливаются в тензорах на устройстве
+    и читаются (.item()) один раз за эпоху, а не на каждом шаге.
+    
+    Args:
+        model: Модель
+        train_loader: Минибатчи (признаки, метки) обучающей выборки; повторно
+            итерируемые (новый проход каждую эпоху) и с len() - числом минибатчей
+        test_loader: Минибатчи тестовой выборки
+        learning_rate: Скорость обучения AdamW
+        epochs: Число эпох
+        bf16: Autocast в bfloat16 (на CPU - при поддержке AVX512-BF16/AMX)
+    
+    Returns:
+        Module: Обученная модель
+    """
+    optimizer = AdamW(model.parameters(), lr=learning_rate)
+    criterion = torch.nn.CrossEntropyLoss()
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model.to(device)
+    
+    train_losses = []
+    test_losses = []
+    train_accuracies = []
+    test_accuracies = []
+    
+    def run_epoch(loader, training):
+        total_loss = torch.zeros((), device=device)
+        correct = torch.zeros((), dtype=torch.long, device=device)
+        total = 0
+        for texts, labels in loader:
+            texts = texts.to(device, non_blocking=True)
+            labels = labels.to(device, non_blocking=True)
+            with torch.autocast(device.type, dtype=torch.bfloat16, enabled=bf16):
+                outputs = model(texts)
+                loss = criterion(outputs, labels)
+            if training:
+                optimizer.zero_grad()
+                loss.backward()
+                optimizer.step()
+            total_loss += loss.detach()
+            correct += (outputs.argmax(dim=1) == labels).sum()
+            total += labels.size(0)
+        # Единственная синхронизация за эпоху
+        return total_loss.item() / len(loader), correct.item() / total, total
+    
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        model.train()
+        train_loss, train_accuracy, samples = run_epoch(train_loader, training=True)
+        samples_per_second = samples / (time.perf_counter() - start)
+        train_losses.append(train_loss)
+        train_accuracies.append(train_accuracy)
+        
+        model.eval()
+        with torch.no_grad():
+            test_loss, test_accuracy, _ = run_epoch(test_loader, training=False)
+        test_losses.append(test_loss)
+        test_accuracies.append(test_accuracy)
+        print(
+            f"Epoch {epoch+1}/{epochs}, "
+            f"Train Loss: {train_loss:.4f}, Train Accuracy: {train_accuracy:.4f}, "
+            f"Test Loss: {test_loss:.4f}, Test Accuracy: {test_accuracy:.4f}, "
+            f"{samples_per_second:,.0f} samples/s"
+        )
+    
+    print(train_losses)
+    print(train_accuracies)
+    print(test_losses)
+    print(test_accuracies)
+    return model
+
+
+def train(train_csv, test_csv, artifacts_dir, vectorizer_params=None, **hyperparams):
+    """
+    Полный конвейер обучения: preprocess -> vectorize -> train.
+    
+    Args:
+        train_csv: CSV обучающей выборки
+        test_csv: CSV тестовой выборки
+        artifacts_dir: Каталог кеша стадий
+        vectorizer_params: Параметры TfidfVectorizer (по умолчанию VECTORIZER_PARAMS)
+        **hyperparams: Параметры train_stage (hidden_size, dropout, learning_rate, batch_size,
+            epochs, num_workers, prefetch_factor, bf16)
+    
+    Returns:
+        tuple: (обученная модель, векторайзер)
+    """
+    store = ArtifactStore(artifacts_dir)
+    train_key, train_path = preprocess_stage(store, train_csv)
+    test_key, test_path = preprocess_stage(store, test_csv)
+    features_path = vectorize_stage(
+        store, train_key, train_path, test_key, test_path, vectorizer_params or VECTORIZER_PARAMS
+    )
+    train_texts, train_labels, test_texts, test_labels, vectorizer = load_features(features_path)
+    
+    model = train_stage(train_texts, train_labels, test_texts, test_labels, **hyperparams)
+    return model, vectorizer
+
+
+def main():
+    configs = load_configs()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--train-data", default=configs["data"]["train_data"], help="CSV обучающей выборки"
+    )
+    parser.add_argument(
+        "--test-data", default=configs["data"]["test_data"], help="CSV тестовой выборки"
+    )
+    parser.add_argument(
+        "--artifacts-dir", default=configs["model"].get("artifacts_dir") or "./model/artifacts"
+    )
+    parser.add_argument("--model-path", default=configs["model"]["model_path"])
+    parser.add_argument("--vectorizer-path", default=configs["model"]["vectorizer_path"])
+    parser.add_argument("--hidden-size", type=int, default=HIDDEN_SIZE)
+    parser.add_argument("--dropout", type=float, default=DROPOUT)
+    parser.add_argument("--lr", type=float, default=LEARNING_RATE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--workers", type=int, default=0, help="Процессов загрузки минибатчей")
+    parser.add_argument(
+        "--prefetch-factor", type=int, default=None, help="Минибатчей впрок на воркер"
+    )
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op потоков torch")
+    parser.add_argument("--interop-threads", type=int, default=None, help="Inter-op потоков torch")
+    parser.add_argument("--bf16", action="store_true", help="Autocast в bfloat16")
+    args = parser.parse_args()
+    configure_threads(args.threads, args.interop_threads)
+    
+    model, vectorizer = train(
+        args.train_data,
+        args.test_data,
+        args.artifacts_dir,
+        hidden_size=args.hidden_size,
+        dropout=args.dropout,
+        learning_rate=args.lr,
+        batch_size=args.batch_size,
+        epochs=args.epochs,
+        num_workers=args.workers,
+        prefetch_factor=args.prefetch_factor,
+        bf16=args.bf16,
+    )
+    
+    torch.save(model.state_dict(), args.model_path)
+    with open(args.vectorizer_path, "wb") as f:
+        pickle.dump(vectorizer, f)
+    print("Model and vectorizer saved successfully")
+
+
+if __name__ == "__main__":
+    main()
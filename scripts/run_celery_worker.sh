@@ -1,12 +1,26 @@
 #!/bin/bash
 # Скрипт для запуска Celery worker
 # Используется для локальной разработки
+#
+# Использование: ./scripts/run_celery_worker.sh [all|interactive|bulk] [concurrency]
+#   all         - общий пул для обеих очередей (interactive опрашивается первой)
+#   interactive - выделенный пул для одиночных предсказаний
+#   bulk        - выделенный пул для чанков заданий и обслуживания
 
 # Активация виртуального окружения (если используется)
 if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
-# Запуск Celery worker
-celery -A infrastructure.celery_app worker --loglevel=info
+POOL=${1:-all}
+CONCURRENCY=${2:-}
+
+case "$POOL" in
+    all) QUEUES="interactive,bulk" ;;
+    interactive|bulk) QUEUES="$POOL" ;;
+    *) echo "Unknown pool: $POOL (expected all, interactive or bulk)" >&2; exit 1 ;;
+esac
 
+# Запуск Celery worker
+celery -A infrastructure.celery_app worker --loglevel=info \
+    -Q "$QUEUES" --hostname "$POOL@%h" ${CONCURRENCY:+--concurrency "$CONCURRENCY"}
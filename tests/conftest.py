@@ -0,0 +1,158 @@
+"""
+Общие фикстуры тестов: API поверх контейнера с заглушкой модели и
+схема приложения в PostgreSQL для тестов с маркером postgres.
+"""
+
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+import pytest
+from dependency_injector import providers
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+import app.api.routes as routes_module
+import infrastructure.models  # noqa: F401 - регистрирует таблицы в Base.metadata
+from configs.config import load_configs
+from infrastructure.database import Base, Database, get_database_url
+from infrastructure.dependency_injection import Container
+
+
+class FakeModelService:
+    """
+    Заглушка ModelService: score - доля слов "bad" в тексте.
+    
+    Args:
+        delay: Задержка predict_batch в секундах
+    """
+    
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches: List[List[str]] = []
+    
+    async def predict_batch(
+        self,
+        texts: List[str],
+        deadlines: Optional[Sequence] = None,
+    ) -> List[Tuple[float, float]]:
+        self.batches.append(list(texts))
+        if self.delay:
+            import asyncio
+            await asyncio.sleep(self.delay)
+        results = []
+        for item in texts:
+            words = item.split() or [""]
+            score = sum(word == "bad" for word in words) / len(words)
+            results.append((score, 0.9))
+        return results
+    
+    async def predict(self, text: str, deadline=None) -> Tuple[float, float]:
+        return (await self.predict_batch([text]))[0]
+    
+    def get_model_version(self) -> str:
+        return "test"
+
+
+@pytest.fixture
+def model_service() -> FakeModelService:
+    return FakeModelService()
+
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch, model_service):
+    """
+    Фабрика TestClient для API с backend и переменными окружения из аргументов.
+    
+    Приложение собирается из router и отдельного контейнера, модель
+    заменена на FakeModelService.
+    """
+    clients = []
+    
+    def make(backend: str = "sqlite", **env: str) -> TestClient:
+        monkeypatch.setenv("DATABASE_BACKEND", backend)
+        monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "textguard.db"))
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        
+        container = Container()
+        container.config.from_dict(load_configs())
+        database = Database()
+        container.database.override(database)
+        container.model_service.override(providers.Object(model_service))
+        monkeypatch.setattr(routes_module, "container", container)
+        
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            await database.connect()
+            yield
+            await container.inference_batcher().stop()
+            await database.disconnect()
+        
+        app = FastAPI(lifespan=lifespan)
+        app.include_router(routes_module.router)
+        client = TestClient(app)
+        client.__enter__()
+        clients.append(client)
+        return client
+    
+    yield make
+    for client in clients:
+        client.__exit__(None, None, None)
+
+
+def prediction_row(created_at: datetime, **values: Any) -> Dict[str, Any]:
+    """Строка таблицы predictions для вставки в тестах."""
+    row = {
+        "id": uuid4(),
+        "text": "text",
+        "text_hash": "0" * 64,
+        "text_length": 4,
+        "toxicity_score": 0.1,
+        "toxicity_level": "non_toxic",
+        "model_version": "test",
+        "confidence": 0.9,
+        "processing_time_ms": 1.0,
+        "sample_weight": 1.0,
+        "created_at": created_at,
+    }
+    row.update(values)
+    return row
+
+
+@pytest.fixture
+def pg_engine():
+    """
+    Синхронный engine PostgreSQL со схемой приложения в отдельной схеме БД.
+    
+    Таблицы создаются по моделям; у predictions одна DEFAULT партиция, в
+    которую попадают все строки. Параметры подключения - POSTGRES_* из
+    окружения; без POSTGRES_HOST или при недоступном сервере тест пропускается.
+    """
+    if not os.environ.get("POSTGRES_HOST"):
+        pytest.skip("POSTGRES_HOST не задан")
+    url = get_database_url(dict(load_configs()["database"], backend="postgres"), async_driver=False)
+    schema = f"test_{uuid4().hex[:12]}"
+    admin = create_engine(url)
+    try:
+        with admin.begin() as connection:
+            connection.execute(text(f"CREATE SCHEMA {schema}"))
+    except OperationalError as error:
+        admin.dispose()
+        pytest.skip(f"PostgreSQL недоступен: {error}")
+    
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema}"})
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE predictions_default PARTITION OF predictions DEFAULT")
+        )
+    yield engine
+    engine.dispose()
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    admin.dispose()
@@ -0,0 +1,166 @@
+"""Тесты контроля допуска: очередь, отклонения и адаптивный лимит (AIMD)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import application.admission as admission_module
+from application.admission import AdmissionController, OverloadedError
+
+
+class FakeClock:
+    """Управляемые монотонные часы для admission (event loop их не видит)."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(admission_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+async def run_request(controller: AdmissionController, clock: FakeClock, latency_ms: float) -> None:
+    async with controller.admit():
+        clock.now += latency_ms / 1000
+
+
+async def test_waiters_are_admitted_in_order_when_slots_free_up():
+    controller = AdmissionController(max_in_flight=1, max_queue_size=2, max_queue_wait_ms=1000)
+    order = []
+    release = asyncio.Event()
+    
+    async def request(name: str) -> None:
+        async with controller.admit():
+            order.append(name)
+            if name == "first":
+                await release.wait()
+    
+    tasks = [asyncio.ensure_future(request(name)) for name in ("first", "second", "third")]
+    await asyncio.sleep(0)
+    assert controller.stats()["in_flight"] == 1
+    assert controller.stats()["waiting"] == 2
+    
+    release.set()
+    await asyncio.gather(*tasks)
+    
+    assert order == ["first", "second", "third"]
+    assert controller.stats()["in_flight"] == 0
+    assert controller.stats()["admitted"] == 3
+
+
+async def test_full_queue_is_rejected_immediately():
+    controller = AdmissionController(max_in_flight=1, max_queue_size=0, retry_after_seconds=3)
+    
+    async with controller.admit():
+        with pytest.raises(OverloadedError) as error:
+            async with controller.admit():
+                pass
+    
+    assert (error.value.reason, error.value.retry_after) == ("queue_full", 3)
+    assert controller.stats()["rejected_queue_full"] == 1
+
+
+async def test_queue_wait_times_out():
+    controller = AdmissionController(max_in_flight=1, max_queue_size=4, max_queue_wait_ms=10)
+    
+    async with controller.admit():
+        with pytest.raises(OverloadedError) as error:
+            async with controller.admit():
+                pass
+    
+    assert error.value.reason == "queue_timeout"
+    assert controller.stats()["waiting"] == 0
+    assert controller.stats()["in_flight"] == 0
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    controller = AdmissionController(max_in_flight=1, max_queue_size=4, max_queue_wait_ms=1000)
+    
+    async with controller.admit():
+        waiter = asyncio.ensure_future(run_request(controller, FakeClock(), 0))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.stats()["waiting"] == 0
+    
+    assert controller.stats()["in_flight"] == 0
+
+
+async def test_aimd_decreases_once_per_target_window(clock):
+    controller = AdmissionController(
+        max_in_flight=10, adaptive=True, target_latency_ms=50, min_in_flight=2
+    )
+    release = asyncio.Event()
+    
+    async def slow_request() -> None:
+        async with controller.admit():
+            await release.wait()
+    
+    # Три медленных запроса завершаются одновременно: одно уменьшение
+    tasks = [asyncio.ensure_future(slow_request()) for _ in range(3)]
+    await asyncio.sleep(0)
+    clock.now += 0.1
+    release.set()
+    await asyncio.gather(*tasks)
+    assert controller.limit == pytest.approx(9.0)
+    
+    clock.now += 0.1
+    await run_request(controller, clock, latency_ms=100)
+    assert controller.limit == pytest.approx(8.1)
+
+
+async def test_aimd_limit_floor_gates_admission(clock):
+    controller = AdmissionController(
+        max_in_flight=10,
+        max_queue_wait_ms=1000,
+        adaptive=True,
+        target_latency_ms=50,
+        min_in_flight=2,
+    )
+    for _ in range(30):
+        await run_request(controller, clock, latency_ms=100)
+    assert controller.limit == 2.0
+    
+    release = asyncio.Event()
+    
+    async def held_request() -> None:
+        async with controller.admit():
+            await release.wait()
+    
+    tasks = [asyncio.ensure_future(held_request()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert (controller.stats()["in_flight"], controller.stats()["waiting"]) == (2, 1)
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_aimd_increases_additively_up_to_max(clock):
+    controller = AdmissionController(
+        max_in_flight=10, adaptive=True, target_latency_ms=50, min_in_flight=2
+    )
+    controller.limit = 5.0
+    
+    for _ in range(5):
+        await run_request(controller, clock, latency_ms=10)
+    # +1 / limit на каждый быстрый запрос: около +1 за окно из limit запросов
+    assert 5.9 < controller.limit < 6.0
+    
+    for _ in range(200):
+        await run_request(controller, clock, latency_ms=10)
+    assert controller.limit == 10.0
+
+
+async def test_static_limit_ignores_latency(clock):
+    controller = AdmissionController(max_in_flight=4, target_latency_ms=50)
+    
+    await run_request(controller, clock, latency_ms=500)
+    
+    assert controller.limit == 4.0
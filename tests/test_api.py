@@ -0,0 +1,77 @@
+"""Тесты HTTP API на SQLite с заглушкой модели."""
+
+import pytest
+
+from app.api.routes import get_history_use_case
+from infrastructure.text_codec import hash_placeholder, text_hash
+
+
+@pytest.mark.parametrize("mode", ["plain", "hash_only"])
+def test_predict_echoes_original_text(make_client, mode):
+    client = make_client(TEXT_STORAGE_MODE=mode)
+    
+    response = client.post("/api/v1/predict", json={"text": "private message", "persist": True})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["text"] == "private message"
+    
+    stored = client.get(f"/api/v1/predictions/{body['id']}")
+    expected = (
+        "private message" if mode == "plain" else hash_placeholder(text_hash("private message"))
+    )
+    assert stored.status_code == 200
+    assert stored.json()["text"] == expected
+
+
+def test_sqlite_stats_aggregate_history(make_client):
+    client = make_client()
+    for text in ("bad bad", "bad bad", "good text"):
+        response = client.post("/api/v1/predict", json={"text": text, "persist": True})
+        assert response.status_code == 200
+    
+    response = client.get("/api/v1/stats")
+    
+    assert response.status_code == 200
+    rows = {row["toxicity_level"]: row for row in response.json()}
+    assert sum(row["count"] for row in rows.values()) == 3
+    toxic = max(rows.values(), key=lambda row: row["score_histogram"][-1])
+    assert toxic["count"] == 2
+    assert toxic["score_histogram"][-1] == 2
+    assert toxic["model_version"] == "test"
+    assert toxic["mean_processing_time_ms"] >= 0
+
+
+class RecordingHistory:
+    """Use case истории, который отдает заданные пачки и запоминает фильтры."""
+    
+    def __init__(self, batches):
+        self.batches = batches
+        self.filters = None
+    
+    async def stream_rows(self, **filters):
+        self.filters = filters
+        for batch in self.batches:
+            yield batch
+
+
+def test_export_uses_injected_history_use_case(make_client):
+    client = make_client()
+    history = RecordingHistory([[{"id": "1", "text": "a"}], [{"id": "2", "text": "b"}]])
+    client.app.dependency_overrides[get_history_use_case] = lambda: history
+    
+    response = client.get(
+        "/api/v1/predictions/export", params={"toxicity_level": "toxic", "model_version": "v2"}
+    )
+    
+    assert response.status_code == 200
+    assert response.text.splitlines() == [
+        '{"id":"1","text":"a"}',
+        '{"id":"2","text":"b"}',
+    ]
+    assert history.filters == {
+        "created_from": None,
+        "created_to": None,
+        "toxicity_level": "toxic",
+        "model_version": "v2",
+    }
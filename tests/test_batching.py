@@ -0,0 +1,124 @@
+"""Тесты динамического батчинга одиночных предсказаний."""
+
+import asyncio
+from typing import List, Optional, Sequence
+
+import pytest
+
+from application.batching import InferenceBatcher
+from domain.exceptions import DeadlineExceeded
+from domain.value_objects import Deadline
+
+
+class RecordingModelService:
+    """Модель, которая запоминает пачки и сроки; score - длина текста / 100."""
+    
+    def __init__(self, fail_texts: Sequence[str] = (), expire_texts: Sequence[str] = ()):
+        self.fail_texts = set(fail_texts)
+        self.expire_texts = set(expire_texts)
+        self.batches: List[List[str]] = []
+        self.deadlines: List[Optional[list]] = []
+    
+    async def predict_batch(self, texts: List[str], deadlines: Optional[Sequence] = None):
+        self.batches.append(list(texts))
+        self.deadlines.append(list(deadlines) if deadlines is not None else None)
+        if self.fail_texts & set(texts):
+            raise RuntimeError("model failed")
+        return [
+            DeadlineExceeded("forward") if text in self.expire_texts else (len(text) / 100, 1.0)
+            for text in texts
+        ]
+    
+    def get_model_version(self) -> str:
+        return "test"
+
+
+@pytest.fixture
+async def make_batcher():
+    batchers = []
+    
+    def make(model, **kwargs) -> InferenceBatcher:
+        batcher = InferenceBatcher(model, **kwargs)
+        batchers.append(batcher)
+        return batcher
+    
+    yield make
+    for batcher in batchers:
+        await batcher.stop()
+
+
+async def test_concurrent_requests_share_one_batch(make_batcher):
+    model = RecordingModelService()
+    batcher = make_batcher(model, max_batch_size=8, max_wait_ms=20)
+    
+    results = await asyncio.gather(*(batcher.predict("x" * n) for n in range(1, 6)))
+    
+    assert results == [(n / 100, 1.0) for n in range(1, 6)]
+    assert model.batches == [["x", "xx", "xxx", "xxxx", "xxxxx"]]
+    assert batcher.stats()["mean_batch_size"] == 5
+
+
+async def test_batches_are_capped_by_max_batch_size(make_batcher):
+    model = RecordingModelService()
+    batcher = make_batcher(model, max_batch_size=2, max_wait_ms=20)
+    
+    await asyncio.gather(*(batcher.predict(str(n)) for n in range(5)))
+    
+    assert [len(batch) for batch in model.batches] == [2, 2, 1]
+
+
+async def test_expired_request_is_not_sent_to_model(make_batcher):
+    model = RecordingModelService()
+    batcher = make_batcher(model, max_wait_ms=5)
+    expired = Deadline(expires_at=0.0)
+    live = Deadline.after_ms(10_000)
+    
+    results = await asyncio.gather(
+        batcher.predict("late", deadline=expired),
+        batcher.predict("on time", deadline=live),
+        return_exceptions=True,
+    )
+    
+    assert isinstance(results[0], DeadlineExceeded)
+    assert results[0].stage == "preprocess"
+    assert results[1] == (0.07, 1.0)
+    assert model.batches == [["on time"]]
+    assert model.deadlines == [[live]]
+
+
+async def test_deadline_exceeded_in_model_fails_only_its_request(make_batcher):
+    model = RecordingModelService(expire_texts=["slow"])
+    batcher = make_batcher(model, max_wait_ms=5)
+    
+    results = await asyncio.gather(
+        batcher.predict("slow", deadline=Deadline.after_ms(10_000)),
+        batcher.predict("fast"),
+        return_exceptions=True,
+    )
+    
+    assert isinstance(results[0], DeadlineExceeded)
+    assert results[1] == (0.04, 1.0)
+
+
+async def test_model_failure_fails_batch_and_worker_keeps_running(make_batcher):
+    model = RecordingModelService(fail_texts=["boom"])
+    batcher = make_batcher(model, max_wait_ms=5)
+    
+    results = await asyncio.gather(
+        batcher.predict("boom"), batcher.predict("ok"), return_exceptions=True
+    )
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await batcher.predict("again") == (0.05, 1.0)
+
+
+async def test_cancelled_request_is_skipped(make_batcher):
+    model = RecordingModelService()
+    batcher = make_batcher(model, max_wait_ms=20)
+    
+    cancelled = asyncio.ensure_future(batcher.predict("gone"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    
+    assert await batcher.predict("kept") == (0.04, 1.0)
+    assert model.batches == [["kept"]]
@@ -0,0 +1,58 @@
+"""Тесты функции потерь дистилляции (model/distill.py)."""
+
+import pytest
+import torch
+from torch.nn import functional as F
+
+from model.distill import UNLABELED, distillation_loss
+
+TEMPERATURE = 2.0
+
+
+def soft_loss(student_logits, teacher_logits) -> torch.Tensor:
+    return F.kl_div(
+        F.log_softmax(student_logits / TEMPERATURE, dim=1),
+        F.softmax(teacher_logits / TEMPERATURE, dim=1),
+        reduction="batchmean",
+    ) * TEMPERATURE ** 2
+
+
+def make_targets(teacher_logits, labels) -> torch.Tensor:
+    return torch.cat([teacher_logits, torch.tensor(labels, dtype=torch.float32)[:, None]], dim=1)
+
+
+def test_cross_entropy_covers_only_labeled_rows():
+    torch.manual_seed(0)
+    student = torch.randn(4, 3)
+    teacher = torch.randn(4, 3)
+    targets = make_targets(teacher, [2, UNLABELED, 0, UNLABELED])
+    
+    loss = distillation_loss(student, targets, TEMPERATURE, alpha=0.3)
+    
+    # CE - среднее по двум размеченным строкам, а не по всему батчу
+    hard = F.cross_entropy(student[[0, 2]], torch.tensor([2, 0]))
+    expected = 0.3 * soft_loss(student, teacher) + 0.7 * hard
+    assert loss.item() == pytest.approx(expected.item(), rel=1e-6)
+
+
+def test_fully_labeled_batch_matches_plain_cross_entropy():
+    torch.manual_seed(1)
+    student = torch.randn(5, 3)
+    labels = [0, 1, 2, 1, 0]
+    
+    loss = distillation_loss(student, make_targets(torch.randn(5, 3), labels), TEMPERATURE, alpha=0)
+    
+    assert loss.item() == pytest.approx(F.cross_entropy(student, torch.tensor(labels)).item())
+
+
+def test_batch_without_labeled_rows_uses_soft_loss_only():
+    torch.manual_seed(2)
+    student = torch.randn(3, 3, requires_grad=True)
+    teacher = torch.randn(3, 3)
+    
+    loss = distillation_loss(student, make_targets(teacher, [UNLABELED] * 3), TEMPERATURE, 0.7)
+    loss.backward()
+    
+    assert torch.isfinite(loss)
+    assert loss.item() == pytest.approx(0.7 * soft_loss(student, teacher).item(), rel=1e-6)
+    assert torch.isfinite(student.grad).all()
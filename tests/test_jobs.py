@@ -0,0 +1,124 @@
+"""Тесты прогресса асинхронных заданий (JobStore на fakeredis) и эндпоинтов /jobs."""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from dependency_injector import providers
+
+import app.api.routes as routes_module
+import infrastructure.jobs as jobs_module
+from infrastructure.jobs import JobQueue, JobStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def store() -> JobStore:
+    return JobStore(client=fakeredis.FakeRedis(decode_responses=True), ttl_seconds=60)
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """Подменить group Celery: сигнатуры чанков сохраняются, брокер не нужен."""
+    signatures = []
+    
+    def fake_group(tasks):
+        signatures.extend(tasks)
+        result = SimpleNamespace(id="group-1", save=lambda: None)
+        return SimpleNamespace(apply_async=lambda: result)
+    
+    monkeypatch.setattr(jobs_module, "group", fake_group)
+    return signatures
+
+
+def test_progress_is_derived_from_chunk_outcomes(store):
+    store.create("job", total=5, chunk_size=2, chunks=3)
+    
+    store.record("job", 0)
+    store.record("job", 4, failed=True)
+    
+    meta = store.get("job")
+    assert (meta["processed"], meta["failed"]) == (2, 1)
+
+
+def test_redelivered_chunk_is_counted_once(store):
+    store.create("job", total=4, chunk_size=2, chunks=2)
+    
+    store.record("job", 0)
+    store.record("job", 0)
+    store.record("job", 2, failed=True)
+    store.record("job", 2)
+    
+    meta = store.get("job")
+    assert (meta["processed"], meta["failed"]) == (4, 0)
+
+
+def test_record_after_expiry_does_not_recreate_the_key(store):
+    store.create("job", total=2, chunk_size=2, chunks=1)
+    store._client.delete(JobStore.key("job"))
+    
+    assert store.record("job", 0) is False
+    assert store.get("job") is None
+    assert not store._client.exists(JobStore.key("job"))
+
+
+def test_record_keeps_the_job_ttl(store):
+    store.create("job", total=2, chunk_size=2, chunks=1)
+    
+    assert store.record("job", 0) is True
+    
+    assert 0 < store._client.ttl(JobStore.key("job")) <= 60
+
+
+def test_status_moves_from_queued_to_failed(store):
+    queue = JobQueue(store=store, chunk_size=2)
+    store.create("job", total=3, chunk_size=2, chunks=2)
+    
+    assert queue.status("job")["status"] == "queued"
+    store.record("job", 0)
+    assert queue.status("job")["status"] == "running"
+    store.record("job", 2, failed=True)
+    job = queue.status("job")
+    assert (job["status"], job["processed"], job["failed"]) == ("failed", 2, 1)
+
+
+def test_create_job_endpoint_queues_chunks(make_client, store, submitted):
+    client = make_client(backend="memory")
+    queue = JobQueue(store=store, chunk_size=2)
+    routes_module.container.job_queue.override(providers.Object(queue))
+    
+    response = client.post("/api/v1/jobs", json={"texts": ["a", "b", "c"]})
+    
+    assert response.status_code == 202
+    body = response.json()
+    assert (body["status"], body["total"], body["chunks"]) == ("queued", 3, 2)
+    assert [signature.args[1] for signature in submitted] == [0, 2]
+    assert all(signature.kwargs["job_id"] == body["job_id"] for signature in submitted)
+    assert store.get(body["job_id"])["group_id"] == "group-1"
+
+
+def test_create_job_endpoint_rejects_too_many_texts(make_client, store, submitted):
+    client = make_client(backend="memory", JOB_MAX_TEXTS="2")
+    
+    response = client.post("/api/v1/jobs", json={"texts": ["a", "b", "c"]})
+    
+    assert response.status_code == 413
+    assert submitted == []
+
+
+def test_get_job_endpoint_reports_progress(make_client, store):
+    client = make_client(backend="memory")
+    routes_module.container.job_queue.override(providers.Object(JobQueue(store=store)))
+    job_id = str(uuid4())
+    store.create(job_id, total=3, chunk_size=2, chunks=2)
+    store.record(job_id, 0)
+    store.record(job_id, 0)
+    
+    response = client.get(f"/api/v1/jobs/{job_id}")
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["status"], body["processed"], body["failed"]) == ("running", 2, 0)
+    assert body["results"] is None
+    assert client.get(f"/api/v1/jobs/{uuid4()}").status_code == 404
@@ -0,0 +1,83 @@
+"""Тесты in-memory хранилища предсказаний: режимы хранения текста и вытеснение."""
+
+import pytest
+
+from domain.entities import PredictionResult
+from infrastructure.memory_repositories import InMemoryPredictionRepository, InMemoryPredictionStore
+from infrastructure.text_codec import TextCodec, hash_placeholder, text_hash
+
+
+def make_prediction(text: str, score: float = 0.1) -> PredictionResult:
+    return PredictionResult.create(
+        text=text,
+        toxicity_score=score,
+        model_version="test",
+        processing_time_ms=1.0,
+    )
+
+
+async def test_plain_mode_keeps_text():
+    repository = InMemoryPredictionRepository(InMemoryPredictionStore())
+    prediction = make_prediction("hello world")
+    
+    await repository.save(prediction)
+    
+    stored = await repository.get_by_id(prediction.id)
+    assert stored.text_classification.text == "hello world"
+    assert [p.id for p in await repository.get_by_text("hello world")] == [prediction.id]
+
+
+async def test_hash_only_mode_does_not_keep_text():
+    store = InMemoryPredictionStore(text_codec=TextCodec("hash_only"))
+    repository = InMemoryPredictionRepository(store)
+    prediction = make_prediction("secret text")
+    
+    saved = await repository.save(prediction)
+    
+    placeholder = hash_placeholder(text_hash("secret text"))
+    assert saved.text_classification.text == "secret text"
+    assert all(p.text_classification.text == placeholder for p in store.predictions)
+    assert (await repository.get_by_id(prediction.id)).text_classification.text == placeholder
+    assert (await repository.get_history_row_by_id(prediction.id))["text"] == placeholder
+    assert [p.id for p in await repository.get_by_text("secret text")] == [prediction.id]
+
+
+async def test_zstd_mode_decodes_on_read():
+    pytest.importorskip("zstandard")
+    store = InMemoryPredictionStore(text_codec=TextCodec("zstd"))
+    repository = InMemoryPredictionRepository(store)
+    prediction = make_prediction("compressed text")
+    
+    await repository.save(prediction)
+    
+    assert "compressed text" not in [p.text_classification.text for p in store.predictions]
+    assert (await repository.get_by_id(prediction.id)).text_classification.text == "compressed text"
+    rows = [row async for batch in repository.stream_history_rows() for row in batch]
+    assert [row["text"] for row in rows] == ["compressed text"]
+
+
+async def test_oldest_predictions_are_evicted():
+    store = InMemoryPredictionStore(max_size=3)
+    repository = InMemoryPredictionRepository(store)
+    predictions = [make_prediction(text) for text in ["a", "b", "a", "c", "d"]]
+    
+    for prediction in predictions:
+        await repository.save(prediction)
+    
+    assert [p.id for p in await repository.get_all()] == [p.id for p in predictions[:1:-1]]
+    assert set(store.by_id) == {p.id for p in predictions[2:]}
+    assert await repository.get_by_id(predictions[0].id) is None
+    assert [p.id for p in await repository.get_by_text("a")] == [predictions[2].id]
+    assert "b" not in [p.text_classification.text for p in store.predictions]
+    assert text_hash("b") not in store.by_text_hash
+
+
+async def test_get_all_paginates_newest_first():
+    repository = InMemoryPredictionRepository(InMemoryPredictionStore())
+    predictions = [make_prediction(f"text {i}") for i in range(5)]
+    for prediction in predictions:
+        await repository.save(prediction)
+    
+    page = await repository.get_all(limit=2, offset=1)
+    
+    assert [p.id for p in page] == [predictions[3].id, predictions[2].id]
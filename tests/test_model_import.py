@@ -0,0 +1,78 @@
+"""
+Тест импорта model.modeling в чистом интерпретаторе.
+
+Сервис импортирует классификатор при старте: импорт не должен тянуть
+зависимости обучения и слой application, открывать файлы (модель,
+данные, конфиг), ходить в сеть или запускать обучение. Проверки - как в
+benchmarks/bench_model_import.py, файлы и сеть отслеживаются audit hook.
+Время импорта не проверяется: оно зависит от машины (замер - в бенчмарке).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_model_import import FORBIDDEN_MODULES
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Файлы, которые открывает сам механизм импорта
+CODE_SUFFIXES = (".py", ".pyc", ".so", ".pyd")
+
+CHILD_CODE = """
+import json, sys
+import torch
+
+events = []
+
+def audit(event, args):
+    if event == "open" or event.startswith("socket."):
+        flags = args[2] if event == "open" and isinstance(args[2], int) else 0
+        events.append([event, str(args[0]) if args else "", flags])
+
+sys.addaudithook(audit)
+import model.modeling
+from model.modeling import TextClassifier
+print(json.dumps({"modules": sorted(sys.modules), "events": events}))
+"""
+
+
+def import_in_subprocess() -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def imported():
+    pytest.importorskip("torch")
+    return import_in_subprocess()
+
+
+def test_no_training_dependencies_are_imported(imported):
+    loaded = set(imported["modules"])
+    
+    assert [name for name in FORBIDDEN_MODULES if name in loaded] == []
+    # application.services импортирует model.modeling, а не наоборот
+    assert [name for name in loaded if name.split(".")[0] == "application"] == []
+
+
+def test_no_file_or_network_access(imported):
+    events = imported["events"]
+    
+    assert [event for event in events if event[0].startswith("socket.")] == []
+    opened = [event for event in events if event[0] == "open"]
+    assert [path for _, path, _ in opened if not path.endswith(CODE_SUFFIXES)] == []
+    write_flags = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND
+    assert [path for _, path, flags in opened if flags & write_flags] == []
+
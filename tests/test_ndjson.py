@@ -0,0 +1,100 @@
+"""Тесты разбора NDJSON потока и сообщений с текстом."""
+
+import orjson
+
+from app.api.serializers import iter_ndjson_items, parse_text_item
+
+
+async def chunked(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def parse(*chunks: bytes, max_line_bytes: int = 65536):
+    stream = iter_ndjson_items(chunked(*chunks), max_line_bytes=max_line_bytes)
+    return [item async for item in stream]
+
+
+def test_parse_text_item_variants():
+    assert parse_text_item(b'{"id": 7, "text": "  hi  ", "persist": true, "deadline_ms": 50}') == {
+        "id": 7,
+        "text": "hi",
+        "persist": True,
+        "deadline_ms": 50,
+    }
+    assert parse_text_item('"plain string"') == {"id": None, "text": "plain string"}
+    assert parse_text_item(b"{broken") == {"id": None, "error": "invalid JSON"}
+    assert parse_text_item(b'{"id": 1, "text": "   "}') == {
+        "id": 1,
+        "error": "text must be a non-empty string",
+    }
+    # persist и deadline_ms неверного типа игнорируются
+    raw = b'{"id": 2, "text": "x", "persist": "yes", "deadline_ms": true}'
+    assert parse_text_item(raw) == {"id": 2, "text": "x"}
+
+
+async def test_lines_split_across_chunks():
+    items = await parse(
+        b'{"id": 1, "text": "first"}\n{"id": 2, "te',
+        b'xt": "second"}\n',
+        b'{"id": 3, "text": "last"}',
+    )
+    
+    assert items == [
+        {"id": 1, "text": "first"},
+        None,
+        {"id": 2, "text": "second"},
+        None,
+        None,
+        {"id": 3, "text": "last"},
+    ]
+
+
+async def test_blank_and_invalid_lines():
+    items = await parse(b'\n\r\n{"id": 1, "text": "ok"}\r\nnot json\n')
+    
+    assert [item for item in items if item is not None] == [
+        {"id": 1, "text": "ok"},
+        {"id": None, "error": "invalid JSON"},
+    ]
+
+
+async def test_long_line_is_skipped_with_one_error():
+    long_text = orjson.dumps({"id": 1, "text": "x" * 100})
+    items = await parse(
+        long_text[:40],
+        long_text[40:80],
+        long_text[80:] + b'\n{"id": 2, "text": "after"}\n',
+        max_line_bytes=32,
+    )
+    
+    assert [item for item in items if item is not None] == [
+        {"id": None, "error": "line longer than 32 bytes"},
+        {"id": 2, "text": "after"},
+    ]
+
+
+async def test_long_line_within_one_chunk():
+    body = b'{"id": 1, "text": "' + b"y" * 64 + b'"}\n{"id": 2, "text": "short"}\n'
+    items = await parse(body, max_line_bytes=32)
+    
+    assert [item for item in items if item is not None] == [
+        {"id": None, "error": "line longer than 32 bytes"},
+        {"id": 2, "text": "short"},
+    ]
+
+
+def test_stream_endpoint_scores_lines_in_order(make_client):
+    client = make_client(backend="memory", INFERENCE_BATCH_SIZE="2")
+    texts = ["good word", "bad word"] * 3
+    lines = [{"id": number, "text": texts[number]} for number in range(5)]
+    body = b"".join(orjson.dumps(line) + b"\n" for line in lines)
+    
+    response = client.post("/api/v1/predict/stream", content=body + b"oops\n")
+    
+    assert response.status_code == 200
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["id"] for row in rows] == [0, 1, 2, 3, 4, None]
+    levels = [row["toxicity_level"] for row in rows[:5]]
+    assert levels == ["non_toxic", "toxic", "non_toxic", "toxic", "non_toxic"]
+    assert rows[5] == {"id": None, "error": "invalid JSON"}
@@ -0,0 +1,90 @@
+"""Тесты политики выборочного сохранения и взвешенной статистики."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from application.persistence import PersistencePolicy
+from domain.entities import PredictionResult
+from infrastructure.memory_repositories import (
+    InMemoryPredictionRepository,
+    InMemoryPredictionStatsRepository,
+    InMemoryPredictionStore,
+)
+
+
+def make_prediction(score: float, processing_time_ms: float = 10.0) -> PredictionResult:
+    return PredictionResult.create(
+        text="some text",
+        toxicity_score=score,
+        model_version="test",
+        processing_time_ms=processing_time_ms,
+    )
+
+
+def test_toxic_predictions_are_always_persisted():
+    policy = PersistencePolicy(benign_sample_rate=0.0, random_func=lambda: 0.0)
+    prediction = make_prediction(0.9)
+    
+    assert policy.should_persist(prediction)
+    assert prediction.sample_weight == 1.0
+    assert policy.snapshot()["persisted_toxic"] == 1
+
+
+def test_benign_predictions_are_sampled_with_inverse_weight():
+    draws = iter([0.05, 0.5, 0.24, 0.99])
+    policy = PersistencePolicy(benign_sample_rate=0.25, random_func=lambda: next(draws))
+    predictions = [make_prediction(0.1) for _ in range(4)]
+    
+    decisions = [policy.should_persist(p) for p in predictions]
+    
+    assert decisions == [True, False, True, False]
+    assert [p.sample_weight for p, saved in zip(predictions, decisions) if saved] == [4.0, 4.0]
+    snapshot = policy.snapshot()
+    assert snapshot["persisted_sampled"] == 2
+    assert snapshot["skipped_sampled"] == 2
+
+
+def test_override_takes_precedence_with_unit_weight():
+    policy = PersistencePolicy(benign_sample_rate=0.5, random_func=lambda: 0.0)
+    prediction = make_prediction(0.1)
+    
+    assert policy.should_persist(prediction)
+    assert prediction.sample_weight == 2.0
+    assert policy.should_persist(prediction, override=True)
+    assert prediction.sample_weight == 1.0
+    assert not policy.should_persist(make_prediction(0.9), override=False)
+    snapshot = policy.snapshot()
+    assert (snapshot["persisted_forced"], snapshot["skipped_forced"]) == (1, 1)
+
+
+@pytest.mark.parametrize("rate", [-0.1, 1.5])
+def test_invalid_sample_rate_is_rejected(rate):
+    with pytest.raises(ValueError):
+        PersistencePolicy(benign_sample_rate=rate)
+
+
+async def test_stats_estimate_all_predictions_from_sampled_rows():
+    store = InMemoryPredictionStore()
+    repository = InMemoryPredictionRepository(store)
+    stats = InMemoryPredictionStatsRepository(store)
+    draws = iter([0.0, 0.9] * 50)
+    policy = PersistencePolicy(benign_sample_rate=0.5, random_func=lambda: next(draws))
+    
+    for _ in range(100):
+        prediction = make_prediction(0.1, processing_time_ms=4.0)
+        if policy.should_persist(prediction):
+            await repository.save(prediction)
+    toxic = make_prediction(0.9, processing_time_ms=20.0)
+    if policy.should_persist(toxic):
+        await repository.save(toxic)
+    
+    now = datetime.utcnow()
+    rows = await stats.get_hourly_stats(now - timedelta(hours=1), now + timedelta(hours=1))
+    
+    assert len(store.predictions) == 51
+    by_level = {row["toxicity_level"]: row for row in rows}
+    assert by_level["non_toxic"]["count"] == 100
+    assert by_level["non_toxic"]["score_histogram"][1] == 100
+    assert by_level["non_toxic"]["mean_processing_time_ms"] == pytest.approx(4.0)
+    assert sum(row["count"] for row in rows) == 101
@@ -0,0 +1,188 @@
+"""Тесты удаления строк старше срока хранения пачками (infrastructure/retention.py)."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from sqlalchemy import text
+
+import infrastructure.retention as retention_module
+from infrastructure.models import PredictionORM
+from infrastructure.partitioning import retention_cutoff, unpartitioned_rows_table
+from infrastructure.retention import RETENTION_WATERMARK, RetentionRun, delete_expired_rows
+from tests.conftest import prediction_row
+
+
+class FakeClock:
+    """Монотонные часы: sleep и пачки сдвигают время без реального ожидания."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.pauses: List[float] = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float) -> None:
+        self.pauses.append(seconds)
+        self.now += seconds
+
+
+class ScriptedBatches:
+    """
+    Заглушка _delete_batch: удаляет заданное количество строк за пачку.
+    
+    Args:
+        clock: Часы, которые пачка сдвигает на batch_seconds
+        deleted: Количество удаленных строк по пачкам (последнее повторяется)
+        batch_seconds: Длительность одной пачки
+    """
+    
+    def __init__(self, clock: FakeClock, deleted: List[int], batch_seconds: float = 0.0):
+        self.clock = clock
+        self.deleted = deleted
+        self.batch_seconds = batch_seconds
+        self.positions = []
+    
+    def __call__(self, engine, table, cutoff, batch_size, position):
+        self.positions.append(position)
+        self.clock.now += self.batch_seconds
+        index = len(self.positions) - 1
+        deleted = self.deleted[min(index, len(self.deleted) - 1)]
+        return deleted, (cutoff, f"id-{index}") if deleted else position
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    fake_time = SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep)
+    monkeypatch.setattr(retention_module, "time", fake_time)
+    return clock
+
+
+@pytest.fixture
+def saved_runs(monkeypatch) -> List[RetentionRun]:
+    """Запуски, сохраненные _save_run; начальная позиция - None."""
+    runs = []
+    monkeypatch.setattr(retention_module, "_load_position", lambda engine, table, cutoff: None)
+    monkeypatch.setattr(
+        retention_module,
+        "_save_run",
+        lambda engine, table, cutoff, position, run: runs.append((position, run)),
+    )
+    return runs
+
+
+def run_with(monkeypatch, batches: ScriptedBatches, **kwargs) -> RetentionRun:
+    monkeypatch.setattr(retention_module, "_delete_batch", batches)
+    return delete_expired_rows(None, retention_days=30, **kwargs)
+
+
+def test_batches_run_until_an_incomplete_batch(monkeypatch, clock, saved_runs):
+    batches = ScriptedBatches(clock, [5, 5, 2])
+    
+    run = run_with(monkeypatch, batches, batch_size=5, pause_seconds=0.1)
+    
+    assert (run.deleted_rows, run.batches, run.completed) == (12, 3, True)
+    # Каждая пачка продолжает с позиции предыдущей
+    cutoff = retention_cutoff(30)
+    assert batches.positions == [None, (cutoff, "id-0"), (cutoff, "id-1")]
+    assert clock.pauses == [0.1, 0.1]
+    assert saved_runs == [((cutoff, "id-2"), run)]
+
+
+def test_empty_batch_after_full_ones_completes_the_run(monkeypatch, clock, saved_runs):
+    batches = ScriptedBatches(clock, [5, 5, 0])
+    
+    run = run_with(monkeypatch, batches, batch_size=5, pause_seconds=0)
+    
+    assert (run.deleted_rows, run.batches, run.completed) == (10, 3, True)
+    # Пустая пачка не сдвигает позицию
+    assert saved_runs[0][0] == (retention_cutoff(30), "id-1")
+
+
+def test_run_stops_at_max_runtime_and_is_saved_incomplete(monkeypatch, clock, saved_runs):
+    batches = ScriptedBatches(clock, [5], batch_seconds=4)
+    
+    run = run_with(monkeypatch, batches, batch_size=5, pause_seconds=0, max_runtime_seconds=10)
+    
+    assert (run.deleted_rows, run.batches, run.completed) == (15, 3, False)
+    assert run.seconds == 12
+    assert saved_runs[0][1].completed is False
+
+
+def test_rate_limit_pause_keeps_the_average_rate(monkeypatch, clock, saved_runs):
+    batches = ScriptedBatches(clock, [100, 100, 100, 0], batch_seconds=0.5)
+    
+    run = run_with(monkeypatch, batches, batch_size=100, pause_seconds=0.1, max_rows_per_second=50)
+    
+    # После k пачек по 100 строк прошло не меньше 2k секунд
+    assert clock.pauses == pytest.approx([1.5, 1.5, 1.5])
+    assert run.deleted_rows == 300
+    assert run.rows_per_second <= 50
+
+
+def test_pause_seconds_applies_when_under_the_rate_limit(monkeypatch, clock, saved_runs):
+    batches = ScriptedBatches(clock, [10, 10, 0], batch_seconds=1)
+    
+    run_with(monkeypatch, batches, batch_size=10, pause_seconds=0.2, max_rows_per_second=1000)
+    
+    assert clock.pauses == [0.2, 0.2]
+
+
+def insert(engine, rows) -> None:
+    with engine.begin() as connection:
+        connection.execute(PredictionORM.__table__.insert(), rows)
+
+
+def count(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT count(*) FROM predictions")).scalar()
+
+
+def saved_details(engine) -> dict:
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT details FROM task_watermarks WHERE name = :name"),
+            {"name": RETENTION_WATERMARK},
+        ).scalar()
+
+
+@pytest.mark.postgres
+def test_expired_rows_in_default_partition_are_deleted(pg_engine):
+    cutoff = retention_cutoff(30)
+    insert(pg_engine, [prediction_row(cutoff - timedelta(hours=i + 1)) for i in range(7)])
+    insert(pg_engine, [prediction_row(cutoff + timedelta(minutes=i)) for i in range(3)])
+    with pg_engine.connect() as connection:
+        table = unpartitioned_rows_table(connection)
+    
+    run = delete_expired_rows(pg_engine, 30, table=table, batch_size=3, pause_seconds=0)
+    
+    assert table == "predictions_default"
+    assert (run.deleted_rows, run.batches, run.completed) == (7, 3, True)
+    assert count(pg_engine) == 3
+    details = saved_details(pg_engine)
+    assert details["deleted_rows"] == 7
+    assert details["completed"] is True
+    assert details["cutoff"] == cutoff.isoformat()
+
+
+@pytest.mark.postgres
+def test_interrupted_pass_resumes_from_the_saved_key(pg_engine):
+    cutoff = retention_cutoff(30)
+    insert(pg_engine, [prediction_row(cutoff - timedelta(hours=10 - i)) for i in range(6)])
+    retention_module._load_position(pg_engine, "predictions", cutoff)
+    # Пачка прерванного запуска: позиция сохранена в ее транзакции
+    deleted, _ = retention_module._delete_batch(pg_engine, "predictions", cutoff, 2)
+    # Строка с ключом меньше позиции, вставленная после прерванного запуска
+    insert(pg_engine, [prediction_row(cutoff - timedelta(hours=20))])
+    
+    resumed = delete_expired_rows(pg_engine, 30, batch_size=10, pause_seconds=0)
+    
+    assert deleted == 2
+    assert resumed.deleted_rows == 4
+    assert count(pg_engine) == 1
+    # Завершенный проход не продолжается: следующий начинает с наименьшего ключа
+    assert delete_expired_rows(pg_engine, 30, batch_size=10, pause_seconds=0).deleted_rows == 1
+    assert count(pg_engine) == 0
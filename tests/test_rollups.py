@@ -0,0 +1,84 @@
+"""Тесты инкрементального rollup почасовой статистики (PostgreSQL)."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from infrastructure.models import PredictionORM
+from infrastructure.rollups import STATS_WATERMARK, refresh_hourly_stats
+from tests.conftest import prediction_row
+
+pytestmark = pytest.mark.postgres
+
+
+def insert(connection, rows) -> None:
+    connection.execute(PredictionORM.__table__.insert(), rows)
+
+
+def refresh(engine) -> int:
+    with engine.begin() as connection:
+        return refresh_hourly_stats(connection, lag_seconds=0)
+
+
+def total_count(engine) -> float:
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT coalesce(sum(count), 0) FROM prediction_stats_hourly")
+        ).scalar()
+
+
+def watermark(engine) -> datetime:
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT watermark FROM task_watermarks WHERE name = :name"),
+            {"name": STATS_WATERMARK},
+        ).scalar()
+
+
+def test_first_run_counts_rows_without_inserted_at(pg_engine):
+    created_at = datetime.now(timezone.utc) - timedelta(hours=3)
+    with pg_engine.begin() as connection:
+        insert(connection, [prediction_row(created_at, inserted_at=None) for _ in range(2)])
+        insert(connection, [prediction_row(created_at, sample_weight=4.0)])
+    
+    refresh(pg_engine)
+    
+    assert total_count(pg_engine) == 6
+    assert watermark(pg_engine) is not None
+
+
+def test_watermark_advances_and_rows_are_counted_once(pg_engine):
+    created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    with pg_engine.begin() as connection:
+        insert(connection, [prediction_row(created_at)])
+    refresh(pg_engine)
+    first = watermark(pg_engine)
+    
+    with pg_engine.begin() as connection:
+        insert(connection, [prediction_row(created_at) for _ in range(2)])
+        # Строка без inserted_at после первого запуска уже учтена бы им
+        insert(connection, [prediction_row(created_at, inserted_at=None)])
+    refresh(pg_engine)
+    
+    assert watermark(pg_engine) > first
+    assert total_count(pg_engine) == 3
+    refresh(pg_engine)
+    assert total_count(pg_engine) == 3
+
+
+def test_rows_of_an_open_transaction_are_counted_after_commit(pg_engine):
+    created_at = datetime.now(timezone.utc)
+    with pg_engine.connect() as writer:
+        transaction = writer.begin()
+        insert(writer, [prediction_row(created_at)])
+        
+        refresh(pg_engine)
+        
+        # Окно не дошло до строки открытой транзакции
+        assert total_count(pg_engine) == 0
+        transaction.commit()
+    
+    refresh(pg_engine)
+    
+    assert total_count(pg_engine) == 1
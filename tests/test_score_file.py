@@ -0,0 +1,153 @@
+"""Тесты офлайн оценки файла: форматы, поля текста и id, возобновление по checkpoint."""
+
+import json
+import os
+
+import pytest
+
+import model.score_file as score_file_module
+from model.score_file import (
+    INPUT_FORMATS,
+    OUTPUT_FORMATS,
+    build_parser,
+    detect_format,
+    iter_records,
+    score_file,
+)
+
+
+def fake_score(chunk):
+    """Оценка чанка без модели: score - доля слов "bad" (в процессе пула)."""
+    rows = []
+    for record_id, text in chunk:
+        words = text.split() or [""]
+        score = sum(word == "bad" for word in words) / len(words)
+        rows.append(
+            {"id": record_id, "toxicity_score": score, "toxicity_level": "x", "confidence": 1.0}
+        )
+    return rows
+
+
+def failing_score(chunk):
+    """Как fake_score, но падает на чанке со строкой id >= 6 (прерванный запуск)."""
+    if any(int(record_id) >= 6 for record_id, _ in chunk):
+        raise RuntimeError("worker crashed")
+    return fake_score(chunk)
+
+
+@pytest.fixture
+def no_model(monkeypatch):
+    """Процессы пула (fork) наследуют подмену: модель не загружается."""
+    monkeypatch.setattr(score_file_module, "_init_worker", lambda torch_threads: None)
+    monkeypatch.setattr(score_file_module, "_score_chunk", fake_score)
+
+
+def write_jsonl(path, rows) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+@pytest.mark.parametrize(
+    "path, formats, expected",
+    [
+        ("comments.csv", INPUT_FORMATS, "csv"),
+        ("comments.JSONL", INPUT_FORMATS, "jsonl"),
+        ("comments.ndjson", INPUT_FORMATS, "jsonl"),
+        ("comments.pq", INPUT_FORMATS, "parquet"),
+        ("scores.csv", OUTPUT_FORMATS, "csv"),
+    ],
+)
+def test_detect_format_by_extension(path, formats, expected):
+    assert detect_format(path, formats) == expected
+
+
+@pytest.mark.parametrize(
+    "path, formats",
+    [("comments.txt", INPUT_FORMATS), ("out.parquet", OUTPUT_FORMATS)],
+)
+def test_detect_format_rejects_unknown_extension(path, formats):
+    with pytest.raises(ValueError, match="Cannot detect format"):
+        detect_format(path, formats)
+
+
+def test_jsonl_text_and_id_fields(tmp_path):
+    path = tmp_path / "in.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"comment": "first", "key": "a"}\n')
+        f.write("\n")
+        f.write('"plain string"\n')
+        f.write('{"comment": null}\n')
+        f.write("not json\n")
+    
+    records = list(iter_records(str(path), "jsonl", text_field="comment", id_field="key"))
+    
+    # Пустые строки пропускаются, без id - номер строки, битая строка - пустой текст
+    assert records == [("a", "first"), (1, "plain string"), (2, ""), (3, "")]
+
+
+def test_csv_text_and_id_fields_with_skip(tmp_path):
+    path = tmp_path / "in.csv"
+    path.write_text('key,comment\nx1,"multi\nline"\nx2,second\nx3,third\n', encoding="utf-8")
+    
+    records = list(iter_records(str(path), "csv", text_field="comment", id_field="key", skip=1))
+    
+    assert records == [("x2", "second"), ("x3", "third")]
+    with pytest.raises(ValueError, match="not found"):
+        list(iter_records(str(path), "csv", text_field="text"))
+
+
+def test_parquet_without_id_column_uses_row_numbers(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "in.parquet"
+    pd.DataFrame({"comment": ["a", None, "c"]}).to_parquet(path)
+    
+    records = list(iter_records(str(path), "parquet", text_field="comment", skip=1))
+    
+    assert records == [(1, ""), (2, "c")]
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path, monkeypatch, no_model):
+    source = tmp_path / "in.jsonl"
+    write_jsonl(source, [{"id": str(i), "body": "bad" if i % 2 else "good"} for i in range(10)])
+    argv = ["--text-field", "body", "--workers", "1", "--chunk-size", "2", "--report-every", "1000"]
+    expected_path = tmp_path / "expected.jsonl"
+    score_file(build_parser().parse_args([str(source), str(expected_path), *argv]))
+    
+    output = tmp_path / "out.jsonl"
+    args = build_parser().parse_args([str(source), str(output), *argv])
+    monkeypatch.setattr(score_file_module, "_score_chunk", failing_score)
+    with pytest.raises(RuntimeError, match="worker crashed"):
+        score_file(args)
+    checkpoint = json.loads((tmp_path / "out.jsonl.checkpoint").read_text())
+    assert checkpoint["rows_done"] == 6
+    # Запись, оборванная после последнего checkpoint
+    with open(output, "ab") as f:
+        f.write(b'{"id": "6", "toxicity_sc')
+    
+    monkeypatch.setattr(score_file_module, "_score_chunk", fake_score)
+    result = score_file(args)
+    
+    assert (result["scored"], result["rows_total"]) == (4, 10)
+    assert output.read_bytes() == expected_path.read_bytes()
+    assert not os.path.exists(tmp_path / "out.jsonl.checkpoint")
+
+
+def test_resume_refuses_output_shorter_than_checkpoint(tmp_path, monkeypatch, no_model):
+    source = tmp_path / "in.jsonl"
+    write_jsonl(source, [{"id": str(i), "text": "text"} for i in range(8)])
+    output = tmp_path / "out.csv"
+    argv = [str(source), str(output), "--workers", "1", "--chunk-size", "2"]
+    args = build_parser().parse_args(argv)
+    monkeypatch.setattr(score_file_module, "_score_chunk", failing_score)
+    with pytest.raises(RuntimeError):
+        score_file(args)
+    output.write_text("")
+    
+    monkeypatch.setattr(score_file_module, "_score_chunk", fake_score)
+    with pytest.raises(ValueError, match="use --restart"):
+        score_file(args)
+    args.restart = True
+    assert score_file(args)["rows_total"] == 8
+    assert len(output.read_text().splitlines()) == 9
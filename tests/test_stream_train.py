@@ -0,0 +1,125 @@
+"""Тесты хешированного TF-IDF (model/hashing.py) и частей out-of-core обучения."""
+
+import math
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+from model.artifacts import ArtifactStore
+from model.hashing import DocumentFrequency, HashedTfidfVectorizer, make_hasher
+from model.stream_train import ChunkStream, hash_stage, load_vectorizer
+from model.train import LABEL_COLUMN, TEXT_COLUMN
+
+N_FEATURES = 2 ** 20
+
+CORPUS = [
+    "you are a good person",
+    "you are a bad bad person",
+    "good morning and good night",
+    "bad words are bad",
+    "night person",
+]
+
+# Предобработка не нужна: тексты уже в нижнем регистре
+PLAIN = SimpleNamespace(preprocess=lambda text: text)
+
+
+def hashed_columns(terms):
+    """Столбец хеширования каждого термина словаря TfidfVectorizer."""
+    columns = []
+    for term in terms:
+        n = len(term.split())
+        hasher = HashingVectorizer(n_features=N_FEATURES, ngram_range=(n, n), alternate_sign=False)
+        columns.append(hasher.transform([term]).indices[0])
+    # Без коллизий на маленьком корпусе столбцы взаимно однозначны с терминами
+    assert len(set(columns)) == len(columns)
+    return np.asarray(columns)
+
+
+def test_hashed_tfidf_matches_smooth_idf_tfidf():
+    reference = TfidfVectorizer(ngram_range=(1, 2), smooth_idf=True)
+    expected = reference.fit_transform(CORPUS).toarray()
+    columns = hashed_columns(reference.get_feature_names_out())
+    hasher = make_hasher(N_FEATURES, (1, 2))
+    frequency = DocumentFrequency(N_FEATURES)
+    # df накапливается по частям корпуса
+    frequency.update(hasher.transform(CORPUS[:2]))
+    frequency.update(hasher.transform(CORPUS[2:]))
+    vectorizer = HashedTfidfVectorizer(frequency.idf(), (1, 2))
+    
+    weighted = vectorizer.weight(hasher.transform(CORPUS))
+    
+    np.testing.assert_allclose(frequency.idf()[columns], reference.idf_, rtol=1e-6)
+    assert weighted.nnz == np.count_nonzero(expected)
+    np.testing.assert_allclose(weighted[:, columns].toarray(), expected, rtol=1e-5, atol=1e-7)
+    np.testing.assert_allclose(vectorizer.transform(CORPUS).toarray(), weighted.toarray())
+
+
+def test_weight_keeps_empty_rows_and_input_counts():
+    vectorizer = HashedTfidfVectorizer(np.full(8, 2.0), (1, 1))
+    counts = sparse.csr_matrix(np.array([[0, 3, 0, 4, 0, 0, 0, 0], [0] * 8], dtype=np.float32))
+    
+    weighted = vectorizer.weight(counts)
+    
+    np.testing.assert_allclose(weighted.toarray()[0, [1, 3]], [0.6, 0.8])
+    assert weighted[1].nnz == 0
+    assert counts.data.tolist() == [3, 4]
+
+
+@pytest.fixture
+def hashed(tmp_path):
+    """Артефакт hash по CSV из 7 строк частями по 3 (части 3, 3, 1 строк)."""
+    csv_path = tmp_path / "train.csv"
+    texts = (CORPUS * 2)[:7]
+    pd.DataFrame({TEXT_COLUMN: texts, LABEL_COLUMN: range(7)}).to_csv(csv_path, index=False)
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    return SimpleNamespace(
+        store=store,
+        csv_path=str(csv_path),
+        path=hash_stage(store, str(csv_path), N_FEATURES, 3, PLAIN),
+    )
+
+
+def batch_labels(stream):
+    return [labels.tolist() for _, labels in stream]
+
+
+def test_chunk_stream_batches_each_chunk_separately(hashed):
+    vectorizer = load_vectorizer(hashed.path)
+    stream = ChunkStream(hashed.path, vectorizer, batch_size=2, shuffle=False)
+    
+    batches = list(stream)
+    
+    # Минибатч не пересекает границу части
+    assert [labels.tolist() for _, labels in batches] == [[0, 1], [2], [3, 4], [5], [6]]
+    assert len(stream) == len(batches) == sum(math.ceil(rows / 2) for rows in [3, 3, 1])
+    features = batches[0][0].to_dense().numpy()
+    assert features.shape == (2, N_FEATURES)
+    np.testing.assert_allclose(np.linalg.norm(features, axis=1), 1, rtol=1e-5)
+    assert batch_labels(stream) == batch_labels(stream)
+
+
+def test_shuffled_chunk_stream_covers_every_row_once(hashed):
+    stream = ChunkStream(hashed.path, load_vectorizer(hashed.path), batch_size=2, shuffle=True)
+    
+    for _ in range(3):
+        rows = [label for labels in batch_labels(stream) for label in labels]
+        assert sorted(rows) == list(range(7))
+
+
+def test_test_split_artifact_has_no_document_frequency(hashed):
+    test_path = hash_stage(
+        hashed.store, hashed.csv_path, N_FEATURES, 3, PLAIN, document_frequency=False
+    )
+    
+    assert test_path != hashed.path
+    assert not os.path.exists(os.path.join(test_path, "df.npy"))
+    assert os.path.exists(os.path.join(hashed.path, "df.npy"))
+    vectorizer = load_vectorizer(hashed.path)
+    assert vectorizer.n_features == N_FEATURES
+    assert len(batch_labels(ChunkStream(test_path, vectorizer, 3, shuffle=False))) == 3
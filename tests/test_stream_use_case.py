@@ -0,0 +1,66 @@
+"""Тесты потоковой оценки: порядок результатов и ограничение пачек в работе."""
+
+import asyncio
+from typing import List, Optional, Sequence, Tuple
+
+from application.use_cases import StreamPredictTextUseCase
+
+
+class GatedModelService:
+    """Модель, которая считает начатые пачки и отвечает только после открытия gate."""
+    
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.started = 0
+    
+    async def predict_batch(
+        self,
+        texts: List[str],
+        deadlines: Optional[Sequence] = None,
+    ) -> List[Tuple[float, float]]:
+        self.started += 1
+        await self.gate.wait()
+        return [(float(text) / 100, 1.0) for text in texts]
+
+
+async def items(count: int):
+    for number in range(count):
+        yield {"id": number, "text": str(number)}
+
+
+async def test_in_flight_batches_are_bounded():
+    model = GatedModelService()
+    use_case = StreamPredictTextUseCase(model, batch_size=1, max_in_flight_batches=2)
+    stream = use_case.execute(items(10))
+    
+    first = asyncio.ensure_future(stream.__anext__())
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert model.started == 2
+    
+    model.gate.set()
+    results = [await first] + [batch async for batch in stream]
+    assert [row["id"] for batch in results for row in batch] == list(range(10))
+    assert model.started == 10
+
+
+async def test_results_keep_input_order_and_errors():
+    model = GatedModelService()
+    model.gate.set()
+    use_case = StreamPredictTextUseCase(model, batch_size=3, max_in_flight_batches=2)
+    
+    async def source():
+        yield {"id": "a", "text": "10"}
+        yield {"id": "b", "error": "invalid JSON"}
+        yield None
+        yield {"id": "c", "text": "90"}
+    
+    batches = [batch async for batch in use_case.execute(source())]
+    
+    assert batches == [
+        [
+            {"id": "a", "toxicity_score": 0.1, "toxicity_level": "non_toxic", "confidence": 1.0},
+            {"id": "b", "error": "invalid JSON"},
+        ],
+        [{"id": "c", "toxicity_score": 0.9, "toxicity_level": "toxic", "confidence": 1.0}],
+    ]
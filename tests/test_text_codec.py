@@ -0,0 +1,56 @@
+"""Тесты кодека хранения текста предсказаний."""
+
+import hashlib
+
+import pytest
+
+from infrastructure.text_codec import TextCodec, TextStorageMode, hash_placeholder, text_hash
+
+TEXT = "Привет, мир! " * 20
+
+
+def test_plain_mode_keeps_text():
+    encoded = TextCodec().encode(TEXT)
+    
+    assert encoded.text == TEXT
+    assert encoded.compressed is None
+    assert encoded.text_hash == hashlib.sha256(TEXT.encode("utf-8")).hexdigest()
+    assert encoded.text_length == len(TEXT)
+
+
+def test_zstd_mode_round_trips():
+    pytest.importorskip("zstandard")
+    codec = TextCodec("zstd", level=19)
+    
+    encoded = codec.encode(TEXT)
+    
+    assert encoded.text is None
+    assert len(encoded.compressed) < len(TEXT.encode("utf-8"))
+    assert encoded.text_length == len(TEXT)
+    assert codec.decode(encoded.text, encoded.compressed, encoded.text_hash) == TEXT
+
+
+def test_hash_only_mode_stores_no_text():
+    codec = TextCodec("hash_only")
+    
+    encoded = codec.encode(TEXT)
+    
+    assert (encoded.text, encoded.compressed) == (None, None)
+    assert encoded.text_hash == text_hash(TEXT)
+    assert codec.decode(None, None, encoded.text_hash) == hash_placeholder(text_hash(TEXT))
+
+
+def test_decode_does_not_depend_on_mode():
+    pytest.importorskip("zstandard")
+    compressed = TextCodec("zstd").encode(TEXT).compressed
+    
+    for mode in TextStorageMode:
+        codec = TextCodec(mode.value)
+        assert codec.decode(TEXT, None, text_hash(TEXT)) == TEXT
+        assert codec.decode(None, compressed, text_hash(TEXT)) == TEXT
+        assert codec.decode(None, None, "abc") == "[sha256:abc]"
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TextCodec("gzip")